@@ -0,0 +1,51 @@
+"""indices fk e listagem
+
+Revision ID: 0d6b3e9f5c12
+Revises: f4a1c7e02b58
+Create Date: 2026-10-18 21:26:10.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0d6b3e9f5c12'
+down_revision: Union[str, Sequence[str], None] = 'f4a1c7e02b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY: tabelas grandes continuam recebendo escritas durante a criação
+    with op.get_context().autocommit_block():
+        # chaves estrangeiras sem índice: listar_partes, pagamento por transação e o
+        # ON DELETE CASCADE de transacao varriam as tabelas inteiras
+        op.create_index('ix_parte_transacao_id', 'parte', ['transacao_id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_comissao_transacao_id', 'comissao', ['transacao_id'], unique=False, postgresql_concurrently=True)
+        # filtro por igualdade + ordenação (data_criacao, id) da listagem; os índices
+        # só em status / imovel_codigo ficam redundantes (prefixo dos novos)
+        op.create_index(
+            'ix_transacao_status_data_criacao_id', 'transacao', ['status', 'data_criacao', 'id'],
+            unique=False, postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_transacao_imovel_data_criacao_id', 'transacao', ['imovel_codigo', 'data_criacao', 'id'],
+            unique=False, postgresql_concurrently=True,
+        )
+        op.drop_index('ix_transacao_status', table_name='transacao', postgresql_concurrently=True)
+        op.drop_index('ix_imovel_codigo', table_name='transacao', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_imovel_codigo', 'transacao', ['imovel_codigo'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_transacao_status', 'transacao', ['status'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_transacao_imovel_data_criacao_id', table_name='transacao', postgresql_concurrently=True)
+        op.drop_index('ix_transacao_status_data_criacao_id', table_name='transacao', postgresql_concurrently=True)
+        op.drop_index('ix_comissao_transacao_id', table_name='comissao', postgresql_concurrently=True)
+        op.drop_index('ix_parte_transacao_id', table_name='parte', postgresql_concurrently=True)
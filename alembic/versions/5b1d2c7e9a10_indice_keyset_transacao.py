@@ -0,0 +1,38 @@
+"""indice keyset transacao
+
+Revision ID: 5b1d2c7e9a10
+Revises: 37faf04de94a
+Create Date: 2026-10-18 09:12:05.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1d2c7e9a10'
+down_revision: Union[str, Sequence[str], None] = '37faf04de94a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # (data_criacao, id) cobre a ordenação da listagem e o predicado keyset;
+    # o índice só em data_criacao fica redundante.
+    # CONCURRENTLY: tabelas grandes continuam recebendo escritas durante a criação
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_transacao_data_criacao_id', 'transacao', ['data_criacao', 'id'],
+            unique=False, postgresql_concurrently=True,
+        )
+        op.drop_index('ix_transacao_data_criacao', table_name='transacao', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_transacao_data_criacao', 'transacao', ['data_criacao'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_transacao_data_criacao_id', table_name='transacao', postgresql_concurrently=True)
@@ -0,0 +1,29 @@
+"""versao transacao
+
+Revision ID: 8c3e4f2a7b61
+Revises: 5b1d2c7e9a10
+Create Date: 2026-10-18 14:03:41.552907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c3e4f2a7b61'
+down_revision: Union[str, Sequence[str], None] = '5b1d2c7e9a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # linhas existentes começam na versão 1 (server_default)
+    op.add_column('transacao', sa.Column('versao', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('transacao', 'versao')
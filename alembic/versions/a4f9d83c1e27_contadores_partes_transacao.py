@@ -0,0 +1,49 @@
+"""contadores partes transacao
+
+Revision ID: a4f9d83c1e27
+Revises: 8c3e4f2a7b61
+Create Date: 2026-10-18 15:27:10.304118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4f9d83c1e27'
+down_revision: Union[str, Sequence[str], None] = '8c3e4f2a7b61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CONTADORES = {
+    'qtd_compradores': 'COMPRADOR',
+    'qtd_vendedores': 'VENDEDOR',
+    'qtd_corretores': 'CORRETOR',
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for coluna in CONTADORES:
+        op.add_column('transacao', sa.Column(coluna, sa.Integer(), server_default='0', nullable=False))
+
+    # backfill a partir das partes já cadastradas: uma passada agrupada em `parte` (nesta
+    # revisão parte.transacao_id ainda não tem índice; uma subconsulta correlacionada por
+    # linha de transacao varreria `parte` inteira a cada linha). Transações sem partes
+    # ficam no default 0.
+    op.execute(
+        'UPDATE transacao SET '
+        + ', '.join(f'{coluna} = c.{coluna}' for coluna in CONTADORES)
+        + ' FROM (SELECT transacao_id, '
+        + ', '.join(f"count(*) FILTER (WHERE tipo = '{tipo}') AS {coluna}" for coluna, tipo in CONTADORES.items())
+        + ' FROM parte GROUP BY transacao_id) AS c'
+        + ' WHERE c.transacao_id = transacao.id'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for coluna in reversed(list(CONTADORES)):
+        op.drop_column('transacao', coluna)
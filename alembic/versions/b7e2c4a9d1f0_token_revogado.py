@@ -0,0 +1,36 @@
+"""token revogado
+
+Revision ID: b7e2c4a9d1f0
+Revises: 0d6b3e9f5c12
+Create Date: 2026-10-19 10:12:41.503218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2c4a9d1f0'
+down_revision: Union[str, Sequence[str], None] = '0d6b3e9f5c12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # revogação compartilhada entre workers e reinícios (antes só em memória, por processo)
+    op.create_table(
+        'token_revogado',
+        sa.Column('jti', sa.String(length=255), nullable=False),
+        sa.Column('exp', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('jti'),
+    )
+    op.create_index('ix_token_revogado_exp', 'token_revogado', ['exp'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_token_revogado_exp', table_name='token_revogado')
+    op.drop_table('token_revogado')
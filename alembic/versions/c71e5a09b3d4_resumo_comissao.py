@@ -0,0 +1,54 @@
+"""resumo comissao
+
+Revision ID: c71e5a09b3d4
+Revises: a4f9d83c1e27
+Create Date: 2026-10-18 17:48:22.901134
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c71e5a09b3d4'
+down_revision: Union[str, Sequence[str], None] = 'a4f9d83c1e27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# tipo já criado pela migração inicial
+STATUS_TRANSACAO = postgresql.ENUM(
+    'CRIADA', 'EM_ANALISE', 'APROVADA', 'REPROVADA', 'FINALIZADA', 'CANCELADA',
+    name='status_transacao', create_type=False,
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('transacao', sa.Column('status_anterior', STATUS_TRANSACAO, nullable=True))
+    op.create_table(
+        'resumo_comissao',
+        sa.Column('dia', sa.Date(), nullable=False),
+        sa.Column('status_transacao', STATUS_TRANSACAO, nullable=False),
+        sa.Column('paga', sa.Boolean(), nullable=False),
+        sa.Column('quantidade', sa.Integer(), nullable=False),
+        sa.Column('valor_total', sa.Numeric(precision=16, scale=2), nullable=False),
+        sa.PrimaryKeyConstraint('dia', 'status_transacao', 'paga'),
+    )
+    # carga inicial a partir das comissões existentes
+    op.execute(
+        """
+        INSERT INTO resumo_comissao (dia, status_transacao, paga, quantidade, valor_total)
+        SELECT CAST(t.data_criacao AT TIME ZONE 'UTC' AS DATE), t.status, c.paga, count(*), sum(c.valor_calculado)
+        FROM comissao c JOIN transacao t ON t.id = c.transacao_id
+        GROUP BY 1, 2, 3
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('resumo_comissao')
+    op.drop_column('transacao', 'status_anterior')
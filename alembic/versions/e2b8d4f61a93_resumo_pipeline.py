@@ -0,0 +1,53 @@
+"""resumo pipeline
+
+Revision ID: e2b8d4f61a93
+Revises: c71e5a09b3d4
+Create Date: 2026-10-18 19:12:05.417302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b8d4f61a93'
+down_revision: Union[str, Sequence[str], None] = 'c71e5a09b3d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# tipo já criado pela migração inicial
+STATUS_TRANSACAO = postgresql.ENUM(
+    'CRIADA', 'EM_ANALISE', 'APROVADA', 'REPROVADA', 'FINALIZADA', 'CANCELADA',
+    name='status_transacao', create_type=False,
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('transacao', sa.Column('valor_venda_anterior', sa.Numeric(precision=12, scale=2), nullable=True))
+    op.create_table(
+        'resumo_pipeline',
+        sa.Column('dia', sa.Date(), nullable=False),
+        sa.Column('status', STATUS_TRANSACAO, nullable=False),
+        sa.Column('quantidade', sa.Integer(), nullable=False),
+        sa.Column('valor_total', sa.Numeric(precision=18, scale=2), nullable=False),
+        sa.PrimaryKeyConstraint('dia', 'status'),
+    )
+    # carga inicial a partir das transações existentes
+    op.execute(
+        """
+        INSERT INTO resumo_pipeline (dia, status, quantidade, valor_total)
+        SELECT CAST(data_criacao AT TIME ZONE 'UTC' AS DATE), status, count(*), sum(valor_venda)
+        FROM transacao
+        GROUP BY 1, 2
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('resumo_pipeline')
+    op.drop_column('transacao', 'valor_venda_anterior')
@@ -0,0 +1,41 @@
+"""indices busca parte
+
+Revision ID: f4a1c7e02b58
+Revises: e2b8d4f61a93
+Create Date: 2026-10-18 20:03:41.552918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a1c7e02b58'
+down_revision: Union[str, Sequence[str], None] = 'e2b8d4f61a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # CONCURRENTLY não bloqueia escritas em parte enquanto o índice é montado (fora de transação)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_parte_cpf_cnpj_id', 'parte', ['cpf_cnpj', 'id'],
+            unique=False, postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_parte_nome_trgm', 'parte', ['nome'],
+            unique=False, postgresql_using='gin', postgresql_ops={'nome': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_parte_nome_trgm', table_name='parte', postgresql_concurrently=True)
+        op.drop_index('ix_parte_cpf_cnpj_id', table_name='parte', postgresql_concurrently=True)
@@ -0,0 +1,53 @@
+import logging
+import re
+import time
+from uuid import uuid4
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.config import settings
+from helpers.contexto import ContextoRequisicao, contexto_requisicao
+
+logger = logging.getLogger('requisicoes')
+
+CABECALHO_ID = 'x-request-id'
+# id vindo do proxy/cliente só é aceito se for curto e sem caracteres estranhos (vai para os logs)
+ID_VALIDO = re.compile(r'[A-Za-z0-9._-]{1,64}')
+
+
+class IdRequisicao:
+    '''
+    Abre o contexto da requisição (ver `contexto_requisicao`) com o X-Request-ID recebido
+    ou um novo, e devolve o mesmo id na resposta. Com LOG_REQUISICOES, loga uma linha por
+    requisição ao terminar.
+    '''
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.logar = settings.LOG_REQUISICOES
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        recebido = next((v.decode('latin-1') for k, v in scope['headers'] if k == CABECALHO_ID.encode()), '')
+        request_id = recebido if ID_VALIDO.fullmatch(recebido) else uuid4().hex
+        token = contexto_requisicao.set(ContextoRequisicao(request_id, scope))
+        status = 500
+
+        async def enviar(mensagem: Message) -> None:
+            nonlocal status
+            if mensagem['type'] == 'http.response.start':
+                status = mensagem['status']
+                MutableHeaders(scope=mensagem)[CABECALHO_ID] = request_id
+            await send(mensagem)
+
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            if self.logar:
+                logger.info('requisicao', extra={'status': status, 'duracao_ms': round((time.perf_counter() - inicio) * 1000, 3)})
+            contexto_requisicao.reset(token)
@@ -0,0 +1,42 @@
+from typing import Iterable
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from helpers.db_session import COOKIE_PRIMARIO
+
+METODOS_LEITURA = {'GET', 'HEAD', 'OPTIONS'}
+
+
+class FixarPrimarioAposEscrita:
+    '''
+    Após uma escrita bem-sucedida grava um cookie curto que faz as leituras seguintes do mesmo
+    cliente irem ao primário (ver `primario_fixado`): a réplica pode ainda não ter a escrita.
+    ASGI puro: também vale para rotas que devolvem um Response pronto.
+
+    `rotas_leitura`: caminhos de POSTs que só leem (corpo grande demais para query string),
+    que não fixam o primário.
+    '''
+
+    def __init__(self, app: ASGIApp, segundos: int, rotas_leitura: Iterable[str] = ()):
+        self.app = app
+        self.rotas_leitura = frozenset(rotas_leitura)
+        self.cookie = f'{COOKIE_PRIMARIO}=1; Max-Age={segundos}; Path=/; HttpOnly; SameSite=Lax'
+        self.ativo = segundos > 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            not self.ativo
+            or scope['type'] != 'http'
+            or scope['method'] in METODOS_LEITURA
+            or scope['path'] in self.rotas_leitura
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def enviar(mensagem: Message) -> None:
+            if mensagem['type'] == 'http.response.start' and mensagem['status'] < 400:
+                MutableHeaders(scope=mensagem).append('set-cookie', self.cookie)
+            await send(mensagem)
+
+        await self.app(scope, receive, enviar)
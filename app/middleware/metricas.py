@@ -0,0 +1,51 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from infra.metricas import ConsultasRequisicao, consultas_da_requisicao, metricas_http
+
+# Rótulo das requisições que não casaram com nenhuma rota (404 de caminho): um só valor,
+# para um scanner não criar uma série por URL
+ROTA_DESCONHECIDA = 'nao_roteada'
+
+
+class MetricasRequisicao:
+    '''
+    Registra, por método e template de rota, o status, a latência e o SQL executado
+    (comandos e tempo, via eventos do engine) de cada requisição. ASGI puro: a latência
+    inclui o corpo em fluxo (exportação) e o template vem de `scope['route']`, que o
+    roteador preenche ao casar a rota.
+    '''
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        status = 500  # se a aplicação estourar antes de responder
+        consultas = ConsultasRequisicao()
+        token = consultas_da_requisicao.set(consultas)
+
+        async def enviar(mensagem: Message) -> None:
+            nonlocal status
+            if mensagem['type'] == 'http.response.start':
+                status = mensagem['status']
+            await send(mensagem)
+
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            duracao = time.perf_counter() - inicio
+            consultas_da_requisicao.reset(token)
+            rota = scope.get('route')
+            metricas_http.registrar(
+                scope['method'],
+                getattr(rota, 'path', ROTA_DESCONHECIDA),
+                status,
+                duracao,
+                consultas,
+            )
@@ -1,8 +1,13 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, status
 from uuid import uuid4
 
 from core.config import settings
-from app.security.security_jwt import criar_jwt
+from app.security.security_jwt import criar_jwt, validar_jwt
+from app.security.cache_tokens import cache_tokens
+from helpers.db_session import get_repo_token_revogado_async
+from helpers.erros_db import ErroOperacaoBD
+from helpers.erros_http import requisicao_invalida, erro_interno
+from infra.repositories.token_revogado import TokenRevogadoRepositorioAsync
 
 router = APIRouter(
     prefix='/api/v1', 
@@ -10,7 +15,7 @@ router = APIRouter(
 )
 
 @router.get('/token')
-def obter_token():
+async def obter_token():
     jti = str(uuid4())
     token = criar_jwt(sub='sistema_mvp', claims_extra={'role': 'mvp', 'jti': jti})
     exp_min = settings.JWT_MINUTOS
@@ -19,3 +24,26 @@ def obter_token():
         'token_type': 'bearer',
         'expires_in': exp_min * 60
     }
+
+
+# Revoga o próprio token (pelo jti): deixa de ser aceito até expirar, em todos os workers
+# (na hora neste; nos outros, assim que a entrada do cache vencer — JWT_CACHE_TTL)
+@router.post('/token/revogar', status_code=status.HTTP_204_NO_CONTENT)
+async def revogar_token(
+    claims: dict = Depends(validar_jwt),
+    revogados: TokenRevogadoRepositorioAsync = Depends(get_repo_token_revogado_async),
+):
+    jti = claims.get('jti')
+    if not jti:
+        raise requisicao_invalida('token sem jti não pode ser revogado')
+    try:
+        await revogados.revogar(jti, claims['exp'])
+    except ErroOperacaoBD:
+        raise erro_interno('revogar token')
+    cache_tokens.revogar(jti, claims['exp'])
+    return None
+
+# Acertos/falhas do cache de tokens verificados
+@router.get('/token/cache', dependencies=[Depends(validar_jwt)])
+async def estatisticas_cache_tokens():
+    return cache_tokens.estatisticas()
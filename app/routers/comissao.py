@@ -1,16 +1,19 @@
 from uuid import UUID
 from fastapi import APIRouter, Depends, status, Response
 
-from infra.models.comissao import Comissao as ComissaoORM
-from infra.repositories.comissao import ComissaoRepositorio
-from infra.repositories.transacao import TransacaoRepositorio
+from infra.repositories.comissao import ComissaoRepositorioAsync
 from helpers.erros_db import ErroConflitoBD, ErroOperacaoBD
 
 from app.security.security_jwt import validar_jwt
-from app.schemas.comissao import ComissaoCriarEntrada, ComissaoSaida
-from helpers.comissao import calcular_comissao
+from app.schemas.comissao import (
+    ComissaoCriarEntrada,
+    ComissaoSaida,
+    ComissaoPagarLoteEntrada,
+    ComissaoPagarLoteSaida,
+)
 from helpers.erros_http import nao_encontrada, erro_interno, conflito
-from helpers.db_session import get_repo_trans, get_repo_comissao
+from helpers.db_session import get_repo_comissao_async
+from helpers.serializacao import RespostaJSONRapida, campos_saida
 
 prefix = '/api/v1'
 router = APIRouter(
@@ -21,49 +24,58 @@ router = APIRouter(
 
 # 1. Criar comissão para uma transação
 @router.post('/transacoes/{transacao_id}/comissoes', response_model=ComissaoSaida, status_code=status.HTTP_201_CREATED)
-def criar_comissao(
+async def criar_comissao(
     transacao_id: UUID,
     payload: ComissaoCriarEntrada,
     response: Response,
-	repo_trans: TransacaoRepositorio = Depends(get_repo_trans),
-    repo_com: ComissaoRepositorio = Depends(get_repo_comissao),
+    repo_com: ComissaoRepositorioAsync = Depends(get_repo_comissao_async),
 ):
-    transacao = repo_trans.buscar(transacao_id)
-    if not transacao:
-        raise nao_encontrada('transacao')
-
-    valor = calcular_comissao(transacao.valor_venda, payload.percentual)
-
-    obj = ComissaoORM(
-        transacao_id=transacao_id,
-        percentual=payload.percentual,
-        valor_calculado=valor,
-        paga=False,
-    )
+    # valor calculado no próprio INSERT a partir do valor_venda da transação
     try:
-        salvo = repo_com.adicionar(obj)
+        salvo = await repo_com.adicionar_calculada(transacao_id, payload.percentual)
     except ErroConflitoBD:
         raise conflito('comissão já cadastrada ou viola restrição')
     except ErroOperacaoBD:
         raise erro_interno('criar comissão')
+    if not salvo:
+        raise nao_encontrada('transacao')
 
     response.headers['Location'] = f'{prefix}/comissoes/{salvo.id}'
     return salvo
 
 # 2. Pagar comissão
 @router.post('/comissoes/{comissao_id}/pagar', response_model=ComissaoSaida, status_code=status.HTTP_200_OK)
-def pagar_comissao(
+async def pagar_comissao(
     comissao_id: UUID,
-    repo: ComissaoRepositorio = Depends(get_repo_comissao)
+    repo: ComissaoRepositorioAsync = Depends(get_repo_comissao_async)
 ):
-    obj = repo.buscar(comissao_id)
+    try:
+        obj = await repo.marcar_paga(comissao_id)
+    except ErroConflitoBD:
+        raise conflito('pagamento viola restrição')
+    except ErroOperacaoBD:
+        raise erro_interno('pagar comissão')
     if not obj:
         raise nao_encontrada('comissao')
-    if obj.paga:
-        return obj
+    return obj
+
+# 3. Pagar comissões em lote (um UPDATE ... RETURNING para todas)
+@router.post('/comissoes/pagar-lote', response_model=ComissaoPagarLoteSaida, status_code=status.HTTP_200_OK)
+async def pagar_comissoes_lote(
+    payload: ComissaoPagarLoteEntrada,
+    repo: ComissaoRepositorioAsync = Depends(get_repo_comissao_async)
+):
     try:
-        return repo.marcar_paga(obj)
+        pagas, ja_pagas, nao_encontradas = await repo.marcar_pagas_lote(
+            ids=payload.ids,
+            transacao_ids=payload.transacao_ids,
+        )
     except ErroConflitoBD:
         raise conflito('pagamento viola restrição')
     except ErroOperacaoBD:
-        raise erro_interno('pagar comissão')
+        raise erro_interno('pagar comissões')
+    return RespostaJSONRapida({
+        'pagas': campos_saida(pagas, ComissaoSaida),
+        'ja_pagas': ja_pagas,
+        'nao_encontradas': nao_encontradas,
+    })
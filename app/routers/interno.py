@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends
+
+from app.security.security_jwt import validar_jwt
+from infra import consultas_lentas
+from infra.pool import metricas_pools
+
+prefix = '/api/v1/interno'
+router = APIRouter(
+    prefix=prefix,
+    tags=['Interno'],
+    dependencies=[Depends(validar_jwt)]
+)
+
+# 1. Métricas dos pools de conexão deste processo (dimensionamento por worker)
+@router.get('/pool')
+async def obter_metricas_pool():
+    return metricas_pools()
+
+# 2. Consultas mais lentas por impressão digital (só com CONSULTAS_LENTAS_MS configurado)
+@router.get('/consultas-lentas')
+async def obter_consultas_lentas():
+    registro = consultas_lentas.registro_consultas_lentas
+    if registro is None:
+        return {'ativo': False, 'limiar_ms': None, 'consultas': []}
+    return {'ativo': True, 'limiar_ms': registro.limiar_ms, 'consultas': registro.retrato()}
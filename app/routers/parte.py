@@ -1,17 +1,20 @@
+from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, status, Response
+from fastapi import APIRouter, Body, Depends, Query, status, Response
 
 from infra.models.parte import Parte as ParteORM
-from infra.repositories.parte import ParteRepositorio
-from infra.repositories.transacao import TransacaoRepositorio
+from infra.repositories.parte import ParteRepositorioAsync
 
-from app.schemas.parte import ParteCriarEntrada, ParteSaida
+from app.schemas.parte import ParteCriarEntrada, ParteLoteEntrada, ParteSaida
 from app.security.security_jwt import validar_jwt
-from helpers.erros_http import nao_encontrada, erro_interno, conflito
-from helpers.db_session import get_repo_trans, get_repo_parte
-from helpers.erros_db import ErroConflitoBD, ErroOperacaoBD
+from helpers.erros_http import nao_encontrada, erro_interno, conflito, requisicao_invalida
+from helpers.db_session import get_repo_parte_async, get_repo_parte_leitura_async
+from helpers.paginacao import codificar_cursor_id, decodificar_cursor_id
+from helpers.erros_db import ErroConflitoBD, ErroOperacaoBD, ErroReferenciaBD
+from helpers.serializacao import RespostaJSONRapida, campos_saida
 
 prefix = '/api/v1'
+LIMITE_LOTE = 1000
 router = APIRouter(
     prefix=prefix, 
     tags=['Partes'], 
@@ -20,25 +23,23 @@ router = APIRouter(
 
 # 1. Cadastrar parte em uma transação
 @router.post('/transacoes/{transacao_id}/partes', response_model=ParteSaida, status_code=status.HTTP_201_CREATED)
-def adicionar_parte(
+async def adicionar_parte(
     transacao_id: UUID,
     payload: ParteCriarEntrada,
     response: Response,
-    repo_trans: TransacaoRepositorio = Depends(get_repo_trans),
-    repo_parte: ParteRepositorio = Depends(get_repo_parte),
+    repo_parte: ParteRepositorioAsync = Depends(get_repo_parte_async),
 ):
-    transacao = repo_trans.buscar(transacao_id)
-    if not transacao:
-        raise nao_encontrada('transacao')
-
     obj = ParteORM(
         transacao_id=transacao_id,
         nome=payload.nome,
         cpf_cnpj=payload.cpf_cnpj,
         tipo=payload.tipo,
+        email=payload.email,
     )
     try:
-        salvo = repo_parte.adicionar(obj)
+        salvo = await repo_parte.adicionar(obj)
+    except ErroReferenciaBD:
+        raise nao_encontrada('transacao')
     except ErroConflitoBD:
         raise conflito('parte já cadastrada ou viola restrição')
     except ErroOperacaoBD:
@@ -47,19 +48,73 @@ def adicionar_parte(
     response.headers['Location'] = f'{prefix}/partes/{salvo.id}'
     return salvo
 
+# 1.1 Cadastrar várias partes em uma transação (um INSERT, um commit)
+@router.post('/transacoes/{transacao_id}/partes/lote', response_model=List[ParteSaida], status_code=status.HTTP_201_CREATED)
+async def adicionar_partes_lote(
+    transacao_id: UUID,
+    payload: List[ParteCriarEntrada] = Body(min_length=1, max_length=LIMITE_LOTE),
+    repo_parte: ParteRepositorioAsync = Depends(get_repo_parte_async),
+):
+    return await _gravar_lote(repo_parte, [
+        {'transacao_id': transacao_id, **p.model_dump()} for p in payload
+    ])
+
+# 1.2 Cadastrar partes de várias transações em uma requisição
+@router.post('/partes/lote', response_model=List[ParteSaida], status_code=status.HTTP_201_CREATED)
+async def adicionar_partes_lote_multiplas(
+    payload: List[ParteLoteEntrada] = Body(min_length=1, max_length=LIMITE_LOTE),
+    repo_parte: ParteRepositorioAsync = Depends(get_repo_parte_async),
+):
+    return await _gravar_lote(repo_parte, [p.model_dump() for p in payload])
+
+async def _gravar_lote(repo_parte: ParteRepositorioAsync, linhas: List[dict]):
+    try:
+        salvas = await repo_parte.adicionar_lote(linhas)
+    except ErroReferenciaBD:
+        raise nao_encontrada('transacao')
+    except ErroConflitoBD:
+        raise conflito('parte já cadastrada ou viola restrição')
+    except ErroOperacaoBD:
+        raise erro_interno('criar partes')
+    return RespostaJSONRapida(campos_saida(salvas, ParteSaida), status_code=status.HTTP_201_CREATED)
+
 # 2. Deletar parte em uma transação
 @router.delete('/partes/{parte_id}', status_code=status.HTTP_204_NO_CONTENT)
-def deletar_parte(
+async def deletar_parte(
     parte_id: UUID,
-    repo_parte: ParteRepositorio = Depends(get_repo_parte),
+    repo_parte: ParteRepositorioAsync = Depends(get_repo_parte_async),
 ):
-    obj = repo_parte.buscar(parte_id)
-    if not obj:
-        raise nao_encontrada('parte')
     try:
-        repo_parte.deletar(obj)
+        removida = await repo_parte.deletar(parte_id)
     except ErroConflitoBD:
         raise conflito('não é possível deletar: em uso por outra entidade')
     except ErroOperacaoBD:
         raise erro_interno('deletar parte')
+    if not removida:
+        raise nao_encontrada('parte')
     return None
+
+# 3. Buscar partes por CPF/CNPJ exato e/ou trecho do nome (paginação keyset por id)
+@router.get('/partes', response_model=List[ParteSaida])
+async def buscar_partes(
+    cpf_cnpj: Optional[str] = Query(None, pattern=r'^(?:\d{11}|\d{14})$'),
+    nome: Optional[str] = Query(None, min_length=3, max_length=100, description='Trecho do nome (sem diferenciar maiúsculas)'),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description='Valor de X-Next-Cursor da página anterior'),
+    repo_parte: ParteRepositorioAsync = Depends(get_repo_parte_leitura_async),
+):
+    # sem filtro seria uma varredura da tabela inteira
+    if not cpf_cnpj and not nome:
+        raise requisicao_invalida('informe cpf_cnpj e/ou nome')
+    try:
+        chave = decodificar_cursor_id(cursor) if cursor else None
+    except ValueError:
+        raise requisicao_invalida('cursor inválido')
+
+    try:
+        linhas, proximo = await repo_parte.pesquisar(cpf_cnpj=cpf_cnpj, nome=nome, limit=limit, cursor=chave)
+    except ErroOperacaoBD:
+        raise erro_interno('buscar partes')
+
+    cabecalhos = {'X-Next-Cursor': codificar_cursor_id(proximo)} if proximo else None
+    return RespostaJSONRapida(campos_saida(linhas, ParteSaida), headers=cabecalhos)
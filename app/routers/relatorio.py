@@ -0,0 +1,90 @@
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+
+from infra.repositories.resumo_comissao import ResumoComissaoRepositorioAsync
+from infra.repositories.resumo_pipeline import ResumoPipelineRepositorioAsync
+from helpers.enums import StatusTransacao
+from helpers.erros_db import ErroOperacaoBD
+from helpers.erros_http import erro_interno
+from helpers.periodo import periodo_de
+from helpers.db_session import get_repo_resumo_comissao_leitura_async, get_repo_resumo_pipeline_leitura_async
+
+from app.security.security_jwt import validar_jwt
+from app.schemas.relatorio import (
+    RelatorioComissoesSaida,
+    ResumoComissaoLinha,
+    TotaisComissao,
+    RelatorioPipelineSaida,
+    PipelinePeriodo,
+    TotaisPipeline,
+)
+
+prefix = '/api/v1/relatorios'
+router = APIRouter(
+    prefix=prefix,
+    tags=['Relatórios'],
+    dependencies=[Depends(validar_jwt)]
+)
+
+def _somar(totais, paga: bool, quantidade: int, valor: Decimal) -> None:
+    if paga:
+        totais.qtd_pagas += quantidade
+        totais.valor_pago += valor
+    else:
+        totais.qtd_pendentes += quantidade
+        totais.valor_pendente += valor
+
+# 1. Comissões pagas x pendentes por período (data de criação da transação) e status da transação
+@router.get('/comissoes', response_model=RelatorioComissoesSaida)
+async def relatorio_comissoes(
+    data_ini: Optional[date] = Query(None, description='Primeiro dia (UTC), inclusive'),
+    data_fim: Optional[date] = Query(None, description='Último dia (UTC), inclusive'),
+    status_filtro: Optional[StatusTransacao] = Query(None, alias='status'),
+    agrupamento: str = Query('mes', pattern='^(dia|mes)$'),
+    repo: ResumoComissaoRepositorioAsync = Depends(get_repo_resumo_comissao_leitura_async),
+):
+    # lido da tabela resumo_comissao (mantida a cada escrita); aqui só se juntam dias em meses
+    try:
+        resumo = await repo.consultar(data_ini=data_ini, data_fim=data_fim, status_filtro=status_filtro)
+    except ErroOperacaoBD:
+        raise erro_interno('gerar relatório de comissões')
+
+    linhas: dict[tuple[str, StatusTransacao], ResumoComissaoLinha] = {}
+    total = TotaisComissao()
+    for r in resumo:
+        chave = (periodo_de(r.dia, agrupamento), r.status_transacao)
+        if chave not in linhas:
+            linhas[chave] = ResumoComissaoLinha(periodo=chave[0], status_transacao=chave[1])
+        _somar(linhas[chave], r.paga, r.quantidade, r.valor_total)
+        _somar(total, r.paga, r.quantidade, r.valor_total)
+
+    return RelatorioComissoesSaida(linhas=list(linhas.values()), total=total)
+
+# 2. Pipeline: transações por período de criação e status atual (quantidade e valor_venda)
+@router.get('/pipeline', response_model=RelatorioPipelineSaida)
+async def relatorio_pipeline(
+    granularidade: str = Query('dia', pattern='^(dia|semana|mes)$'),
+    data_ini: Optional[date] = Query(None, description='Primeiro dia (UTC), inclusive'),
+    data_fim: Optional[date] = Query(None, description='Último dia (UTC), inclusive'),
+    repo: ResumoPipelineRepositorioAsync = Depends(get_repo_resumo_pipeline_leitura_async),
+):
+    # soma linhas diárias de resumo_pipeline: o custo depende do intervalo, não do tamanho de transacao
+    try:
+        resumo = await repo.consultar(data_ini=data_ini, data_fim=data_fim)
+    except ErroOperacaoBD:
+        raise erro_interno('gerar painel do pipeline')
+
+    periodos: dict[str, PipelinePeriodo] = {}
+    total: dict[StatusTransacao, TotaisPipeline] = {}
+    for r in resumo:
+        periodo = periodo_de(r.dia, granularidade)
+        if periodo not in periodos:
+            periodos[periodo] = PipelinePeriodo(periodo=periodo, por_status={})
+        for totais in (periodos[periodo].por_status, total):
+            item = totais.setdefault(r.status, TotaisPipeline())
+            item.quantidade += r.quantidade
+            item.valor_total += r.valor_total
+
+    return RelatorioPipelineSaida(periodos=list(periodos.values()), total=total)
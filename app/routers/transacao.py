@@ -1,20 +1,29 @@
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, status, Query, Response
+from fastapi import APIRouter, Depends, Header, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from datetime import datetime
 
-from infra.repositories.transacao import TransacaoRepositorio
-from infra.models.transacao import Transacao as TransacaoORM
+from infra.repositories.transacao import TransacaoRepositorioAsync
+from infra.models.transacao import Transacao as TransacaoORM, QTD_POR_TIPO
 from helpers.erros_db import ErroConflitoBD, ErroOperacaoBD
 
 from app.security.security_jwt import validar_jwt
 from app.schemas.transacao import (
     TransacaoCriarEntrada,
     TransacaoSaida,
+    TransacaoDetalhadaSaida,
+    TransacaoBuscarLoteEntrada,
+    TransacaoBuscarLoteSaida,
     TransacaoAtualizarEntrada,
     TransacaoAtualizarStatusEntrada,
+    TransacaoImportacaoSaida,
+    ErroLinhaImportacao,
 )
-from helpers.enums import StatusTransacao, pode_transicionar, TipoParte
+from app.schemas.parte import ParteSaida
+from app.schemas.comissao import ComissaoSaida
+from helpers.enums import StatusTransacao, pode_transicionar, EstrategiaContagem, RelacaoTransacao, PARTES_EXIGIDAS
 from helpers.erros_http import (
     nao_encontrada,
     erro_interno,
@@ -22,8 +31,22 @@ from helpers.erros_http import (
     requisito_partes_nao_atendido,
     conflito,
     requisicao_invalida,
+    tipo_nao_suportado,
+    precondicao_falhou,
 )
-from helpers.db_session import get_repo_trans
+from helpers.db_session import get_repo_trans_async, get_repo_trans_leitura_async, get_fabrica_leitura_roteada
+from core.config import settings
+from helpers.paginacao import codificar_cursor, decodificar_cursor
+from helpers.etag import etag_versao, etag_pagina, etag_com_relacoes, versoes_if_match, casa_if_none_match
+from helpers.importacao import (
+    FORMATO_CSV,
+    FORMATOS_NDJSON,
+    linhas_do_fluxo,
+    registros,
+    mensagens_validacao,
+)
+from helpers.serializacao import RespostaJSONRapida, campos_saida
+from helpers.exportacao import FORMATOS_EXPORTACAO, COLUNAS_CSV, linha_csv, linha_ndjson, valor_csv
 
 prefix = '/api/v1/transacoes'
 router = APIRouter(
@@ -32,12 +55,90 @@ router = APIRouter(
     dependencies=[Depends(validar_jwt)]
 )
 
+# Filtros comuns da listagem e da exportação
+async def filtros_transacao(
+    status_filtro: Optional[StatusTransacao] = Query(None, alias='status'),
+    imovel_codigo: Optional[str] = None,
+    data_ini: Optional[datetime] = Query(None, description='UTC'),
+    data_fim: Optional[datetime] = Query(None, description='UTC'),
+) -> dict:
+    if data_ini and data_fim and data_ini > data_fim:
+        raise requisicao_invalida('data_ini não pode ser maior que data_fim')
+    return dict(
+        status_filtro=status_filtro,
+        imovel_codigo=imovel_codigo,
+        data_ini=data_ini,
+        data_fim=data_fim,
+    )
+
+# Relações a embutir na saída (?incluir=partes,comissoes)
+async def relacoes_incluidas(
+    incluir: Optional[str] = Query(None, description='Relações a embutir, separadas por vírgula: partes,comissoes'),
+) -> set[RelacaoTransacao]:
+    if not incluir:
+        return set()
+    try:
+        return {RelacaoTransacao(nome.strip()) for nome in incluir.split(',') if nome.strip()}
+    except ValueError:
+        raise requisicao_invalida('incluir aceita apenas: partes, comissoes')
+
+# Esquema de saída de cada relação embutida
+ESQUEMA_RELACAO = {
+    RelacaoTransacao.PARTES: ParteSaida,
+    RelacaoTransacao.COMISSOES: ComissaoSaida,
+}
+
+async def embutir_relacoes(
+    repo: TransacaoRepositorioAsync,
+    dados: list[dict],
+    relacoes: set[RelacaoTransacao],
+) -> dict[str, list]:
+    # acrescenta as relações pedidas a cada transação (uma consulta por relação para a
+    # página inteira); devolve as linhas embutidas por relação, base do ETag (etag_com_relacoes)
+    relacionados = await repo.relacionados([d['id'] for d in dados], relacoes)
+    for relacao, por_transacao in relacionados.items():
+        for d in dados:
+            d[relacao.value] = campos_saida(por_transacao.get(d['id'], []), ESQUEMA_RELACAO[relacao])
+    return {
+        relacao.value: [linha for linhas in por_transacao.values() for linha in linhas]
+        for relacao, por_transacao in relacionados.items()
+    }
+
+# Pré-condição de escrita (If-Match com o ETag de GET); None = sem pré-condição
+async def precondicao_if_match(
+    if_match: Optional[str] = Header(None, description='ETag da versão esperada; diverge -> 412'),
+) -> Optional[set[int]]:
+    return versoes_if_match(if_match)
+
+# Escrita condicional não casou: relê a linha só para escolher o erro
+async def erro_escrita_condicional(
+    repo: TransacaoRepositorioAsync,
+    transacao_id: UUID,
+    versoes: Optional[set[int]],
+    novo_status: Optional[StatusTransacao] = None,
+):
+    if versoes is None and novo_status is None:
+        return nao_encontrada('transacao')  # UPDATE sem condição extra só falha se a linha não existe
+    atual = await repo.buscar(transacao_id)
+    if not atual:
+        return nao_encontrada('transacao')
+    if versoes is not None and atual.versao not in versoes:
+        return precondicao_falhou()
+    if novo_status is not None:
+        if not pode_transicionar(atual.status, novo_status):
+            return transicao_invalida()
+        # 422 só se a linha relida ainda não tem as partes; se já tem (partes incluídas ou
+        # status/versão mudados entre o UPDATE e a releitura), é disputa: 409, pode repetir
+        if any(getattr(atual, QTD_POR_TIPO[tipo].key) <= 0 for tipo in PARTES_EXIGIDAS.get(novo_status, ())):
+            return requisito_partes_nao_atendido()
+    return conflito('transação alterada por outra requisição')
+
 # 1. Criar transação
 @router.post('', response_model=TransacaoSaida, status_code=status.HTTP_201_CREATED)
-def criar_transacao(
+async def criar_transacao(
     payload: TransacaoCriarEntrada,
     response: Response,
-    repo: TransacaoRepositorio = Depends(get_repo_trans),
+    repo: TransacaoRepositorioAsync = Depends(get_repo_trans_async),
 ):
     obj = TransacaoORM(
         imovel_codigo=payload.imovel_codigo,
@@ -45,124 +146,273 @@ def criar_transacao(
         status=StatusTransacao.CRIADA,
     )
     try:
-        salvo = repo.adicionar(obj)
+        salvo = await repo.adicionar(obj)
     except ErroConflitoBD:
         raise conflito('transação já existe ou viola restrição')
     except ErroOperacaoBD:
         raise erro_interno('criar transação')
 
     response.headers['Location'] = f'{prefix}/{salvo.id}'
+    response.headers['ETag'] = etag_versao(salvo.versao)
     return salvo
 
 
+# 1.1 Importar transações em massa (CSV com cabeçalho ou NDJSON)
+@router.post('/importar', response_model=TransacaoImportacaoSaida)
+async def importar_transacoes(
+    request: Request,
+    repo: TransacaoRepositorioAsync = Depends(get_repo_trans_async),
+):
+    formato = request.headers.get('content-type', '').split(';')[0].strip().lower()
+    if formato != FORMATO_CSV and formato not in FORMATOS_NDJSON:
+        raise tipo_nao_suportado('use text/csv ou application/x-ndjson')
+
+    resumo = TransacaoImportacaoSaida(total_linhas=0, importadas=0, rejeitadas=0, erros=[])
+    lote: list[dict] = []
+    linhas_lote: list[int] = []
+
+    def rejeitar(linha: int, erros: list[str]):
+        resumo.rejeitadas += 1
+        if len(resumo.erros) < settings.IMPORTACAO_MAX_ERROS:
+            resumo.erros.append(ErroLinhaImportacao(linha=linha, erros=erros))
+        else:
+            resumo.erros_omitidos += 1
+
+    async def gravar():
+        # falha do banco rejeita só o lote corrente; os anteriores já foram commitados
+        try:
+            resumo.importadas += await repo.adicionar_lote(lote)
+        except (ErroConflitoBD, ErroOperacaoBD):
+            for linha in linhas_lote:
+                rejeitar(linha, ['lote rejeitado pelo banco'])
+        lote.clear()
+        linhas_lote.clear()
+
+    max_linha = settings.IMPORTACAO_MAX_LINHA
+    async for linha, dados, erro in registros(linhas_do_fluxo(request.stream(), max_linha), formato, max_linha):
+        resumo.total_linhas += 1
+        if erro:
+            rejeitar(linha, [erro])
+            continue
+        try:
+            payload = TransacaoCriarEntrada.model_validate(dados)
+        except ValidationError as e:
+            rejeitar(linha, mensagens_validacao(e))
+            continue
+
+        # mesma regra do POST unitário: toda transação nasce CRIADA
+        lote.append({
+            'imovel_codigo': payload.imovel_codigo,
+            'valor_venda': payload.valor_venda,
+            'status': StatusTransacao.CRIADA,
+        })
+        linhas_lote.append(linha)
+        if len(lote) >= settings.IMPORTACAO_LOTE:
+            await gravar()
+
+    if lote:
+        await gravar()
+    return resumo
+
+
+# 1.2 Exportar transações em fluxo (declarada antes de /{transacao_id} para não colidir com o UUID)
+@router.get('/exportar', response_class=StreamingResponse)
+async def exportar_transacoes(
+    filtros: dict = Depends(filtros_transacao),
+    relacoes: set[RelacaoTransacao] = Depends(relacoes_incluidas),
+    formato: str = Query('ndjson', pattern='^(csv|ndjson)$'),
+    fabrica_sessao = Depends(get_fabrica_leitura_roteada),
+):
+    com_partes = RelacaoTransacao.PARTES in relacoes
+    com_comissoes = RelacaoTransacao.COMISSOES in relacoes
+
+    def registro(transacao, partes, comissoes) -> dict:
+        dados = TransacaoSaida.model_validate(transacao).model_dump(mode='json')
+        if com_partes:
+            dados['partes'] = [ParteSaida.model_validate(p).model_dump(mode='json') for p in partes]
+        if com_comissoes:
+            dados['comissoes'] = [ComissaoSaida.model_validate(c).model_dump(mode='json') for c in comissoes]
+        return dados
+
+    async def corpo():
+        colunas = COLUNAS_CSV + (['partes'] if com_partes else []) + (['comissoes'] if com_comissoes else [])
+        if formato == 'csv':
+            yield linha_csv(colunas)
+        async with fabrica_sessao() as db:
+            linhas = TransacaoRepositorioAsync(db).exportar(
+                lote=settings.EXPORTACAO_LOTE, partes=com_partes, comissoes=com_comissoes, **filtros
+            )
+            async for transacao, partes, comissoes in linhas:
+                dados = registro(transacao, partes, comissoes)
+                if formato == 'csv':
+                    yield linha_csv([valor_csv(dados[c]) for c in colunas])
+                else:
+                    yield linha_ndjson(dados)
+
+    cabecalhos = {}
+    if formato == 'csv':
+        cabecalhos['Content-Disposition'] = 'attachment; filename="transacoes.csv"'
+    return StreamingResponse(corpo(), media_type=FORMATOS_EXPORTACAO[formato], headers=cabecalhos)
+
+
+# 1.3 Buscar várias transações por id (uma consulta; só leitura, apesar do POST)
+@router.post('/buscar-lote', response_model=TransacaoBuscarLoteSaida, response_model_exclude_none=True)
+async def buscar_transacoes_lote(
+    payload: TransacaoBuscarLoteEntrada,
+    relacoes: set[RelacaoTransacao] = Depends(relacoes_incluidas),
+    repo: TransacaoRepositorioAsync = Depends(get_repo_trans_leitura_async),
+):
+    try:
+        encontradas, nao_encontradas = await repo.buscar_lote(payload.ids)
+        dados = campos_saida(encontradas, TransacaoSaida)
+        if relacoes:
+            await embutir_relacoes(repo, dados, relacoes)
+    except ErroOperacaoBD:
+        raise erro_interno('buscar transações')
+    return RespostaJSONRapida({'encontradas': dados, 'nao_encontradas': nao_encontradas})
+
+
 # 2. Obter transação por ID
-@router.get('/{transacao_id}', response_model=TransacaoSaida)
-def obter_transacao(
+@router.get('/{transacao_id}', response_model=TransacaoDetalhadaSaida, response_model_exclude_none=True)
+async def obter_transacao(
     transacao_id: UUID,
-    repo: TransacaoRepositorio = Depends(get_repo_trans),
+    if_none_match: Optional[str] = Header(None, description='ETag já em cache no cliente; igual -> 304'),
+    relacoes: set[RelacaoTransacao] = Depends(relacoes_incluidas),
+    repo: TransacaoRepositorioAsync = Depends(get_repo_trans_leitura_async),
 ):
-    obj = repo.buscar(transacao_id)
-    if not obj:
+    # revalidação: só a versão é lida; 304 sem carregar a linha nem serializar.
+    # Com relações embutidas a versão não basta (ver etag_com_relacoes): revalida depois de ler.
+    if if_none_match and not relacoes:
+        versao = await repo.versao(transacao_id)
+        if versao is None:
+            raise nao_encontrada('transacao')
+        if casa_if_none_match(if_none_match, etag_versao(versao)):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag_versao(versao)})
+
+    # colunas direto do banco, codificadas com orjson (sem revalidar pelo response_model)
+    linha = await repo.buscar_linha(transacao_id)
+    if not linha:
         raise nao_encontrada('transacao')
-    return obj
+    dados = campos_saida([linha], TransacaoSaida)
+    etag = etag_versao(linha.versao)
+    if relacoes:
+        etag = etag_com_relacoes(etag, await embutir_relacoes(repo, dados, relacoes))
+        if casa_if_none_match(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+    return RespostaJSONRapida(dados[0], headers={'ETag': etag})
 
 
 # 3. Listar transações com filtros
-@router.get('', response_model=List[TransacaoSaida])
-def listar_transacoes(
-    response: Response,
-    repo: TransacaoRepositorio = Depends(get_repo_trans),
-    status_filtro: Optional[StatusTransacao] = Query(None, alias='status'),
-    imovel_codigo: Optional[str] = None,
-    data_ini: Optional[datetime] = Query(None, description='UTC'),
-    data_fim: Optional[datetime] = Query(None, description='UTC'),
+@router.get('', response_model=List[TransacaoDetalhadaSaida], response_model_exclude_none=True)
+async def listar_transacoes(
+    repo: TransacaoRepositorioAsync = Depends(get_repo_trans_leitura_async),
+    filtros: dict = Depends(filtros_transacao),
+    relacoes: set[RelacaoTransacao] = Depends(relacoes_incluidas),
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description='Valor de X-Next-Cursor da página anterior (paginação keyset)'),
+    contagem: Optional[EstrategiaContagem] = Query(None, description='Estratégia do X-Total-Count (padrão da configuração)'),
+    if_none_match: Optional[str] = Header(None, description='ETag já em cache no cliente; igual -> 304'),
 ):
-    if data_ini and data_fim and data_ini > data_fim:
-        raise requisicao_invalida('data_ini não pode ser maior que data_fim')
+    if cursor and offset:
+        raise requisicao_invalida('use cursor ou offset, não ambos')
 
-    itens, total = repo.listar(
-        status_filtro=status_filtro,
-        imovel_codigo=imovel_codigo,
-        data_ini=data_ini,
-        data_fim=data_fim,
-        limit=limit,
-        offset=offset,
-    )
-    response.headers['X-Total-Count'] = str(total)
-    return itens
+    chave = None
+    if cursor:
+        try:
+            chave = decodificar_cursor(cursor)
+        except ValueError:
+            raise requisicao_invalida('cursor inválido')
+
+    total, precisao = await repo.contar(**filtros, estrategia=contagem or settings.CONTAGEM_ESTRATEGIA)
+    pagina = dict(limit=limit, offset=offset, cursor=chave)
+    parametros = {**filtros, **pagina, 'contagem': precisao.value}
+
+    def cabecalhos(etag: str, proximo) -> dict:
+        valores = {'ETag': etag, 'X-Total-Count': str(total), 'X-Total-Count-Precision': precisao.value}
+        if proximo:
+            valores['X-Next-Cursor'] = codificar_cursor(*proximo)
+        return valores
+
+    # revalidação: só (id, versao) da página; 304 sem carregar as linhas nem serializar
+    # (com relações embutidas, só depois de carregá-las: ver obter_transacao)
+    if if_none_match and not relacoes:
+        versoes, proximo = await repo.versoes_pagina(**filtros, **pagina)
+        etag = etag_pagina(parametros, total, versoes)
+        if casa_if_none_match(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cabecalhos(etag, proximo))
+
+    # colunas direto do banco, codificadas com orjson (sem revalidar pelo response_model)
+    linhas, proximo = await repo.listar_linhas(**filtros, **pagina)
+    dados = campos_saida(linhas, TransacaoSaida)
+    etag = etag_pagina(parametros, total, [(t.id, t.versao) for t in linhas])
+    if relacoes:
+        etag = etag_com_relacoes(etag, await embutir_relacoes(repo, dados, relacoes))
+        if casa_if_none_match(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cabecalhos(etag, proximo))
+    return RespostaJSONRapida(dados, headers=cabecalhos(etag, proximo))
 
 
 # 4. Atualizar transação
 @router.put('/{transacao_id}', response_model=TransacaoSaida)
-def atualizar_transacao(
+async def atualizar_transacao(
     transacao_id: UUID,
     payload: TransacaoAtualizarEntrada,
-    repo: TransacaoRepositorio = Depends(get_repo_trans),
+    response: Response,
+    versoes: Optional[set[int]] = Depends(precondicao_if_match),
+    repo: TransacaoRepositorioAsync = Depends(get_repo_trans_async),
 ):
-    obj = repo.buscar(transacao_id)
-    if not obj:
-        raise nao_encontrada('transacao')
     try:
-        return repo.atualizar_tudo(
-            obj,
+        obj = await repo.atualizar_tudo(
+            transacao_id,
             imovel_codigo=payload.imovel_codigo,
             valor_venda=payload.valor_venda,
+            versoes=versoes,
         )
     except ErroConflitoBD:
         raise conflito('atualização viola restrição')
     except ErroOperacaoBD:
         raise erro_interno('atualizar transação')
+    if not obj:
+        raise await erro_escrita_condicional(repo, transacao_id, versoes)
+    response.headers['ETag'] = etag_versao(obj.versao)
+    return obj
 
 
 # 5. Atualizar status da transação
 @router.patch('/{transacao_id}/status', response_model=TransacaoSaida)
-def atualizar_status_transacao(
+async def atualizar_status_transacao(
     transacao_id: UUID,
     payload: TransacaoAtualizarStatusEntrada,
-    repo: TransacaoRepositorio = Depends(get_repo_trans),
+    response: Response,
+    versoes: Optional[set[int]] = Depends(precondicao_if_match),
+    repo: TransacaoRepositorioAsync = Depends(get_repo_trans_async),
 ):
-    obj = repo.buscar(transacao_id)
-    if not obj:
-        raise nao_encontrada('transacao')
-
-    atual = obj.status
-    novo = payload.status
-
-    if not pode_transicionar(atual, novo):
-        raise transicao_invalida()
-
-    if novo == StatusTransacao.APROVADA:
-        cont = repo.contar_partes_por_tipo(transacao_id)
-        if (
-            cont.get(TipoParte.COMPRADOR, 0) < 1
-            or cont.get(TipoParte.VENDEDOR, 0) < 1
-            or cont.get(TipoParte.CORRETOR, 0) < 1
-        ):
-            raise requisito_partes_nao_atendido()
-
+    # regra de transição e requisito de partes vão no WHERE do UPDATE (uma ida ao banco)
     try:
-        return repo.atualizar_status(obj, novo)
+        obj = await repo.atualizar_status(transacao_id, payload.status, versoes=versoes)
     except ErroConflitoBD:
         raise conflito('atualização de status viola restrição')
     except ErroOperacaoBD:
         raise erro_interno('atualizar status')
+    if not obj:
+        raise await erro_escrita_condicional(repo, transacao_id, versoes, payload.status)
+    response.headers['ETag'] = etag_versao(obj.versao)
+    return obj
 
 
 # 6. Deletar transação
 @router.delete('/{transacao_id}', status_code=status.HTTP_204_NO_CONTENT)
-def deletar_transacao(
+async def deletar_transacao(
     transacao_id: UUID,
-    repo: TransacaoRepositorio = Depends(get_repo_trans),
+    repo: TransacaoRepositorioAsync = Depends(get_repo_trans_async),
 ):
-    obj = repo.buscar(transacao_id)
-    if not obj:
-        raise nao_encontrada('transacao')
     try:
-        repo.deletar(obj)
+        removida = await repo.deletar(transacao_id)
     except ErroConflitoBD:
         raise conflito('não é possível deletar: em uso por outra entidade')
     except ErroOperacaoBD:
         raise erro_interno('deletar transação')
+    if not removida:
+        raise nao_encontrada('transacao')
     return None
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from decimal import Decimal
 from uuid import UUID
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 class ComissaoCriarEntrada(BaseModel):
@@ -25,10 +25,41 @@ class ComissaoSaida(BaseModel):
     percentual: Decimal = Field(description='Percentual aplicado à comissão (0–1, ex.: 0.10 = 10%)')
     valor_calculado: Decimal = Field(
         ge=Decimal('0'),
-        max_digits=5,
-        decimal_places=3,
+        max_digits=12,
+        decimal_places=2,
         description='Valor da comissão calculado a partir do valor de venda'
     )
     paga: bool = Field(description='Indica se a comissão já foi paga')
 
     model_config = {'from_attributes': True}
+
+
+class ComissaoPagarLoteEntrada(BaseModel):
+    '''Seleção das comissões a pagar em lote: por ids ou todas as não pagas de transações'''
+
+    ids: list[UUID] | None = Field(
+        default=None,
+        min_length=1,
+        max_length=5000,
+        description='Comissões a pagar'
+    )
+    transacao_ids: list[UUID] | None = Field(
+        default=None,
+        min_length=1,
+        max_length=5000,
+        description='Paga todas as comissões ainda não pagas destas transações'
+    )
+
+    @model_validator(mode='after')
+    def _uma_selecao(self):
+        if (self.ids is None) == (self.transacao_ids is None):
+            raise ValueError('informe ids ou transacao_ids (apenas um)')
+        return self
+
+
+class ComissaoPagarLoteSaida(BaseModel):
+    '''Resultado de um pagamento em lote'''
+
+    pagas: list[ComissaoSaida] = Field(description='Comissões pagas nesta requisição')
+    ja_pagas: list[UUID] = Field(description='Ids informados que já estavam pagos')
+    nao_encontradas: list[UUID] = Field(description='Ids informados que não existem')
@@ -27,6 +27,12 @@ class ParteCriarEntrada(BaseModel):
     )
 
 
+class ParteLoteEntrada(ParteCriarEntrada):
+    '''Parte de um lote que pode abranger várias transações'''
+
+    transacao_id: UUID = Field(description='Transação à qual a parte será vinculada')
+
+
 class ParteSaida(BaseModel):
     '''Dados de saída de uma parte'''
 
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from pydantic import BaseModel, Field
+
+from helpers.enums import StatusTransacao
+
+
+class TotaisComissao(BaseModel):
+    '''Quantidade e valor de comissões pagas e pendentes'''
+
+    qtd_pagas: int = Field(default=0, description='Quantidade de comissões pagas')
+    valor_pago: Decimal = Field(default=Decimal('0.00'), description='Soma das comissões pagas')
+    qtd_pendentes: int = Field(default=0, description='Quantidade de comissões ainda não pagas')
+    valor_pendente: Decimal = Field(default=Decimal('0.00'), description='Soma das comissões ainda não pagas')
+
+
+class ResumoComissaoLinha(TotaisComissao):
+    '''Totais de um período para um status de transação'''
+
+    periodo: str = Field(description='Dia (AAAA-MM-DD) ou mês (AAAA-MM) de criação da transação, em UTC')
+    status_transacao: StatusTransacao = Field(description='Status atual das transações')
+
+
+class RelatorioComissoesSaida(BaseModel):
+    '''Relatório de comissões pagas x pendentes por período e status'''
+
+    linhas: list[ResumoComissaoLinha] = Field(description='Totais por período e status')
+    total: TotaisComissao = Field(description='Soma de todas as linhas')
+
+
+class TotaisPipeline(BaseModel):
+    '''Quantidade de transações e soma de valor_venda'''
+
+    quantidade: int = Field(default=0, description='Quantidade de transações')
+    valor_total: Decimal = Field(default=Decimal('0.00'), description='Soma de valor_venda')
+
+
+class PipelinePeriodo(BaseModel):
+    '''Transações criadas em um período, pelo status atual'''
+
+    periodo: str = Field(description='Dia (AAAA-MM-DD), semana ISO (AAAA-Wss) ou mês (AAAA-MM) de criação, em UTC')
+    por_status: dict[StatusTransacao, TotaisPipeline] = Field(description='Totais por status atual')
+
+
+class RelatorioPipelineSaida(BaseModel):
+    '''Painel do pipeline de transações por período e status'''
+
+    periodos: list[PipelinePeriodo] = Field(description='Totais de cada período, em ordem cronológica')
+    total: dict[StatusTransacao, TotaisPipeline] = Field(description='Soma de todos os períodos por status')
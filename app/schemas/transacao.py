@@ -6,6 +6,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field
 from helpers.enums import StatusTransacao
+from app.schemas.parte import ParteSaida
+from app.schemas.comissao import ComissaoSaida
 
 
 class TransacaoCriarEntrada(BaseModel):
@@ -67,5 +69,46 @@ class TransacaoSaida(BaseModel):
         default=None,
         description='Data/hora da última atualização em UTC (se houver)'
     )
+    versao: int = Field(description='Versão da transação (mesmo valor do ETag)')
+    qtd_compradores: int = Field(description='Quantidade de partes COMPRADOR')
+    qtd_vendedores: int = Field(description='Quantidade de partes VENDEDOR')
+    qtd_corretores: int = Field(description='Quantidade de partes CORRETOR')
 
     model_config = {'from_attributes': True}
+
+
+class TransacaoDetalhadaSaida(TransacaoSaida):
+    '''Transação com as relações pedidas em ?incluir= (ausentes quando não pedidas)'''
+
+    partes: list[ParteSaida] | None = Field(default=None, description='Partes (com ?incluir=partes)')
+    comissoes: list[ComissaoSaida] | None = Field(default=None, description='Comissões (com ?incluir=comissoes)')
+
+
+class TransacaoBuscarLoteEntrada(BaseModel):
+    '''Ids das transações a buscar de uma vez'''
+
+    ids: list[UUID] = Field(min_length=1, max_length=1000, description='Transações a buscar')
+
+
+class TransacaoBuscarLoteSaida(BaseModel):
+    '''Resultado de uma busca em lote'''
+
+    encontradas: list[TransacaoDetalhadaSaida] = Field(description='Transações encontradas, na ordem pedida')
+    nao_encontradas: list[UUID] = Field(description='Ids informados que não existem')
+
+
+class ErroLinhaImportacao(BaseModel):
+    '''Erro de uma linha rejeitada na importação'''
+
+    linha: int = Field(description='Número da linha no arquivo (1 = primeira linha)')
+    erros: list[str] = Field(description='Motivos da rejeição')
+
+
+class TransacaoImportacaoSaida(BaseModel):
+    '''Resumo de uma importação em massa de Transações'''
+
+    total_linhas: int = Field(description='Registros lidos (sem cabeçalho e linhas em branco)')
+    importadas: int = Field(description='Transações gravadas')
+    rejeitadas: int = Field(description='Registros rejeitados')
+    erros: list[ErroLinhaImportacao] = Field(description='Erros por linha (limitado pela configuração)')
+    erros_omitidos: int = Field(default=0, description='Erros além do limite, não listados')
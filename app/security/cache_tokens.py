@@ -0,0 +1,91 @@
+import hashlib
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional
+
+from core.config import settings
+
+
+class CacheTokens:
+    '''
+    Cache em memória (por processo) das claims de tokens já verificados, chaveado pelo SHA-256 do token.
+    Cada entrada vale até o `exp` do token ou por `ttl` segundos, o que vier antes: é o atraso
+    máximo para uma revogação feita em outro worker (tabela token_revogado) valer neste.
+    `revogar(jti)` derruba o token no cache deste processo na hora. max_itens=0 desliga o cache.
+    '''
+
+    def __init__(self, max_itens: int = 10_000, ttl: float = 30):
+        self.max_itens = max_itens
+        self.ttl = ttl
+        self._itens: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+        self._revogados: dict[str, float] = {}  # jti -> exp (some da lista quando o token expira)
+        self._trava = Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    @staticmethod
+    def _chave(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def obter(self, token: str) -> Optional[dict]:
+        if not self.max_itens:
+            return None
+        chave = self._chave(token)
+        with self._trava:
+            item = self._itens.get(chave)
+            if item is None or item[0] <= time.time():
+                if item is not None:
+                    del self._itens[chave]
+                self.falhas += 1
+                return None
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+            return dict(item[1])
+
+    def guardar(self, token: str, claims: dict) -> None:
+        if not self.max_itens:
+            return
+        chave = self._chave(token)
+        with self._trava:
+            if claims.get('jti') in self._revogados:
+                return  # revogado entre a verificação e aqui
+            self._itens[chave] = (min(float(claims['exp']), time.time() + self.ttl), dict(claims))
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+
+    def revogado(self, jti: Optional[str]) -> bool:
+        if jti is None:
+            return False
+        with self._trava:
+            return jti in self._revogados
+
+    def revogar(self, jti: str, exp: float) -> None:
+        agora = time.time()
+        with self._trava:
+            # a lista só cresce com tokens ainda válidos: poda os que já expiraram
+            for antigo in [j for j, e in self._revogados.items() if e <= agora]:
+                del self._revogados[antigo]
+            self._revogados[jti] = exp
+            for chave in [c for c, (_, claims) in self._itens.items() if claims.get('jti') == jti]:
+                del self._itens[chave]
+
+    def estatisticas(self) -> dict:
+        with self._trava:
+            return {
+                'acertos': self.acertos,
+                'falhas': self.falhas,
+                'itens': len(self._itens),
+                'revogados': len(self._revogados),
+                'max_itens': self.max_itens,
+            }
+
+    def limpar(self) -> None:
+        with self._trava:
+            self._itens.clear()
+            self._revogados.clear()
+            self.acertos = self.falhas = 0
+
+
+cache_tokens = CacheTokens(max_itens=settings.JWT_CACHE_MAX_ITENS, ttl=settings.JWT_CACHE_TTL)
@@ -4,7 +4,12 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import jwt
 
 from core.config import settings
-from helpers.erros_http import nao_autorizado
+from helpers.db_session import get_repo_token_revogado_async
+from helpers.erros_db import ErroOperacaoBD
+from helpers.erros_http import nao_autorizado, erro_interno
+from infra.repositories.token_revogado import TokenRevogadoRepositorioAsync
+from app.security.cache_tokens import cache_tokens
+from helpers.contexto import contexto_requisicao
 
 portador = HTTPBearer(auto_error=False)
 
@@ -23,11 +28,21 @@ def criar_jwt(sub: str, claims_extra: dict | None = None) -> str:
         payload.update(claims_extra)
     return jwt.encode(payload, segredo, algorithm=alg)
 
-def validar_jwt(credenciais: HTTPAuthorizationCredentials | None = Depends(portador)) -> dict:
+# async: não ocupa uma thread do threadpool a cada requisição. Token em cache: só CPU; fora do
+# cache, uma consulta à tabela de revogados (a sessão só abre conexão se for usada)
+async def validar_jwt(
+    credenciais: HTTPAuthorizationCredentials | None = Depends(portador),
+    revogados: TokenRevogadoRepositorioAsync = Depends(get_repo_token_revogado_async),
+) -> dict:
     if not credenciais:
         raise nao_autorizado('token ausente')
 
     token = credenciais.credentials
+    # token já verificado e ainda dentro do exp: dispensa assinatura e claims
+    dados = cache_tokens.obter(token)
+    if dados is not None:
+        return _no_contexto(dados)
+
     try:
         dados = jwt.decode(
             token,
@@ -35,8 +50,26 @@ def validar_jwt(credenciais: HTTPAuthorizationCredentials | None = Depends(porta
             algorithms=[settings.JWT_ALGORITMO],
             options={'require': ['exp', 'iat']}  # exige que esses campos estejam presentes
         )
-        return dados
     except jwt.ExpiredSignatureError:
         raise nao_autorizado('token expirado')
     except jwt.InvalidTokenError:
         raise nao_autorizado('token inválido')
+
+    jti = dados.get('jti')
+    if cache_tokens.revogado(jti):
+        raise nao_autorizado('token revogado')
+    if jti is not None:
+        try:
+            if await revogados.revogado(jti):
+                raise nao_autorizado('token revogado')
+        except ErroOperacaoBD:
+            raise erro_interno('verificar revogação do token')
+    cache_tokens.guardar(token, dados)
+    return _no_contexto(dados)
+
+def _no_contexto(dados: dict) -> dict:
+    # sub/jti do token nos logs da requisição
+    ctx = contexto_requisicao.get()
+    if ctx is not None:
+        ctx.sub, ctx.jti = dados.get('sub'), dados.get('jti')
+    return dados
@@ -0,0 +1,8 @@
+import os
+
+# valores mínimos para instanciar o Config sem um .env (os scripts rodam com `python -m benchmarks.<nome>`)
+os.environ.setdefault('API_PREFIX', '/api/v1')
+os.environ.setdefault('DATABASE_URL', 'sqlite+pysqlite:///:memory:')
+os.environ.setdefault('JWT_SEGREDO', 'bench')
+os.environ.setdefault('JWT_ALGORITMO', 'HS256')
+os.environ.setdefault('JWT_MINUTOS', '30')
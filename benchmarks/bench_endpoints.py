@@ -0,0 +1,182 @@
+'''
+Latência e vazão das rotas principais, em processo (TestClient), com a base populada em
+vários tamanhos. Grava uma linha de base em JSON e compara execuções contra ela.
+
+Uso:
+    python -m benchmarks.bench_endpoints --tamanhos 1000,100000 --saida base.json
+    python -m benchmarks.bench_endpoints --tamanhos 1000,100000 --comparar base.json --tolerancia 0.15
+
+Por padrão usa um SQLite temporário; para medir no Postgres aponte BENCH_DATABASE_URL
+para um banco descartável (as tabelas são recriadas a cada tamanho). `--comparar` sai com
+código 1 quando alguma rota piora além da tolerância (p95 maior ou vazão menor).
+'''
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.comum import url_bench, preparar_banco, cliente_app
+from helpers.enums import StatusTransacao
+from infra.models.transacao import Transacao as TransacaoORM
+from infra.repositories.resumo_pipeline import ResumoPipelineRepositorio
+
+ROTAS = (
+    'criar_transacao',
+    'listar_transacoes',
+    'atualizar_status_transacao',
+    'adicionar_parte',
+    'criar_comissao',
+    'pagar_comissao',
+)
+
+
+def semear(engine, linhas: int, lote: int = 10_000) -> list:
+    # transações CRIADA com datas distintas; devolve os ids para as rotas que escrevem
+    base = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    ids = []
+    with engine.begin() as conn:
+        for ini in range(0, linhas, lote):
+            bloco = [
+                {
+                    'id': uuid4(),
+                    'imovel_codigo': f'IMO-{i % 1000}',
+                    'valor_venda': Decimal('100000.00'),
+                    'status': StatusTransacao.CRIADA,
+                    'data_criacao': base + timedelta(seconds=i),
+                    'data_atualizacao': base + timedelta(seconds=i),
+                }
+                for i in range(ini, min(ini + lote, linhas))
+            ]
+            conn.execute(insert(TransacaoORM), bloco)
+            ids += [linha['id'] for linha in bloco]
+    with sessionmaker(bind=engine)() as db:
+        ResumoPipelineRepositorio(db).reconstruir()
+    return ids
+
+
+def estatisticas(tempos_ms: list[float], duracao_s: float) -> dict:
+    centis = statistics.quantiles(tempos_ms, n=100, method='inclusive')
+    return {
+        'requisicoes': len(tempos_ms),
+        'vazao_rps': round(len(tempos_ms) / duracao_s, 1),
+        'p50_ms': round(centis[49], 3),
+        'p95_ms': round(centis[94], 3),
+        'p99_ms': round(centis[98], 3),
+    }
+
+
+def medir(chamada, argumentos: list) -> tuple[dict, list]:
+    # uma requisição por argumento; devolve as estatísticas e os corpos (para encadear rotas)
+    tempos, corpos = [], []
+    ini_total = time.perf_counter()
+    for arg in argumentos:
+        ini = time.perf_counter()
+        r = chamada(arg)
+        tempos.append((time.perf_counter() - ini) * 1000)
+        r.raise_for_status()
+        corpos.append(r.json())
+    return estatisticas(tempos, time.perf_counter() - ini_total), corpos
+
+
+def rodar_tamanho(url: str, tamanho: int, requisicoes: int) -> dict:
+    engine = preparar_banco(url)
+    ids = semear(engine, tamanho)
+    engine.dispose()
+    alvos = [str(i) for i in ids[-requisicoes:]]  # as mais recentes: primeira página da listagem
+    base = '/api/v1/transacoes'
+
+    resultado = {}
+    with cliente_app(url) as cliente:
+        resultado['criar_transacao'], _ = medir(
+            lambda i: cliente.post(base, json={'imovel_codigo': f'B-{i}', 'valor_venda': '1000.00'}),
+            list(range(requisicoes)),
+        )
+        resultado['listar_transacoes'], _ = medir(
+            lambda _: cliente.get(base, params={'limit': 50}),
+            list(range(requisicoes)),
+        )
+        resultado['atualizar_status_transacao'], _ = medir(
+            lambda tid: cliente.patch(f'{base}/{tid}/status', json={'status': 'EM_ANALISE'}),
+            alvos,
+        )
+        resultado['adicionar_parte'], _ = medir(
+            lambda tid: cliente.post(f'{base}/{tid}/partes', json={'nome': 'Ana', 'cpf_cnpj': '12345678901', 'tipo': 'COMPRADOR'}),
+            alvos,
+        )
+        resultado['criar_comissao'], comissoes = medir(
+            lambda tid: cliente.post(f'{base}/{tid}/comissoes', json={'percentual': '0.05'}),
+            alvos,
+        )
+        resultado['pagar_comissao'], _ = medir(
+            lambda cid: cliente.post(f'/api/v1/comissoes/{cid}/pagar'),
+            [c['id'] for c in comissoes],
+        )
+    return resultado
+
+
+def comparar(base: dict, atual: dict, tolerancia: float) -> list[str]:
+    # regressões: p95 acima de base * (1 + tolerância) ou vazão abaixo de base * (1 - tolerância)
+    regressoes = []
+    for tamanho, rotas in atual['resultados'].items():
+        for rota, medida in rotas.items():
+            anterior = base['resultados'].get(tamanho, {}).get(rota)
+            if anterior is None:
+                continue
+            if medida['p95_ms'] > anterior['p95_ms'] * (1 + tolerancia):
+                regressoes.append(f"{tamanho} {rota}: p95 {anterior['p95_ms']:.2f} -> {medida['p95_ms']:.2f} ms")
+            if medida['vazao_rps'] < anterior['vazao_rps'] * (1 - tolerancia):
+                regressoes.append(f"{tamanho} {rota}: vazão {anterior['vazao_rps']:.1f} -> {medida['vazao_rps']:.1f} req/s")
+    return regressoes
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tamanhos', default='1000', help='transações na base, separadas por vírgula (ex.: 1000,100000,1000000)')
+    parser.add_argument('--requisicoes', type=int, default=200, help='requisições por rota e tamanho')
+    parser.add_argument('--saida', help='grava o resultado (linha de base) neste JSON')
+    parser.add_argument('--comparar', help='JSON de uma linha de base anterior')
+    parser.add_argument('--tolerancia', type=float, default=0.10, help='piora aceita antes de acusar regressão (0.10 = 10%%)')
+    args = parser.parse_args()
+
+    url = url_bench()
+    atual = {
+        'meta': {
+            'data': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'banco': url.split(':', 1)[0],
+            'python': platform.python_version(),
+            'requisicoes': args.requisicoes,
+        },
+        'resultados': {},
+    }
+    for tamanho in (int(t) for t in args.tamanhos.split(',')):
+        atual['resultados'][str(tamanho)] = rodar_tamanho(url, tamanho, args.requisicoes)
+
+    print(f'{"tamanho":>9} {"rota":<28} {"req/s":>9} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8}')
+    for tamanho, rotas in atual['resultados'].items():
+        for rota in ROTAS:
+            m = rotas[rota]
+            print(f'{tamanho:>9} {rota:<28} {m["vazao_rps"]:>9.1f} {m["p50_ms"]:>8.2f} {m["p95_ms"]:>8.2f} {m["p99_ms"]:>8.2f}')
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(atual, f, indent=2)
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            regressoes = comparar(json.load(f), atual, args.tolerancia)
+        for linha in regressoes:
+            print(f'REGRESSÃO {linha}', file=sys.stderr)
+        return 1 if regressoes else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
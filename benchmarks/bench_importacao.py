@@ -0,0 +1,44 @@
+'''
+Vazão da importação em massa vs. um POST /transacoes por registro.
+
+Uso:
+    python -m benchmarks.bench_importacao --registros 20000 --unitarios 500
+'''
+import argparse
+import time
+
+from benchmarks.comum import url_bench, preparar_banco, cliente_app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--registros', type=int, default=20_000)
+    parser.add_argument('--unitarios', type=int, default=500, help='amostra de POSTs unitários')
+    args = parser.parse_args()
+
+    url = url_bench()
+    preparar_banco(url).dispose()
+
+    with cliente_app(url) as cliente:
+        ini = time.perf_counter()
+        for i in range(args.unitarios):
+            r = cliente.post('/api/v1/transacoes', json={'imovel_codigo': f'U-{i}', 'valor_venda': '1000.00'})
+            r.raise_for_status()
+        unitario = args.unitarios / (time.perf_counter() - ini)
+
+        def corpo():
+            yield b'imovel_codigo,valor_venda\n'
+            for i in range(args.registros):
+                yield f'L-{i},1000.00\n'.encode()
+
+        ini = time.perf_counter()
+        r = cliente.post('/api/v1/transacoes/importar', content=corpo(), headers={'Content-Type': 'text/csv'})
+        r.raise_for_status()
+        lote = r.json()['importadas'] / (time.perf_counter() - ini)
+
+    print(f'POST unitário: {unitario:>10.1f} registros/s')
+    print(f'importação:    {lote:>10.1f} registros/s  ({lote / unitario:.0f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+'''
+Custo de autenticação por requisição: validar_jwt com e sem o cache de tokens verificados.
+
+Uso:
+    python -m benchmarks.bench_jwt --chamadas 50000 --tokens 100
+
+Mede a dependência isolada (sem HTTP nem banco): `--tokens` clientes distintos repetindo
+o próprio token, como no tráfego real. "sem cache" desliga o cache (max_itens=0).
+'''
+import argparse
+import asyncio
+import statistics
+import time
+
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.security.cache_tokens import cache_tokens
+from app.security.security_jwt import criar_jwt, validar_jwt
+
+
+async def rodar(credenciais: list[HTTPAuthorizationCredentials], chamadas: int) -> list[float]:
+    # microssegundos por chamada
+    tempos = []
+    for i in range(chamadas):
+        ini = time.perf_counter()
+        await validar_jwt(credenciais[i % len(credenciais)])
+        tempos.append((time.perf_counter() - ini) * 1_000_000)
+    return tempos
+
+
+def resumo(tempos: list[float]) -> str:
+    tempos = sorted(tempos)
+    p99 = tempos[int(len(tempos) * 0.99) - 1]
+    return f'{statistics.median(tempos):>10.2f} {p99:>10.2f}'
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--chamadas', type=int, default=50_000)
+    parser.add_argument('--tokens', type=int, default=100)
+    args = parser.parse_args()
+
+    credenciais = [
+        HTTPAuthorizationCredentials(scheme='Bearer', credentials=criar_jwt(f'cliente-{i}', {'jti': str(i)}))
+        for i in range(args.tokens)
+    ]
+    max_itens = cache_tokens.max_itens
+
+    print(f'{"modo":<10} {"p50 (us)":>10} {"p99 (us)":>10}')
+    cache_tokens.max_itens = 0
+    print(f'{"sem cache":<10} {resumo(asyncio.run(rodar(credenciais, args.chamadas)))}')
+
+    cache_tokens.max_itens = max(max_itens, args.tokens)
+    cache_tokens.limpar()
+    print(f'{"com cache":<10} {resumo(asyncio.run(rodar(credenciais, args.chamadas)))}')
+    print(f'cache: {cache_tokens.estatisticas()}')
+
+
+if __name__ == '__main__':
+    main()
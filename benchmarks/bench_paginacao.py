@@ -0,0 +1,99 @@
+'''
+Latência de página profunda: OFFSET vs. cursor keyset em TransacaoRepositorio.listar.
+
+Uso:
+    python -m benchmarks.bench_paginacao --linhas 200000 --limite 50
+
+Por padrão usa um SQLite temporário; para medir no Postgres aponte BENCH_DATABASE_URL
+para um banco descartável (as tabelas são recriadas).
+'''
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from infra.database import Base
+from infra.models.transacao import Transacao as TransacaoORM
+from infra.repositories.transacao import TransacaoRepositorio
+from helpers.enums import StatusTransacao
+import infra.models.parte  # noqa: F401
+import infra.models.comissao  # noqa: F401
+import infra.models.resumo_comissao  # noqa: F401
+import infra.models.resumo_pipeline  # noqa: F401
+import infra.models.token_revogado  # noqa: F401
+
+
+def semear(engine, linhas: int, lote: int = 10_000) -> None:
+    base = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    with engine.begin() as conn:
+        for ini in range(0, linhas, lote):
+            conn.execute(insert(TransacaoORM), [
+                {
+                    'id': uuid4(),
+                    'imovel_codigo': f'IMO-{i % 1000}',
+                    'valor_venda': Decimal('100000.00'),
+                    'status': StatusTransacao.CRIADA,
+                    'data_criacao': base + timedelta(seconds=i),
+                    'data_atualizacao': base + timedelta(seconds=i),
+                }
+                for i in range(ini, min(ini + lote, linhas))
+            ])
+
+
+def medir(funcao, repeticoes: int) -> float:
+    # mediana em ms
+    tempos = []
+    for _ in range(repeticoes):
+        ini = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - ini) * 1000)
+    return statistics.median(tempos)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--linhas', type=int, default=200_000)
+    parser.add_argument('--limite', type=int, default=50)
+    parser.add_argument('--repeticoes', type=int, default=5)
+    args = parser.parse_args()
+
+    url = os.environ.get('BENCH_DATABASE_URL') or f'sqlite+pysqlite:///{tempfile.mkdtemp()}/bench.db'
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    semear(engine, args.linhas)
+    Sessao = sessionmaker(bind=engine, expire_on_commit=False)
+
+    filtros = dict(status_filtro=None, imovel_codigo=None, data_ini=None, data_fim=None, limit=args.limite)
+    ordem = (TransacaoORM.data_criacao.desc(), TransacaoORM.id.desc())
+
+    print(f'{"pagina":>8} {"offset (ms)":>12} {"cursor (ms)":>12}')
+    pagina = 1
+    while (pagina - 1) * args.limite < args.linhas:
+        profundidade = (pagina - 1) * args.limite
+        with Sessao() as db:
+            repo = TransacaoRepositorio(db)
+            chave = None
+            if profundidade:
+                # chave do último item da página anterior, fora da medição
+                chave = tuple(db.execute(
+                    select(TransacaoORM.data_criacao, TransacaoORM.id)
+                    .order_by(*ordem).offset(profundidade - 1).limit(1)
+                ).one())
+            t_offset = medir(lambda: repo.listar(**filtros, offset=profundidade), args.repeticoes)
+            t_cursor = medir(lambda: repo.listar(**filtros, cursor=chave), args.repeticoes)
+        print(f'{pagina:>8} {t_offset:>12.2f} {t_cursor:>12.2f}')
+        pagina *= 10
+
+    engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
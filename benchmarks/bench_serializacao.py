@@ -0,0 +1,105 @@
+'''
+Resposta de listagem: caminho do response_model (objetos ORM -> validação Pydantic -> json.dumps)
+vs. resposta rápida (colunas -> campos do esquema -> orjson), para transações, partes e comissões.
+
+Uso:
+    python -m benchmarks.bench_serializacao --itens 100 --repeticoes 200
+
+Cada medição inclui a consulta da página e a codificação do corpo, como numa requisição.
+'''
+import argparse
+import json
+import statistics
+import time
+from decimal import Decimal
+from uuid import uuid4
+
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.comum import url_bench, preparar_banco
+from app.schemas.transacao import TransacaoSaida
+from app.schemas.parte import ParteSaida
+from app.schemas.comissao import ComissaoSaida
+from helpers.enums import StatusTransacao, TipoParte
+from helpers.serializacao import campos_saida, json_rapido
+from infra.models.transacao import Transacao as TransacaoORM
+from infra.models.parte import Parte as ParteORM
+from infra.models.comissao import Comissao as ComissaoORM
+
+
+def semear(engine, itens: int) -> None:
+    ids = [uuid4() for _ in range(itens)]
+    with engine.begin() as conn:
+        conn.execute(insert(TransacaoORM), [
+            {'id': i, 'imovel_codigo': f'IMO-{n}', 'valor_venda': Decimal('350000.00'), 'status': StatusTransacao.CRIADA}
+            for n, i in enumerate(ids)
+        ])
+        conn.execute(insert(ParteORM), [
+            {'transacao_id': i, 'tipo': TipoParte.COMPRADOR, 'nome': 'Comprador', 'cpf_cnpj': '12345678901', 'email': 'c@exemplo.com'}
+            for i in ids
+        ])
+        conn.execute(insert(ComissaoORM), [
+            {'transacao_id': i, 'percentual': Decimal('0.050'), 'valor_calculado': Decimal('17500.00'), 'paga': False}
+            for i in ids
+        ])
+
+
+def caminho_atual(db, modelo, esquema, itens: int) -> bytes:
+    # o que o FastAPI faz com response_model=List[...]: valida de novo e serializa em modo JSON
+    adaptador = TypeAdapter(list[esquema])
+    objs = db.scalars(select(modelo).limit(itens)).all()
+    conteudo = adaptador.dump_python(adaptador.validate_python(objs, from_attributes=True), mode='json')
+    return json.dumps(conteudo, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+def caminho_rapido(db, modelo, esquema, itens: int) -> bytes:
+    linhas = db.execute(select(*modelo.__table__.columns).limit(itens)).all()
+    return json_rapido(campos_saida(linhas, esquema))
+
+
+def medir(funcao, repeticoes: int) -> float:
+    # mediana em ms
+    tempos = []
+    for _ in range(repeticoes):
+        ini = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - ini) * 1000)
+    return statistics.median(tempos)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--itens', type=int, default=100)
+    parser.add_argument('--repeticoes', type=int, default=200)
+    args = parser.parse_args()
+
+    engine = preparar_banco(url_bench())
+    semear(engine, args.itens)
+    Sessao = sessionmaker(bind=engine)
+
+    print(f'{"entidade":<12} {"atual (ms)":>11} {"rápido (ms)":>12} {"ganho":>7}')
+    for nome, modelo, esquema in (
+        ('transacoes', TransacaoORM, TransacaoSaida),
+        ('partes', ParteORM, ParteSaida),
+        ('comissoes', ComissaoORM, ComissaoSaida),
+    ):
+        # sessão nova por chamada: o identity map não pode reaproveitar objetos entre medições
+        def atual():
+            with Sessao() as db:
+                return caminho_atual(db, modelo, esquema, args.itens)
+
+        def rapido():
+            with Sessao() as db:
+                return caminho_rapido(db, modelo, esquema, args.itens)
+
+        assert json.loads(atual()) == json.loads(rapido()), nome
+        t_atual, t_rapido = medir(atual, args.repeticoes), medir(rapido, args.repeticoes)
+        print(f'{nome:<12} {t_atual:>11.3f} {t_rapido:>12.3f} {t_atual / t_rapido:>6.1f}x')
+
+    engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+'''
+Carga concorrente: rotas síncronas (threadpool + psycopg2) vs. rotas async (driver asyncio),
+com o mesmo tamanho de pool nos dois lados.
+
+Uso:
+    python -m benchmarks.carga_async --requisicoes 2000 --concorrencia 100 --pool 10
+
+As duas apps expõem as mesmas leituras (GET por id e listagem) sobre os repositórios do projeto
+e são exercitadas em processo via httpx. O ganho do caminho async aparece quando o banco tem
+latência de rede: aponte BENCH_DATABASE_URL para um Postgres descartável (as tabelas são recriadas).
+'''
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from infra.database import Base, url_async
+from infra.models.transacao import Transacao as TransacaoORM
+from infra.repositories.transacao import TransacaoRepositorio, TransacaoRepositorioAsync
+from helpers.enums import StatusTransacao
+import infra.models.parte  # noqa: F401
+import infra.models.comissao  # noqa: F401
+import infra.models.resumo_comissao  # noqa: F401
+import infra.models.resumo_pipeline  # noqa: F401
+import infra.models.token_revogado  # noqa: F401
+
+FILTROS = dict(status_filtro=None, imovel_codigo=None, data_ini=None, data_fim=None)
+
+
+def app_sincrona(url: str, pool: int) -> FastAPI:
+    engine = create_engine(url, pool_size=pool, max_overflow=0, pool_pre_ping=True)
+    Sessao = sessionmaker(bind=engine, expire_on_commit=False)
+    app = FastAPI()
+
+    def sessao():
+        with Sessao() as db:
+            yield db
+
+    @app.get('/transacoes/{transacao_id}')
+    def obter(transacao_id: UUID, db=Depends(sessao)):
+        return {'id': str(TransacaoRepositorio(db).buscar(transacao_id).id)}
+
+    @app.get('/transacoes')
+    def listar(db=Depends(sessao)):
+        itens, _ = TransacaoRepositorio(db).listar(**FILTROS, limit=20)
+        return [str(it.id) for it in itens]
+
+    app.state.encerrar = engine.dispose
+    return app
+
+
+def app_async(url: str, pool: int) -> FastAPI:
+    engine = create_async_engine(url_async(url), pool_size=pool, max_overflow=0, pool_pre_ping=True)
+    Sessao = async_sessionmaker(bind=engine, expire_on_commit=False)
+    app = FastAPI()
+
+    async def sessao():
+        async with Sessao() as db:
+            yield db
+
+    @app.get('/transacoes/{transacao_id}')
+    async def obter(transacao_id: UUID, db=Depends(sessao)):
+        return {'id': str((await TransacaoRepositorioAsync(db).buscar(transacao_id)).id)}
+
+    @app.get('/transacoes')
+    async def listar(db=Depends(sessao)):
+        itens, _ = await TransacaoRepositorioAsync(db).listar(**FILTROS, limit=20)
+        return [str(it.id) for it in itens]
+
+    app.state.encerrar = engine.dispose
+    return app
+
+
+async def disparar(app: FastAPI, ids: list[UUID], requisicoes: int, concorrencia: int) -> tuple[float, list[float]]:
+    latencias: list[float] = []
+    semaforo = asyncio.Semaphore(concorrencia)
+    transporte = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transporte, base_url='http://bench') as cliente:
+        async def uma(i: int):
+            caminho = '/transacoes' if i % 5 == 0 else f'/transacoes/{random.choice(ids)}'
+            async with semaforo:
+                ini = time.perf_counter()
+                r = await cliente.get(caminho)
+                latencias.append((time.perf_counter() - ini) * 1000)
+                r.raise_for_status()
+
+        ini = time.perf_counter()
+        await asyncio.gather(*(uma(i) for i in range(requisicoes)))
+        duracao = time.perf_counter() - ini
+
+    # libera as conexões do pool (no async, o dispose precisa rodar neste event loop)
+    resultado = app.state.encerrar()
+    if asyncio.iscoroutine(resultado):
+        await resultado
+    return requisicoes / duracao, latencias
+
+
+def percentil(valores: list[float], p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--linhas', type=int, default=10_000)
+    parser.add_argument('--requisicoes', type=int, default=2_000)
+    parser.add_argument('--concorrencia', type=int, default=100)
+    parser.add_argument('--pool', type=int, default=10)
+    args = parser.parse_args()
+
+    url = os.environ.get('BENCH_DATABASE_URL') or f'sqlite+pysqlite:///{tempfile.mkdtemp()}/bench.db'
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    base = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    linhas = [
+        {
+            'id': uuid4(), 'imovel_codigo': f'IMO-{i}', 'valor_venda': Decimal('1000.00'),
+            'status': StatusTransacao.CRIADA, 'data_criacao': base + timedelta(seconds=i),
+            'data_atualizacao': base + timedelta(seconds=i),
+        }
+        for i in range(args.linhas)
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(TransacaoORM), linhas)
+    engine.dispose()
+    ids = [linha['id'] for linha in linhas]
+
+    print(f'{"caminho":<8} {"req/s":>10} {"p50 (ms)":>10} {"p99 (ms)":>10}')
+    for nome, fabrica in (('sync', app_sincrona), ('async', app_async)):
+        vazao, latencias = asyncio.run(disparar(fabrica(url, args.pool), ids, args.requisicoes, args.concorrencia))
+        print(f'{nome:<8} {vazao:>10.1f} {statistics.median(latencias):>10.2f} {percentil(latencias, 0.99):>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
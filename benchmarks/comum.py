@@ -0,0 +1,53 @@
+import os
+import tempfile
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from main import app
+from infra.database import Base, gera_sessao, gera_sessao_async, url_async
+from app.security.security_jwt import criar_jwt
+from helpers.db_session import get_fabrica_sessao_async, get_fabrica_leitura_async
+import infra.models.transacao  # noqa: F401  (registra as tabelas no metadata)
+import infra.models.parte  # noqa: F401
+import infra.models.comissao  # noqa: F401
+import infra.models.resumo_comissao  # noqa: F401
+import infra.models.resumo_pipeline  # noqa: F401
+import infra.models.token_revogado  # noqa: F401
+
+
+def url_bench() -> str:
+    # Postgres descartável via BENCH_DATABASE_URL; senão um SQLite temporário
+    return os.environ.get('BENCH_DATABASE_URL') or f'sqlite+pysqlite:///{tempfile.mkdtemp()}/bench.db'
+
+
+def preparar_banco(url: str) -> Engine:
+    # recria as tabelas do zero
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def cliente_app(url: str) -> TestClient:
+    # TestClient da app real apontando as sessões (sync e async) para `url`
+    Sessao = sessionmaker(bind=create_engine(url), autoflush=False, expire_on_commit=False)
+    SessaoAsync = async_sessionmaker(bind=create_async_engine(url_async(url)), autoflush=False, expire_on_commit=False)
+
+    def sessao():
+        with Sessao() as db:
+            yield db
+
+    async def sessao_async():
+        async with SessaoAsync() as db:
+            yield db
+
+    app.dependency_overrides[gera_sessao] = sessao
+    app.dependency_overrides[gera_sessao_async] = sessao_async
+    app.dependency_overrides[get_fabrica_sessao_async] = lambda: SessaoAsync
+    app.dependency_overrides[get_fabrica_leitura_async] = lambda: SessaoAsync
+    token = criar_jwt(sub='bench', claims_extra={'jti': 'bench'})
+    return TestClient(app, headers={'Authorization': f'Bearer {token}'})
@@ -0,0 +1,49 @@
+'''
+Manutenção das tabelas de resumo (relatórios de comissões e painel do pipeline).
+
+Uso:
+    python -m comandos.resumos verificar [--resumo comissoes|pipeline]    # compara com um recálculo completo
+    python -m comandos.resumos reconstruir [--resumo comissoes|pipeline]  # recalcula do zero
+
+Sem `--resumo`, atua em todos. `verificar` termina com código 1 quando encontra
+divergências (útil em cron/alerta).
+'''
+import argparse
+import json
+import sys
+
+from infra.database import SessionLocal
+from infra.repositories.resumo_comissao import ResumoComissaoRepositorio
+from infra.repositories.resumo_pipeline import ResumoPipelineRepositorio
+
+RESUMOS = {
+    'comissoes': ResumoComissaoRepositorio,
+    'pipeline': ResumoPipelineRepositorio,
+}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('acao', choices=['verificar', 'reconstruir'])
+    parser.add_argument('--resumo', choices=sorted(RESUMOS), help='padrão: todos')
+    args = parser.parse_args(argv)
+
+    codigo = 0
+    with SessionLocal() as db:
+        for nome in [args.resumo] if args.resumo else sorted(RESUMOS):
+            repo = RESUMOS[nome](db)
+            if args.acao == 'reconstruir':
+                print(f'{nome}: resumo reconstruído, {repo.reconstruir()} linhas')
+                continue
+
+            divergencias = repo.verificar()
+            for d in divergencias:
+                print(json.dumps({'resumo': nome, **d}, default=str))
+            print(f'{nome}: {len(divergencias)} divergência(s)', file=sys.stderr)
+            if divergencias:
+                codigo = 1
+    return codigo
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,7 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from helpers.enums import EstrategiaContagem, EstrategiaPrePing
+
 class Config(BaseSettings):
     # Atributos obrigatórios da classe.
     API_PREFIX: str
@@ -8,6 +10,57 @@ class Config(BaseSettings):
     JWT_ALGORITMO: str
     JWT_MINUTOS: int
 
+    # Tokens já verificados mantidos em memória (0 desliga o cache), cada um por até JWT_CACHE_TTL
+    # segundos. A revogação fica na tabela token_revogado (vale para todos os workers e sobrevive
+    # a reinícios), consultada uma vez por token fora do cache: num worker que já tinha o token em
+    # cache, a revogação feita em outro leva até JWT_CACHE_TTL segundos para valer
+    JWT_CACHE_MAX_ITENS: int = 10_000
+    JWT_CACHE_TTL: int = 30
+
+    # URL do driver asyncio; se ausente, é derivada de DATABASE_URL (psycopg2 -> asyncpg)
+    DATABASE_URL_ASYNC: str | None = None
+
+    # Pool de conexões (por engine e por processo/worker). Reciclagem em segundos (-1 desliga)
+    POOL_TAMANHO: int = 5
+    POOL_MAX_EXTRA: int = 10
+    POOL_TIMEOUT: float = 30
+    POOL_RECICLAR: int = -1
+    POOL_PRE_PING: EstrategiaPrePing = EstrategiaPrePing.SEMPRE
+    POOL_PRE_PING_OCIOSA_SEGUNDOS: float = 30
+
+    # Réplica de leitura para GETs/listagens (opcional). Depois de uma escrita o cliente
+    # fica preso ao primário por LEITURA_FIXAR_PRIMARIO_SEGUNDOS (cookie), para ler o que gravou
+    DATABASE_URL_LEITURA: str | None = None
+    LEITURA_FIXAR_PRIMARIO_SEGUNDOS: int = 5
+
+    # Contagem das listagens (X-Total-Count): estratégia padrão e validade do cache em segundos
+    CONTAGEM_ESTRATEGIA: EstrategiaContagem = EstrategiaContagem.EXATA
+    CONTAGEM_CACHE_TTL: int = 30
+
+    # Importação em massa: linhas por INSERT/commit e quantos erros por linha devolver na resposta
+    IMPORTACAO_LOTE: int = 1000
+    IMPORTACAO_MAX_ERROS: int = 1000
+    # Tamanho máximo (caracteres) de uma linha/registro: acima disso a linha é rejeitada sem ser acumulada
+    IMPORTACAO_MAX_LINHA: int = 65_536
+
+    # Exportação em fluxo: linhas buscadas por vez no cursor do servidor
+    EXPORTACAO_LOTE: int = 500
+
+    # Métricas por rota (latência, status, SQL por requisição) expostas em /metrics
+    METRICAS_ATIVAS: bool = True
+
+    # Log de consultas lentas (opt-in): comandos acima de N ms vão para o logger `consultas_lentas`
+    # e as CONSULTAS_LENTAS_TOP impressões digitais mais lentas ficam em /interno/consultas-lentas
+    CONSULTAS_LENTAS_MS: float | None = None
+    CONSULTAS_LENTAS_TOP: int = 50
+
+    # Logs em JSON no stdout, escritos por uma thread a partir de uma fila limitada: com a fila
+    # cheia os registros são descartados (e contados), nunca bloqueiam a requisição
+    LOG_NIVEL: str = 'INFO'
+    LOG_FILA_MAX: int = 10_000
+    # Uma linha por requisição (método, rota, status, duração) no logger `requisicoes`
+    LOG_REQUISICOES: bool = False
+
     model_config = SettingsConfigDict(
         env_file='.env',
         extra='ignore',   # ignora variáveis que não pertencem ao modelo
@@ -0,0 +1,103 @@
+import atexit
+import logging
+import queue
+import sys
+import traceback
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from threading import Lock
+
+import orjson
+
+from core.config import settings
+from helpers.contexto import contexto_requisicao
+
+# Atributos padrão do LogRecord: o resto veio de `extra=` e entra no JSON
+_ATRIBUTOS_PADRAO = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'taskName'}
+
+
+class FiltroContexto(logging.Filter):
+    '''Anexa ao registro o contexto da requisição corrente (roda na thread de quem loga)'''
+
+    def filter(self, registro: logging.LogRecord) -> bool:
+        ctx = contexto_requisicao.get()
+        if ctx is not None:
+            for campo, valor in (
+                ('request_id', ctx.request_id), ('rota', f'{ctx.metodo} {ctx.rota}'), ('sub', ctx.sub), ('jti', ctx.jti),
+            ):
+                if not hasattr(registro, campo):
+                    setattr(registro, campo, valor)
+        return True
+
+
+class FormatadorJson(logging.Formatter):
+    # uma linha JSON por registro
+    def format(self, registro: logging.LogRecord) -> str:
+        linha = {
+            'ts': datetime.fromtimestamp(registro.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'nivel': registro.levelname,
+            'logger': registro.name,
+            'msg': registro.getMessage(),
+        }
+        linha.update((k, v) for k, v in vars(registro).items() if k not in _ATRIBUTOS_PADRAO)
+        if registro.exc_info:
+            linha['exc'] = self.formatException(registro.exc_info)
+        elif registro.exc_text:
+            linha['exc'] = registro.exc_text
+        return orjson.dumps(linha, default=str).decode()
+
+
+class FilaDescartando(QueueHandler):
+    '''
+    Enfileira sem bloquear: com a fila cheia (coletor de logs atrasado) o registro é
+    descartado e contado em `descartados`, em vez de segurar a requisição.
+    '''
+
+    def __init__(self, fila: queue.Queue):
+        super().__init__(fila)
+        self._trava = Lock()
+        self.descartados = 0
+
+    def prepare(self, registro: logging.LogRecord) -> logging.LogRecord:
+        # resolve mensagem e traceback aqui (os args podem mudar depois); a formatação JSON
+        # e a escrita ficam para a thread do listener
+        registro = logging.makeLogRecord(vars(registro))
+        registro.msg = registro.getMessage()
+        registro.args = None
+        if registro.exc_info:
+            registro.exc_text = ''.join(traceback.format_exception(*registro.exc_info)).rstrip()
+            registro.exc_info = None
+        return registro
+
+    def enqueue(self, registro: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(registro)
+        except queue.Full:
+            with self._trava:
+                self.descartados += 1
+
+
+fila_logs: FilaDescartando | None = None
+_listener: QueueListener | None = None
+
+
+def logs_descartados() -> int:
+    return fila_logs.descartados if fila_logs is not None else 0
+
+
+def configurar_logs() -> None:
+    # Raiz -> fila limitada -> thread do listener -> stdout em JSON. Idempotente.
+    global fila_logs, _listener
+    if _listener is not None:
+        return
+    fila_logs = FilaDescartando(queue.Queue(maxsize=settings.LOG_FILA_MAX))
+    fila_logs.addFilter(FiltroContexto())
+    saida = logging.StreamHandler(sys.stdout)
+    saida.setFormatter(FormatadorJson())
+    _listener = QueueListener(fila_logs.queue, saida, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    raiz = logging.getLogger()
+    raiz.setLevel(settings.LOG_NIVEL.upper())
+    raiz.addHandler(fila_logs)
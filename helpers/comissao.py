@@ -1,5 +1,7 @@
 from decimal import Decimal, ROUND_HALF_UP
 
+from sqlalchemy import func
+
 def dinheiro(valor: Decimal) -> Decimal:
     # 2 casas, arredondamento de mercado
     return valor.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
@@ -7,3 +9,8 @@ def dinheiro(valor: Decimal) -> Decimal:
 def calcular_comissao(valor_venda: Decimal, percentual: Decimal) -> Decimal:
     # assume 0 < percentual <= 1 (validado no schema)
     return dinheiro(valor_venda * percentual)
+
+def calcular_comissao_sql(valor_venda, percentual: Decimal):
+    # mesma regra em SQL, para calcular no próprio INSERT: round() de numeric no Postgres
+    # arredonda metade para longe do zero, igual a ROUND_HALF_UP para valores positivos
+    return func.round(valor_venda * percentual, 2)
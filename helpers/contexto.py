@@ -0,0 +1,37 @@
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from starlette.types import Scope
+
+
+class ContextoRequisicao:
+    '''
+    Dados da requisição corrente para correlacionar logs e consultas: id (X-Request-ID),
+    método, rota e o `sub`/`jti` do token (preenchidos por `validar_jwt`). A rota é lida do
+    scope sob demanda: o roteador só a preenche ao casar, depois que o contexto foi criado.
+    '''
+
+    __slots__ = ('request_id', 'metodo', '_scope', 'sub', 'jti')
+
+    def __init__(self, request_id: str, scope: Scope):
+        self.request_id = request_id
+        self.metodo = scope['method']
+        self._scope = scope
+        self.sub: str | None = None
+        self.jti: str | None = None
+
+    @property
+    def rota(self) -> str:
+        rota = self._scope.get('route')
+        return getattr(rota, 'path', None) or self._scope['path']
+
+
+# None fora de uma requisição (comandos, testes de repositório)
+contexto_requisicao: ContextVar[Optional[ContextoRequisicao]] = ContextVar('contexto_requisicao', default=None)
+
+
+def campos_contexto() -> dict[str, Any]:
+    ctx = contexto_requisicao.get()
+    if ctx is None:
+        return {'request_id': None, 'rota': None}
+    return {'request_id': ctx.request_id, 'rota': f'{ctx.metodo} {ctx.rota}'}
@@ -1,9 +1,20 @@
-from fastapi import Depends
+from fastapi import Depends, Request
 from sqlalchemy.orm import Session
-from infra.database import gera_sessao
-from infra.repositories.transacao import TransacaoRepositorio
-from infra.repositories.parte import ParteRepositorio
-from infra.repositories.comissao import ComissaoRepositorio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from infra.database import (
+    gera_sessao,
+    gera_sessao_async,
+    SessionLocal,
+    SessionLocalAsync,
+    SessionLocalLeitura,
+    SessionLocalLeituraAsync,
+)
+from infra.repositories.transacao import TransacaoRepositorio, TransacaoRepositorioAsync
+from infra.repositories.parte import ParteRepositorio, ParteRepositorioAsync
+from infra.repositories.comissao import ComissaoRepositorio, ComissaoRepositorioAsync
+from infra.repositories.resumo_comissao import ResumoComissaoRepositorioAsync
+from infra.repositories.resumo_pipeline import ResumoPipelineRepositorioAsync
+from infra.repositories.token_revogado import TokenRevogadoRepositorioAsync
 
 def get_repo_trans(db: Session = Depends(gera_sessao)) -> TransacaoRepositorio:
     return TransacaoRepositorio(db)
@@ -13,3 +24,72 @@ def get_repo_parte(db: Session = Depends(gera_sessao)) -> ParteRepositorio:
 
 def get_repo_comissao(db: Session = Depends(gera_sessao)) -> ComissaoRepositorio:
     return ComissaoRepositorio(db)
+
+# Versões asyncio (rotas `async def`)
+async def get_repo_trans_async(db: AsyncSession = Depends(gera_sessao_async)) -> TransacaoRepositorioAsync:
+    return TransacaoRepositorioAsync(db)
+
+async def get_repo_parte_async(db: AsyncSession = Depends(gera_sessao_async)) -> ParteRepositorioAsync:
+    return ParteRepositorioAsync(db)
+
+async def get_repo_comissao_async(db: AsyncSession = Depends(gera_sessao_async)) -> ComissaoRepositorioAsync:
+    return ComissaoRepositorioAsync(db)
+
+# Sempre no primário: uma revogação recém-gravada precisa valer já na requisição seguinte
+async def get_repo_token_revogado_async(db: AsyncSession = Depends(gera_sessao_async)) -> TokenRevogadoRepositorioAsync:
+    return TokenRevogadoRepositorioAsync(db)
+
+# Respostas em fluxo geram o corpo depois que as dependências com yield já foram encerradas:
+# o gerador recebe a fábrica e abre (e fecha) a própria sessão
+async def get_fabrica_sessao_async() -> async_sessionmaker:
+    return SessionLocalAsync
+
+# ---------------------------------------------------------------------------
+# Leituras (GET/listagens): réplica, salvo quando o cliente pede o primário.
+# Cookie gravado pelo middleware FixarPrimarioAposEscrita após uma escrita (ler o que gravou)
+# ou cabeçalho explícito em qualquer requisição.
+COOKIE_PRIMARIO = 'ler_primario'
+CABECALHO_PRIMARIO = 'x-ler-primario'
+
+def primario_fixado(request: Request) -> bool:
+    return COOKIE_PRIMARIO in request.cookies or request.headers.get(CABECALHO_PRIMARIO, '') not in ('', '0')
+
+async def get_fabrica_leitura_async() -> async_sessionmaker:
+    return SessionLocalLeituraAsync
+
+async def get_fabrica_leitura_roteada(
+    request: Request,
+    primario: async_sessionmaker = Depends(get_fabrica_sessao_async),
+    replica: async_sessionmaker = Depends(get_fabrica_leitura_async),
+) -> async_sessionmaker:
+    return primario if primario_fixado(request) else replica
+
+async def gera_sessao_leitura_async(fabrica: async_sessionmaker = Depends(get_fabrica_leitura_roteada)):
+    async with fabrica() as db:
+        yield db
+
+async def get_repo_trans_leitura_async(db: AsyncSession = Depends(gera_sessao_leitura_async)) -> TransacaoRepositorioAsync:
+    return TransacaoRepositorioAsync(db)
+
+async def get_repo_parte_leitura_async(db: AsyncSession = Depends(gera_sessao_leitura_async)) -> ParteRepositorioAsync:
+    return ParteRepositorioAsync(db)
+
+def gera_sessao_leitura(request: Request):
+    db = (SessionLocal if primario_fixado(request) else SessionLocalLeitura)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def get_repo_trans_leitura(db: Session = Depends(gera_sessao_leitura)) -> TransacaoRepositorio:
+    return TransacaoRepositorio(db)
+
+async def get_repo_resumo_comissao_leitura_async(
+    db: AsyncSession = Depends(gera_sessao_leitura_async),
+) -> ResumoComissaoRepositorioAsync:
+    return ResumoComissaoRepositorioAsync(db)
+
+async def get_repo_resumo_pipeline_leitura_async(
+    db: AsyncSession = Depends(gera_sessao_leitura_async),
+) -> ResumoPipelineRepositorioAsync:
+    return ResumoPipelineRepositorioAsync(db)
@@ -29,3 +29,32 @@ class TipoParte(Enum):
 	COMPRADOR = 'COMPRADOR'
 	VENDEDOR = 'VENDEDOR'
 	CORRETOR = 'CORRETOR'
+
+# Tipos de parte exigidos para entrar em cada status (hoje só APROVADA tem requisito)
+PARTES_EXIGIDAS = {
+    StatusTransacao.APROVADA: {TipoParte.COMPRADOR, TipoParte.VENDEDOR, TipoParte.CORRETOR},
+}
+
+# Status de origem a partir dos quais `para` é alcançável
+def origens_permitidas(para: StatusTransacao) -> set[StatusTransacao]:
+    return {de for de, destinos in TRANSICOES_PERMITIDAS.items() if para in destinos}
+
+# ---------------------------------------------------------------------------
+# Enum de estratégia para o total das listagens (X-Total-Count)
+class EstrategiaContagem(str, Enum):
+    EXATA = 'exata'        # COUNT(*) sobre o filtro
+    CACHE = 'cache'        # COUNT(*) reaproveitado por filtro até o TTL ou até a próxima escrita
+    ESTIMADA = 'estimada'  # estimativa do planner do Postgres (pg_class.reltuples / EXPLAIN)
+
+# ---------------------------------------------------------------------------
+# Relações que podem ser embutidas na saída de uma transação (?incluir=partes,comissoes)
+class RelacaoTransacao(str, Enum):
+    PARTES = 'partes'
+    COMISSOES = 'comissoes'
+
+# ---------------------------------------------------------------------------
+# Quando o pool testa a conexão (SELECT 1) antes de entregá-la
+class EstrategiaPrePing(str, Enum):
+    SEMPRE = 'sempre'    # a cada checkout (uma ida a mais ao banco por requisição)
+    OCIOSA = 'ociosa'    # só se a conexão ficou parada além de POOL_PRE_PING_OCIOSA_SEGUNDOS
+    NUNCA = 'nunca'      # confia no pool_recycle e na reconexão após erro
@@ -18,3 +18,24 @@ class ErroNaoEncontrado(ErroBanco):
 class ErroOperacaoBD(ErroBanco):
     '''Erro inesperado em operação de banco (INSERT/UPDATE/DELETE).'''
     pass
+
+
+class ErroReferenciaBD(ErroConflitoBD):
+    '''Violação de FK: o registro referenciado (ex.: a transação) não existe.'''
+    pass
+
+
+# SQLSTATE de foreign_key_violation no Postgres
+_SQLSTATE_FK = '23503'
+
+def erro_integridade(e: Exception) -> ErroConflitoBD:
+    '''Converte um IntegrityError do driver na exceção de domínio (FK ou conflito genérico).'''
+    orig = getattr(e, 'orig', None)
+    codigos = {
+        getattr(orig, 'pgcode', None),
+        getattr(orig, 'sqlstate', None),
+        getattr(getattr(orig, '__cause__', None), 'sqlstate', None),
+    }
+    if _SQLSTATE_FK in codigos or 'FOREIGN KEY constraint failed' in str(orig):
+        return ErroReferenciaBD()
+    return ErroConflitoBD()
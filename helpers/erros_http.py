@@ -23,3 +23,9 @@ def conflito(msg: str = 'conflito') -> HTTPException:
 
 def nao_autorizado(msg: str = 'não autorizado') -> HTTPException:
 	return erro_http('nao_autorizado', status.HTTP_401_UNAUTHORIZED, msg)
+
+def tipo_nao_suportado(msg: str = 'tipo de conteúdo não suportado') -> HTTPException:
+    return erro_http('tipo_nao_suportado', status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, msg)
+
+def precondicao_falhou(msg: str = 'a versão informada em If-Match não é a atual') -> HTTPException:
+    return erro_http('precondicao_falhou', status.HTTP_412_PRECONDITION_FAILED, msg)
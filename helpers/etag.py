@@ -0,0 +1,48 @@
+import hashlib
+import json
+from typing import Iterable, Optional
+from uuid import UUID
+
+# ETag forte a partir da versão da linha: "3"
+def etag_versao(versao: int) -> str:
+    return f'"{versao}"'
+
+# Versões aceitas por um cabeçalho If-Match.
+# None = sem pré-condição (ausente ou '*'); conjunto vazio = nada casa (412).
+def versoes_if_match(cabecalho: Optional[str]) -> Optional[set[int]]:
+    if cabecalho is None or cabecalho.strip() == '*':
+        return None
+    versoes = set()
+    for item in cabecalho.split(','):
+        item = item.strip()
+        # If-Match usa comparação forte: ETags fracas (W/) nunca casam
+        if item.startswith('"') and item.endswith('"') and item[1:-1].isdigit():
+            versoes.add(int(item[1:-1]))
+    return versoes
+
+# ETag forte de uma página da listagem: parâmetros (filtro + paginação) + total + (id, versao)
+# de cada item. Qualquer escrita em um item da página, ou no conjunto filtrado, muda o valor.
+def etag_pagina(parametros: dict, total: int, itens: list[tuple[UUID, int]]) -> str:
+    resumo = hashlib.sha256(json.dumps(parametros, sort_keys=True, default=str).encode())
+    resumo.update(f'#{total}'.encode())
+    for item_id, versao in itens:
+        resumo.update(f'|{item_id}:{versao}'.encode())
+    return f'"{resumo.hexdigest()[:32]}"'
+
+# ETag de uma representação com relações embutidas (?incluir=): pagar uma comissão não muda a
+# versão da transação, então as linhas embutidas entram no hash junto com o ETag base
+def etag_com_relacoes(etag_base: str, relacionados: dict[str, Iterable[tuple]]) -> str:
+    resumo = hashlib.sha256(etag_base.encode())
+    for nome in sorted(relacionados):
+        resumo.update(f'#{nome}'.encode())
+        for linha in relacionados[nome]:
+            resumo.update(f'|{tuple(linha)!r}'.encode())
+    return f'"{resumo.hexdigest()[:32]}"'
+
+# If-None-Match usa comparação fraca (W/"x" casa com "x"); '*' casa com qualquer representação
+def casa_if_none_match(cabecalho: Optional[str], etag: str) -> bool:
+    if not cabecalho:
+        return False
+    if cabecalho.strip() == '*':
+        return True
+    return any(item.strip().removeprefix('W/') == etag for item in cabecalho.split(','))
@@ -0,0 +1,29 @@
+import csv
+import io
+import json
+from typing import Any
+
+# Formatos da exportação em fluxo: nome no parâmetro -> media type
+FORMATOS_EXPORTACAO = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+COLUNAS_CSV = ['id', 'imovel_codigo', 'valor_venda', 'status', 'data_criacao', 'data_atualizacao']
+
+
+def linha_csv(valores: list[Any]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='\n').writerow(valores)
+    return buffer.getvalue()
+
+
+def linha_ndjson(registro: dict) -> str:
+    return json.dumps(registro, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+
+def valor_csv(valor: Any) -> Any:
+    # listas embutidas (partes/comissoes) viram JSON dentro da célula
+    if isinstance(valor, list):
+        return json.dumps(valor, ensure_ascii=False, separators=(',', ':'))
+    return '' if valor is None else valor
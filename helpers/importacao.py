@@ -0,0 +1,170 @@
+import codecs
+import csv
+import json
+from collections import deque
+from decimal import Decimal
+from typing import AsyncIterator, NamedTuple
+
+from pydantic import ValidationError
+
+# Content-Types aceitos na importação em massa
+FORMATO_CSV = 'text/csv'
+FORMATOS_NDJSON = {'application/x-ndjson', 'application/ndjson', 'application/jsonl'}
+
+
+class LinhaGrande(NamedTuple):
+    # Linha acima do limite, descartada enquanto chegava. Guarda só quantas aspas tinha,
+    # para o CSV saber se um campo entre aspas continua na linha seguinte.
+    aspas: int
+
+
+class _CortadorLinhas:
+    # Corta o texto decodificado em linhas sem reconcatenar o buffer a cada pedaço
+    def __init__(self, max_linha: int):
+        self.max_linha = max_linha
+        self.trechos: list[str] = []
+        self.tamanho = 0
+        self.aspas = 0
+        self.grande = False
+
+    def cortar(self, texto: str) -> list:
+        linhas = []
+        ini = 0
+        while True:
+            fim = texto.find('\n', ini)
+            trecho = texto[ini:] if fim < 0 else texto[ini:fim]
+            self.tamanho += len(trecho)
+            self.aspas += trecho.count('"')
+            if not self.grande:
+                if self.tamanho > self.max_linha:
+                    self.grande, self.trechos = True, []
+                else:
+                    self.trechos.append(trecho)
+            if fim < 0:
+                return linhas
+            linhas.append(self.fechar())
+            ini = fim + 1
+
+    def fechar(self) -> str | LinhaGrande:
+        linha = LinhaGrande(self.aspas) if self.grande else ''.join(self.trechos).rstrip('\r')
+        self.trechos, self.tamanho, self.aspas, self.grande = [], 0, 0, False
+        return linha
+
+
+async def linhas_do_fluxo(fluxo: AsyncIterator[bytes], max_linha: int) -> AsyncIterator[str | LinhaGrande]:
+    # Quebra o corpo em linhas à medida que os bytes chegam: só a linha corrente (até
+    # `max_linha` caracteres) fica em memória; acima disso vem uma LinhaGrande
+    decodificador = codecs.getincrementaldecoder('utf-8-sig')()
+    cortador = _CortadorLinhas(max_linha)
+    async for pedaco in fluxo:
+        for linha in cortador.cortar(decodificador.decode(pedaco)):
+            yield linha
+    for linha in cortador.cortar(decodificador.decode(b'', final=True)):
+        yield linha
+    if cortador.tamanho or cortador.grande:
+        yield cortador.fechar()
+
+
+class _FilaRegistros:
+    # Iterador de onde o csv.reader puxa os registros completos, um por vez
+    def __init__(self):
+        self.fila: deque[str] = deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self.fila:
+            raise StopIteration
+        return self.fila.popleft()
+
+
+async def registros(
+    linhas: AsyncIterator[str | LinhaGrande], formato: str, max_linha: int,
+) -> AsyncIterator[tuple[int, dict | None, str | None]]:
+    # Produz (número da linha, dados, erro de leitura); linhas em branco são ignoradas.
+    # No CSV um campo entre aspas pode conter quebras de linha: as linhas físicas são
+    # juntadas até as aspas fecharem e o registro inteiro vai para um único csv.reader.
+    erro_grande = f'linha maior que {max_linha} caracteres'
+    if formato == FORMATO_CSV:
+        async for item in _registros_csv(linhas, max_linha, erro_grande):
+            yield item
+        return
+
+    numero = 0
+    async for linha in linhas:
+        numero += 1
+        if isinstance(linha, LinhaGrande):
+            yield numero, None, erro_grande
+            continue
+        if not linha.strip():
+            continue
+        try:
+            dados = json.loads(linha, parse_float=Decimal)
+        except ValueError:
+            yield numero, None, 'JSON inválido'
+            continue
+        if not isinstance(dados, dict):
+            yield numero, None, 'cada linha deve ser um objeto JSON'
+            continue
+        yield numero, dados, None
+
+
+async def _registros_csv(linhas: AsyncIterator[str | LinhaGrande], max_linha: int, erro_grande: str):
+    fonte = _FilaRegistros()
+    leitor = csv.reader(fonte)
+    cabecalho = None
+    # registro corrente: linhas físicas até as aspas fecharem; `grande` = estourou o limite e
+    # só as aspas continuam sendo contadas, até o fim do registro
+    pendentes: list[str] = []
+    aspas = tamanho = inicio = numero = 0
+    grande = aberto = False
+
+    async for linha in linhas:
+        numero += 1
+        if not aberto:
+            if isinstance(linha, str) and not linha.strip():
+                continue
+            inicio, aberto = numero, True
+        if isinstance(linha, LinhaGrande):
+            aspas += linha.aspas
+            grande, pendentes = True, []
+        else:
+            aspas += linha.count('"')
+            tamanho += len(linha) + 1
+            if tamanho > max_linha:
+                grande, pendentes = True, []
+            elif not grande:
+                pendentes.append(linha)
+        if aspas % 2:
+            continue
+
+        registro = '\n'.join(pendentes)
+        descartar = grande
+        pendentes, aspas, tamanho, grande, aberto = [], 0, 0, False, False
+        if descartar:
+            yield inicio, None, erro_grande
+            continue
+        fonte.fila.append(registro)
+        try:
+            valores = next(leitor)
+        except csv.Error as e:
+            yield inicio, None, f'CSV inválido: {e}'
+            continue
+        if cabecalho is None:
+            cabecalho = [v.strip() for v in valores]
+            continue
+        if len(valores) != len(cabecalho):
+            yield inicio, None, f'esperadas {len(cabecalho)} colunas, recebidas {len(valores)}'
+            continue
+        yield inicio, dict(zip(cabecalho, valores)), None
+
+    if aberto:
+        yield inicio, None, erro_grande if grande else 'aspas não fechadas até o fim do arquivo'
+
+
+def mensagens_validacao(erro: ValidationError) -> list[str]:
+    return [
+        f"{'.'.join(str(p) for p in detalhe['loc']) or 'linha'}: {detalhe['msg']}"
+        for detalhe in erro.errors()
+    ]
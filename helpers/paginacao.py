@@ -0,0 +1,29 @@
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+
+# Cursor opaco da paginação keyset: codifica a chave (data_criacao, id) do último item da página
+def codificar_cursor(data_criacao: datetime, item_id: UUID) -> str:
+    bruto = json.dumps([data_criacao.isoformat(), str(item_id)], separators=(',', ':'))
+    return base64.urlsafe_b64encode(bruto.encode()).decode().rstrip('=')
+
+def decodificar_cursor(cursor: str) -> tuple[datetime, UUID]:
+    # levanta ValueError para qualquer cursor malformado
+    try:
+        preenchido = cursor + '=' * (-len(cursor) % 4)
+        data_txt, id_txt = json.loads(base64.urlsafe_b64decode(preenchido.encode()))
+        return datetime.fromisoformat(data_txt), UUID(id_txt)
+    except (TypeError, ValueError) as e:
+        raise ValueError('cursor inválido') from e
+
+# Cursor de listagens ordenadas só por id (ex.: busca de partes)
+def codificar_cursor_id(item_id: UUID) -> str:
+    return base64.urlsafe_b64encode(item_id.bytes).decode().rstrip('=')
+
+def decodificar_cursor_id(cursor: str) -> UUID:
+    try:
+        return UUID(bytes=base64.urlsafe_b64decode((cursor + '=' * (-len(cursor) % 4)).encode()))
+    except (TypeError, ValueError) as e:
+        raise ValueError('cursor inválido') from e
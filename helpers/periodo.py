@@ -0,0 +1,40 @@
+from datetime import date
+
+from sqlalchemy import Date
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class dia_utc(FunctionElement):
+    '''Dia (date, em UTC) de uma coluna datetime, em SQL de cada banco'''
+
+    type = Date()
+    inherit_cache = True
+    name = 'dia_utc'
+
+
+@compiles(dia_utc)
+def _dia_utc_padrao(elemento, compilador, **kw):
+    return f'CAST({compilador.process(elemento.clauses, **kw)} AS DATE)'
+
+
+@compiles(dia_utc, 'postgresql')
+def _dia_utc_postgres(elemento, compilador, **kw):
+    # timestamptz -> date usaria o fuso da sessão
+    return f"CAST(({compilador.process(elemento.clauses, **kw)}) AT TIME ZONE 'UTC' AS DATE)"
+
+
+@compiles(dia_utc, 'sqlite')
+def _dia_utc_sqlite(elemento, compilador, **kw):
+    # CAST(... AS DATE) no SQLite vira número; date() devolve 'AAAA-MM-DD'
+    return f'date({compilador.process(elemento.clauses, **kw)})'
+
+
+def periodo_de(dia: date, agrupamento: str) -> str:
+    # rótulo do período: 'AAAA-MM-DD' (dia), 'AAAA-Wss' (semana ISO) ou 'AAAA-MM' (mes)
+    if agrupamento == 'dia':
+        return dia.isoformat()
+    if agrupamento == 'semana':
+        ano, semana, _ = dia.isocalendar()
+        return f'{ano}-W{semana:02d}'
+    return dia.strftime('%Y-%m')
@@ -0,0 +1,38 @@
+from decimal import Decimal
+from typing import Any, Iterable
+
+import orjson
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+
+# Decimal sai como string ("1000.00"), igual à serialização do Pydantic; UUID, datetime e Enum o orjson já trata
+def _padrao(valor: Any) -> Any:
+    if isinstance(valor, Decimal):
+        return str(valor)
+    raise TypeError(f'tipo não serializável: {type(valor).__name__}')
+
+
+def json_rapido(conteudo: Any) -> bytes:
+    # OPT_UTC_Z: datetime em UTC sai com 'Z', como no Pydantic
+    return orjson.dumps(conteudo, default=_padrao, option=orjson.OPT_UTC_Z)
+
+
+class RespostaJSONRapida(Response):
+    '''
+    Resposta JSON codificada com orjson, sem passar pelo response_model.
+    Só para dados vindos do banco já no formato do esquema de saída (ver `campos_saida`);
+    o response_model da rota continua documentando o contrato no OpenAPI.
+    '''
+
+    media_type = 'application/json'
+
+    def render(self, content: Any) -> bytes:
+        return json_rapido(content)
+
+
+def campos_saida(objs: Iterable[Any], esquema: type[BaseModel]) -> list[dict]:
+    # Copia só os campos do esquema de saída, por atributo: serve para objetos ORM e para
+    # linhas de um select de colunas (Row). Sem revalidar: os dados já são do banco.
+    campos = tuple(esquema.model_fields)
+    return [{campo: getattr(obj, campo) for campo in campos} for obj in objs]
@@ -0,0 +1,44 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Hashable, Optional
+
+from core.config import settings
+
+
+class CacheContagem:
+    '''
+    Cache em memória (por processo) dos totais de listagem, chaveado pela tupla normalizada do filtro.
+    Qualquer escrita em transação invalida tudo: uma única inserção pode mudar o total de vários filtros.
+    '''
+
+    def __init__(self, ttl: float, max_itens: int = 1024):
+        self.ttl = ttl
+        self.max_itens = max_itens
+        self._itens: OrderedDict[Hashable, tuple[float, int]] = OrderedDict()
+        self._trava = Lock()
+
+    def obter(self, chave: Hashable) -> Optional[int]:
+        with self._trava:
+            item = self._itens.get(chave)
+            if item is None:
+                return None
+            expira_em, total = item
+            if expira_em <= time.monotonic():
+                del self._itens[chave]
+                return None
+            return total
+
+    def guardar(self, chave: Hashable, total: int) -> None:
+        with self._trava:
+            self._itens[chave] = (time.monotonic() + self.ttl, total)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+
+    def invalidar(self) -> None:
+        with self._trava:
+            self._itens.clear()
+
+
+cache_contagem = CacheContagem(ttl=settings.CONTAGEM_CACHE_TTL)
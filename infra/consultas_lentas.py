@@ -0,0 +1,130 @@
+import hashlib
+import logging
+import re
+import time
+from threading import Lock
+from typing import Any
+
+import sqlalchemy as sa
+
+from core.config import settings
+from helpers.contexto import campos_contexto
+
+logger = logging.getLogger('consultas_lentas')
+
+# Normalização: literais e placeholders de qualquer driver viram `?`, listas de `?` (IN,
+# VALUES em lote) viram uma só, e o espaço em branco é compactado. Consultas que só diferem
+# nos valores ou no tamanho do lote ficam com a mesma impressão digital.
+_LITERAIS = (
+    (re.compile(r"'(?:[^']|'')*'"), '?'),
+    (re.compile(r'%\(\w+\)s|%s|\$\d+|(?<![:\w]):\w+|\?'), '?'),
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),
+    (re.compile(r'\s+'), ' '),
+    (re.compile(r'\?(?: ?, ?\?)+'), '?, ...'),
+    (re.compile(r'\(\?(?:, \.\.\.)?\)(?: ?, ?\(\?(?:, \.\.\.)?\))+'), '(?, ...), ...'),
+)
+
+
+def normalizar_sql(sql: str) -> str:
+    for padrao, troca in _LITERAIS:
+        sql = padrao.sub(troca, sql)
+    return sql.strip()
+
+
+def _tipo(valor: Any) -> str:
+    if isinstance(valor, (list, tuple)):
+        return f'{type(valor).__name__}[{len(valor)}]'
+    return type(valor).__name__
+
+
+def forma_parametros(parametros: Any, executemany: bool) -> Any:
+    # só nomes e tipos: os valores podem ter CPF/CNPJ e não vão para o log. O
+    # "insertmanyvalues" (INSERT em lote com RETURNING) chega com executemany e um dict só
+    if executemany and isinstance(parametros, (list, tuple)):
+        return {'linhas': len(parametros), 'forma': forma_parametros(parametros[0], False) if parametros else None}
+    if isinstance(parametros, dict):
+        return {nome: _tipo(valor) for nome, valor in parametros.items()}
+    if isinstance(parametros, (list, tuple)):
+        return [_tipo(valor) for valor in parametros]
+    return _tipo(parametros)
+
+
+class RegistroConsultasLentas:
+    '''
+    Loga cada comando acima de `limiar_ms` (SQL normalizado, forma dos parâmetros, duração,
+    rota e request id) e guarda, por impressão digital, as `max_itens` mais lentas.
+    '''
+
+    def __init__(self, limiar_ms: float, max_itens: int):
+        self.limiar_ms = limiar_ms
+        self.max_itens = max_itens
+        self._trava = Lock()
+        self._consultas: dict[str, dict[str, Any]] = {}
+
+    def registrar(self, sql: str, parametros: Any, executemany: bool, duracao_ms: float) -> None:
+        normalizado = normalizar_sql(sql)
+        impressao = hashlib.sha1(normalizado.encode()).hexdigest()[:16]
+        contexto = campos_contexto()
+        logger.warning('consulta lenta', extra={
+            'impressao': impressao,
+            'sql': normalizado,
+            'parametros': forma_parametros(parametros, executemany),
+            'duracao_ms': round(duracao_ms, 3),
+            **contexto,
+        })
+
+        with self._trava:
+            item = self._consultas.get(impressao)
+            if item is None:
+                if len(self._consultas) >= self.max_itens:
+                    # cheio: só entra se for mais lenta que a mais rápida guardada
+                    menor = min(self._consultas, key=lambda k: self._consultas[k]['max_ms'])
+                    if self._consultas[menor]['max_ms'] >= duracao_ms:
+                        return
+                    del self._consultas[menor]
+                item = self._consultas[impressao] = {
+                    'impressao': impressao, 'sql': normalizado, 'qtd': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                }
+            item['qtd'] += 1
+            item['total_ms'] += duracao_ms
+            if duracao_ms >= item['max_ms']:
+                item['max_ms'] = duracao_ms
+                item['rota'] = contexto['rota']
+                item['request_id'] = contexto['request_id']
+
+    def retrato(self) -> list[dict[str, Any]]:
+        with self._trava:
+            itens = [dict(item) for item in self._consultas.values()]
+        for item in itens:
+            item['media_ms'] = round(item['total_ms'] / item['qtd'], 3)
+            item['total_ms'] = round(item['total_ms'], 3)
+            item['max_ms'] = round(item['max_ms'], 3)
+        return sorted(itens, key=lambda item: item['max_ms'], reverse=True)
+
+    def limpar(self) -> None:
+        with self._trava:
+            self._consultas.clear()
+
+
+# Opt-in: sem CONSULTAS_LENTAS_MS os engines não recebem os eventos
+registro_consultas_lentas = (
+    RegistroConsultasLentas(settings.CONSULTAS_LENTAS_MS, settings.CONSULTAS_LENTAS_TOP)
+    if settings.CONSULTAS_LENTAS_MS is not None else None
+)
+
+
+def monitorar_consultas_lentas(engine: sa.Engine, registro: RegistroConsultasLentas) -> None:
+    # `engine` é o Engine síncrono (para AsyncEngine, passe engine.sync_engine)
+    @sa.event.listens_for(engine, 'before_cursor_execute')
+    def _antes(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._inicio_lenta = time.perf_counter()
+
+    @sa.event.listens_for(engine, 'after_cursor_execute')
+    def _depois(conn, cursor, statement, parameters, context, executemany):
+        inicio = getattr(context, '_inicio_lenta', None)
+        if inicio is None:
+            return
+        duracao_ms = (time.perf_counter() - inicio) * 1000
+        if duracao_ms >= registro.limiar_ms:
+            registro.registrar(statement, parameters, executemany, duracao_ms)
@@ -1,18 +1,44 @@
 import sqlalchemy as sa
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 
 from core.config import settings
+from helpers.enums import EstrategiaPrePing
+from infra.pool import opcoes_pool, instrumentar_pool
+from infra.consultas_lentas import registro_consultas_lentas, monitorar_consultas_lentas
 
 
 # Base única do projeto: todos os models devem herdar desta classe
 class Base(DeclarativeBase):
     pass
 
-# Criando uma conexão com o banco
-engine = sa.create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True   # evita conexões “mortas” no pool
-)
+# SQLite (testes/benchmarks) só aplica FOREIGN KEY e ON DELETE CASCADE com o pragma ligado
+@sa.event.listens_for(sa.Engine, 'connect')
+def _ativar_fk_sqlite(conexao_dbapi, _registro):
+    if 'sqlite' in type(conexao_dbapi).__module__:
+        cursor = conexao_dbapi.cursor()
+        cursor.execute('PRAGMA foreign_keys=ON')
+        cursor.close()
+
+# pre-ping "ociosa" é feito nos eventos do pool; "sempre" usa o pool_pre_ping do SQLAlchemy
+_PING_OCIOSA = settings.POOL_PRE_PING_OCIOSA_SEGUNDOS if settings.POOL_PRE_PING == EstrategiaPrePing.OCIOSA else None
+
+def criar_engine(nome: str, url: str) -> sa.Engine:
+    engine = sa.create_engine(url, **opcoes_pool(url))
+    instrumentar_pool(nome, engine, _PING_OCIOSA)
+    if registro_consultas_lentas:
+        monitorar_consultas_lentas(engine, registro_consultas_lentas)
+    return engine
+
+def criar_engine_async(nome: str, url: str):
+    engine = create_async_engine(url, **opcoes_pool(url, assincrono=True))
+    instrumentar_pool(nome, engine.sync_engine, _PING_OCIOSA)
+    if registro_consultas_lentas:
+        monitorar_consultas_lentas(engine.sync_engine, registro_consultas_lentas)
+    return engine
+
+# Criando uma conexão com o banco (tamanho do pool e pre-ping vêm da configuração)
+engine = criar_engine('primario', settings.DATABASE_URL)
 
 # Session factory (cada request/uso abre a sua)
 SessionLocal = sessionmaker(
@@ -29,3 +55,51 @@ def gera_sessao():
         yield db
     finally:
         db.close()
+
+# ---------------------------------------------------------------------------
+# Pilha asyncio: mesmo banco, driver asyncio (as rotas não ocupam thread esperando o banco)
+
+# Driver asyncio equivalente para cada banco suportado
+DRIVERS_ASYNC = {
+    'postgresql': 'postgresql+asyncpg',
+    'sqlite': 'sqlite+aiosqlite',
+}
+
+def url_async(url: str) -> str:
+    url_obj = sa.engine.make_url(url)
+    driver = DRIVERS_ASYNC.get(url_obj.get_backend_name(), url_obj.drivername)
+    return url_obj.set(drivername=driver).render_as_string(hide_password=False)
+
+engine_async = criar_engine_async('primario_async', settings.DATABASE_URL_ASYNC or url_async(settings.DATABASE_URL))
+
+SessionLocalAsync = async_sessionmaker(
+    bind=engine_async,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+async def gera_sessao_async():
+    async with SessionLocalAsync() as db:
+        yield db
+
+# ---------------------------------------------------------------------------
+# Réplica de leitura (opcional): GETs e listagens podem sair do primário.
+# Sem DATABASE_URL_LEITURA, as fábricas de leitura são as mesmas do primário.
+
+if settings.DATABASE_URL_LEITURA:
+    engine_leitura = criar_engine('leitura', settings.DATABASE_URL_LEITURA)
+    SessionLocalLeitura = sessionmaker(
+        bind=engine_leitura,
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False
+    )
+    engine_leitura_async = criar_engine_async('leitura_async', url_async(settings.DATABASE_URL_LEITURA))
+    SessionLocalLeituraAsync = async_sessionmaker(
+        bind=engine_leitura_async,
+        autoflush=False,
+        expire_on_commit=False
+    )
+else:
+    engine_leitura, SessionLocalLeitura = engine, SessionLocal
+    engine_leitura_async, SessionLocalLeituraAsync = engine_async, SessionLocalAsync
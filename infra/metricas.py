@@ -0,0 +1,172 @@
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from threading import Lock
+from typing import Any, Iterable, Optional
+
+import sqlalchemy as sa
+
+from core.logs import logs_descartados
+from infra.pool import LIMITES_ESPERA_MS, metricas_pools
+
+# Limites (s) do histograma de latência por rota (os padrões dos clientes Prometheus)
+LIMITES_DURACAO_S = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Limites do histograma de comandos SQL por requisição (N+1 aparece nos baldes altos)
+LIMITES_COMANDOS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class ConsultasRequisicao:
+    '''SQL executado durante uma requisição: acumulado pelos eventos do engine'''
+
+    __slots__ = ('comandos', 'segundos')
+
+    def __init__(self):
+        self.comandos = 0
+        self.segundos = 0.0
+
+
+# Acumulador da requisição corrente (None fora de uma requisição). Um objeto mutável, e não
+# set() a cada comando: rotas/dependências síncronas rodam no threadpool com uma cópia do
+# contexto, que aponta para o mesmo objeto.
+consultas_da_requisicao: ContextVar[Optional[ConsultasRequisicao]] = ContextVar('consultas_da_requisicao', default=None)
+
+
+# Global (todos os engines, inclusive os de teste): duas leituras de relógio por comando
+@sa.event.listens_for(sa.Engine, 'before_cursor_execute')
+def _antes_do_comando(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._inicio_metricas = time.perf_counter()
+
+
+@sa.event.listens_for(sa.Engine, 'after_cursor_execute')
+def _depois_do_comando(conn, cursor, statement, parameters, context, executemany):
+    acumulador = consultas_da_requisicao.get()
+    if acumulador is None or context is None:
+        return
+    acumulador.comandos += 1
+    acumulador.segundos += time.perf_counter() - getattr(context, '_inicio_metricas', time.perf_counter())
+
+
+class _Histograma:
+    __slots__ = ('baldes', 'soma')
+
+    def __init__(self, limites: tuple):
+        self.baldes = [0] * (len(limites) + 1)
+        self.soma = 0.0
+
+
+class MetricasHttp:
+    '''
+    Contadores por (método, rota): requisições por status, histograma de latência e SQL
+    (comandos e tempo de banco). A rota é o template (/transacoes/{transacao_id}), não o
+    caminho, para a cardinalidade não crescer com os ids.
+    '''
+
+    def __init__(self):
+        self._trava = Lock()
+        self.requisicoes: dict[tuple[str, str, int], int] = {}
+        self.duracao: dict[tuple[str, str], _Histograma] = {}
+        self.comandos: dict[tuple[str, str], _Histograma] = {}
+        self.sql_segundos: dict[tuple[str, str], float] = {}
+
+    def registrar(self, metodo: str, rota: str, status: int, segundos: float, consultas: ConsultasRequisicao) -> None:
+        chave = (metodo, rota)
+        with self._trava:
+            self.requisicoes[(metodo, rota, status)] = self.requisicoes.get((metodo, rota, status), 0) + 1
+            duracao = self.duracao.get(chave) or self.duracao.setdefault(chave, _Histograma(LIMITES_DURACAO_S))
+            duracao.baldes[bisect_left(LIMITES_DURACAO_S, segundos)] += 1
+            duracao.soma += segundos
+            comandos = self.comandos.get(chave) or self.comandos.setdefault(chave, _Histograma(LIMITES_COMANDOS))
+            comandos.baldes[bisect_left(LIMITES_COMANDOS, consultas.comandos)] += 1
+            comandos.soma += consultas.comandos
+            self.sql_segundos[chave] = self.sql_segundos.get(chave, 0.0) + consultas.segundos
+
+    def limpar(self) -> None:
+        with self._trava:
+            self.requisicoes.clear()
+            self.duracao.clear()
+            self.comandos.clear()
+            self.sql_segundos.clear()
+
+    def linhas(self) -> list[str]:
+        with self._trava:
+            requisicoes = dict(self.requisicoes)
+            duracao = {k: (list(h.baldes), h.soma) for k, h in self.duracao.items()}
+            comandos = {k: (list(h.baldes), h.soma) for k, h in self.comandos.items()}
+            sql_segundos = dict(self.sql_segundos)
+
+        saida = _cabecalho('http_requisicoes_total', 'counter', 'Requisições por método, rota e status')
+        for (metodo, rota, status), qtd in sorted(requisicoes.items()):
+            saida.append(f'http_requisicoes_total{_rotulos(metodo=metodo, rota=rota, status=status)} {qtd}')
+
+        saida += _cabecalho('http_requisicao_duracao_segundos', 'histogram', 'Latência por método e rota')
+        for (metodo, rota), (baldes, soma) in sorted(duracao.items()):
+            saida += _histograma('http_requisicao_duracao_segundos', LIMITES_DURACAO_S, baldes, soma, metodo=metodo, rota=rota)
+
+        saida += _cabecalho('http_sql_comandos_por_requisicao', 'histogram', 'Comandos SQL executados por requisição')
+        for (metodo, rota), (baldes, soma) in sorted(comandos.items()):
+            saida += _histograma('http_sql_comandos_por_requisicao', LIMITES_COMANDOS, baldes, soma, metodo=metodo, rota=rota)
+
+        saida += _cabecalho('http_sql_segundos_total', 'counter', 'Tempo total no banco (cursor.execute) por rota')
+        for (metodo, rota), segundos in sorted(sql_segundos.items()):
+            saida.append(f'http_sql_segundos_total{_rotulos(metodo=metodo, rota=rota)} {segundos:.6f}')
+        return saida
+
+
+metricas_http = MetricasHttp()
+
+
+def _escapar(valor: Any) -> str:
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _rotulos(**rotulos) -> str:
+    return '{' + ','.join(f'{nome}="{_escapar(valor)}"' for nome, valor in rotulos.items()) + '}'
+
+
+def _cabecalho(nome: str, tipo: str, ajuda: str) -> list[str]:
+    return [f'# HELP {nome} {ajuda}', f'# TYPE {nome} {tipo}']
+
+
+def _histograma(nome: str, limites: Iterable, baldes: list[int], soma: float, **rotulos) -> list[str]:
+    saida, acumulado = [], 0
+    for limite, qtd in zip((*map(str, limites), '+Inf'), baldes):
+        acumulado += qtd
+        saida.append(f'{nome}_bucket{_rotulos(**rotulos, le=limite)} {acumulado}')
+    saida.append(f'{nome}_sum{_rotulos(**rotulos)} {soma:.6f}')
+    saida.append(f'{nome}_count{_rotulos(**rotulos)} {acumulado}')
+    return saida
+
+
+def _linhas_pools() -> list[str]:
+    # o mesmo retrato de /interno/pool, no formato Prometheus
+    pools = metricas_pools()
+    saida = []
+    for campo, tipo in (
+        ('tamanho', 'gauge'), ('em_uso', 'gauge'), ('ociosas', 'gauge'), ('overflow_em_uso', 'gauge'),
+        ('max_em_uso', 'gauge'), ('conexoes_abertas', 'counter'), ('checkouts', 'counter'),
+        ('invalidadas', 'counter'), ('pings', 'counter'), ('timeouts', 'counter'),
+    ):
+        nome = f'db_pool_{campo}' + ('_total' if tipo == 'counter' else '')
+        valores = [(pool, r[campo]) for pool, r in sorted(pools.items()) if r[campo] is not None]
+        if valores:
+            saida += _cabecalho(nome, tipo, f'Pool de conexões: {campo}')
+            saida += [f'{nome}{_rotulos(pool=pool)} {valor}' for pool, valor in valores]
+
+    saida += _cabecalho('db_pool_espera_ms', 'histogram', 'Espera por uma conexão no checkout (ms)')
+    for pool, r in sorted(pools.items()):
+        cumulativos = list(r['espera_ms']['baldes'].values())
+        baldes = [b - a for a, b in zip([0, *cumulativos], cumulativos)]
+        saida += _histograma('db_pool_espera_ms', LIMITES_ESPERA_MS, baldes, r['espera_ms']['soma'], pool=pool)
+    return saida
+
+
+def _linhas_logs() -> list[str]:
+    return _cabecalho('logs_descartados_total', 'counter', 'Registros de log descartados com a fila cheia') + [
+        f'logs_descartados_total {logs_descartados()}'
+    ]
+
+
+def exposicao_prometheus() -> str:
+    # formato texto 0.0.4 do Prometheus
+    return '\n'.join(metricas_http.linhas() + _linhas_pools() + _linhas_logs()) + '\n'
@@ -1,7 +1,7 @@
 from uuid import UUID as PyUUID, uuid4
 from decimal import Decimal
 
-from sqlalchemy import Boolean, Numeric, ForeignKey, text
+from sqlalchemy import Boolean, Numeric, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -42,3 +42,8 @@ class Comissao(Base):
     )
 
     transacao = relationship('Transacao', backref='comissoes', passive_deletes=True)
+
+    # FK: pagamento em lote por transação, resumo de comissões e o ON DELETE CASCADE de transacao
+    __table_args__ = (
+        Index('ix_comissao_transacao_id', 'transacao_id'),
+    )
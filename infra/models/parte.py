@@ -1,6 +1,6 @@
 from uuid import UUID as PyUUID, uuid4
 
-from sqlalchemy import String, Enum, ForeignKey
+from sqlalchemy import String, Enum, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -45,3 +45,16 @@ class Parte(Base):
 	)
 
 	transacao = relationship('Transacao', backref='partes', passive_deletes=True)
+
+	# Índices da busca de partes: igualdade em cpf_cnpj já na ordem da paginação (id) e
+	# trigramas em nome para trechos do nome (ILIKE '%...%'); fora do Postgres, índice comum
+	__table_args__ = (
+		# FK: listar_partes e o ON DELETE CASCADE de transacao
+		Index('ix_parte_transacao_id', 'transacao_id'),
+		Index('ix_parte_cpf_cnpj_id', 'cpf_cnpj', 'id'),
+		Index(
+			'ix_parte_nome_trgm', 'nome',
+			postgresql_using='gin',
+			postgresql_ops={'nome': 'gin_trgm_ops'},
+		),
+	)
@@ -0,0 +1,41 @@
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import Boolean, Date, Enum, Integer, Numeric
+from sqlalchemy.orm import Mapped, mapped_column
+
+from infra.database import Base
+from helpers.enums import StatusTransacao
+
+
+# Resumo das comissões por dia de criação da transação, status da transação e paga/pendente.
+# Mantido a cada escrita (ResumoComissaoRepositorio.acumular); o relatório só lê daqui.
+class ResumoComissao(Base):
+    __tablename__ = 'resumo_comissao'
+
+    dia: Mapped[date] = mapped_column(
+        Date,
+        primary_key=True
+    )
+
+    status_transacao: Mapped[StatusTransacao] = mapped_column(
+        Enum(StatusTransacao, name='status_transacao'),
+        primary_key=True
+    )
+
+    paga: Mapped[bool] = mapped_column(
+        Boolean,
+        primary_key=True
+    )
+
+    quantidade: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0
+    )
+
+    valor_total: Mapped[Decimal] = mapped_column(
+        Numeric(16, 2),
+        nullable=False,
+        default=0
+    )
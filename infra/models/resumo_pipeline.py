@@ -0,0 +1,36 @@
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import Date, Enum, Integer, Numeric
+from sqlalchemy.orm import Mapped, mapped_column
+
+from infra.database import Base
+from helpers.enums import StatusTransacao
+
+
+# Transações por dia de criação e status atual (quantidade e soma de valor_venda).
+# Mantido a cada escrita (ResumoPipelineRepositorio.acumular); o painel só lê daqui.
+class ResumoPipeline(Base):
+    __tablename__ = 'resumo_pipeline'
+
+    dia: Mapped[date] = mapped_column(
+        Date,
+        primary_key=True
+    )
+
+    status: Mapped[StatusTransacao] = mapped_column(
+        Enum(StatusTransacao, name='status_transacao'),
+        primary_key=True
+    )
+
+    quantidade: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0
+    )
+
+    valor_total: Mapped[Decimal] = mapped_column(
+        Numeric(18, 2),
+        nullable=False,
+        default=0
+    )
@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from infra.database import Base
+
+
+# Tokens revogados (por jti), compartilhados entre os workers. A linha só precisa existir
+# até o `exp` do token: depois disso o próprio JWT é recusado e ela é podada.
+class TokenRevogado(Base):
+    __tablename__ = 'token_revogado'
+
+    jti: Mapped[str] = mapped_column(
+        String(255),
+        primary_key=True
+    )
+
+    exp: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        index=True
+    )
@@ -2,12 +2,12 @@ from uuid import UUID as PyUUID, uuid4
 from decimal import Decimal
 from datetime import datetime
 
-from sqlalchemy import String, Numeric, DateTime, Enum, func, Index
+from sqlalchemy import String, Numeric, DateTime, Enum, Integer, func, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from infra.database import Base
-from helpers.enums import StatusTransacao
+from helpers.enums import StatusTransacao, TipoParte
 
 # Modelo da Transação
 class Transacao(Base):
@@ -29,12 +29,24 @@ class Transacao(Base):
 		nullable=False
     )
 
+    # valor antes da última alteração (mesmo motivo de status_anterior, abaixo)
+    valor_venda_anterior: Mapped[Decimal | None] = mapped_column(
+		Numeric(12, 2),
+		nullable=True
+    )
+
     status: Mapped[StatusTransacao] = mapped_column(
 		Enum(StatusTransacao, name='status_transacao'),
 		nullable=False,
 		default=StatusTransacao.CRIADA,
     )
 
+    # status antes da última transição (gravado no mesmo UPDATE; o RETURNING não enxerga o valor antigo)
+    status_anterior: Mapped[StatusTransacao | None] = mapped_column(
+		Enum(StatusTransacao, name='status_transacao'),
+		nullable=True,
+    )
+
     data_criacao: Mapped[datetime] = mapped_column(
 		DateTime(timezone=True),
 		server_default=func.now(), 
@@ -48,9 +60,36 @@ class Transacao(Base):
         nullable=False
     )
 
+    # incrementada a cada escrita; é o ETag da transação (controle otimista via If-Match)
+    versao: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=1,
+        server_default='1'
+    )
+
+    # contadores de partes por tipo, mantidos pelo ParteRepositorio a cada inclusão/remoção;
+    # o requisito de aprovação lê estes campos em vez de agregar a tabela parte
+    qtd_compradores: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default='0')
+    qtd_vendedores: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default='0')
+    qtd_corretores: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default='0')
+
 	# Índices
     __table_args__ = (
-        Index('ix_imovel_codigo', 'imovel_codigo'),
-        Index('ix_transacao_status', 'status'),
-        Index('ix_transacao_data_criacao', 'data_criacao')
+        # (data_criacao, id) atende a ordenação e a paginação keyset da listagem;
+        # com filtro de status ou de imóvel, a igualdade vem antes da mesma ordenação
+        Index('ix_transacao_data_criacao_id', 'data_criacao', 'id'),
+        Index('ix_transacao_status_data_criacao_id', 'status', 'data_criacao', 'id'),
+        Index('ix_transacao_imovel_data_criacao_id', 'imovel_codigo', 'data_criacao', 'id'),
     )
+
+    # datas geradas pelo banco voltam no próprio INSERT/UPDATE (RETURNING), sem refresh
+    __mapper_args__ = {'eager_defaults': True}
+
+
+# Contador de `Transacao` correspondente a cada tipo de parte
+QTD_POR_TIPO = {
+    TipoParte.COMPRADOR: Transacao.qtd_compradores,
+    TipoParte.VENDEDOR: Transacao.qtd_vendedores,
+    TipoParte.CORRETOR: Transacao.qtd_corretores,
+}
@@ -0,0 +1,163 @@
+import time
+from bisect import bisect_left
+from threading import Lock
+from typing import Any
+
+import sqlalchemy as sa
+from sqlalchemy.exc import DisconnectionError, TimeoutError as TimeoutPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from core.config import settings
+from helpers.enums import EstrategiaPrePing
+
+# Limites (ms) do histograma de espera no checkout; o último balde é "acima do maior limite"
+LIMITES_ESPERA_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class MetricasPool:
+    '''
+    Contadores de um pool de conexões, alimentados pelos eventos do pool (connect/checkout/
+    checkin/invalidate) e pela espera medida em `_do_get`. Os valores instantâneos (em uso,
+    overflow) são lidos do próprio pool na hora do retrato.
+    '''
+
+    def __init__(self):
+        self._trava = Lock()
+        self.conexoes_abertas = 0
+        self.checkouts = 0
+        self.invalidadas = 0
+        self.pings = 0
+        self.timeouts = 0
+        self.max_em_uso = 0
+        self.espera_soma_ms = 0.0
+        self.espera_baldes = [0] * (len(LIMITES_ESPERA_MS) + 1)
+
+    def registrar_espera(self, ms: float) -> None:
+        with self._trava:
+            self.espera_soma_ms += ms
+            self.espera_baldes[bisect_left(LIMITES_ESPERA_MS, ms)] += 1
+
+    def contar(self, campo: str) -> None:
+        with self._trava:
+            setattr(self, campo, getattr(self, campo) + 1)
+
+    def registrar_checkout(self, em_uso: int) -> None:
+        with self._trava:
+            self.checkouts += 1
+            self.max_em_uso = max(self.max_em_uso, em_uso)
+
+    def retrato(self, pool: sa.pool.Pool) -> dict[str, Any]:
+        with self._trava:
+            acumulado, baldes = 0, {}
+            for limite, qtd in zip((*map(str, LIMITES_ESPERA_MS), '+Inf'), self.espera_baldes):
+                acumulado += qtd
+                baldes[limite] = acumulado  # cumulativo, como num histograma Prometheus
+            return {
+                'tamanho': pool.size() if isinstance(pool, QueuePool) else None,
+                'em_uso': pool.checkedout() if isinstance(pool, QueuePool) else None,
+                'ociosas': pool.checkedin() if isinstance(pool, QueuePool) else None,
+                'overflow_em_uso': max(pool.overflow(), 0) if isinstance(pool, QueuePool) else None,
+                'max_em_uso': self.max_em_uso,
+                'conexoes_abertas': self.conexoes_abertas,
+                'checkouts': self.checkouts,
+                'invalidadas': self.invalidadas,
+                'pings': self.pings,
+                'timeouts': self.timeouts,
+                'espera_ms': {'soma': round(self.espera_soma_ms, 3), 'baldes': baldes},
+            }
+
+
+class _EsperaMedida:
+    # Mede quanto o checkout espera por uma conexão (fila cheia ou abertura de uma nova)
+    metricas: MetricasPool | None = None
+
+    def _do_get(self):
+        if self.metricas is None:
+            return super()._do_get()
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        except TimeoutPool:
+            self.metricas.contar('timeouts')
+            raise
+        finally:
+            self.metricas.registrar_espera((time.perf_counter() - inicio) * 1000)
+
+    def recreate(self):
+        # engine.dispose() recria o pool: as métricas continuam acumulando
+        novo = super().recreate()
+        novo.metricas = self.metricas
+        return novo
+
+
+class PoolInstrumentado(_EsperaMedida, QueuePool):
+    pass
+
+
+class PoolInstrumentadoAsync(_EsperaMedida, AsyncAdaptedQueuePool):
+    pass
+
+
+# Pools registrados, por nome, para o endpoint interno
+POOLS: dict[str, tuple[sa.Engine, MetricasPool]] = {}
+
+
+def opcoes_pool(url: str, assincrono: bool = False) -> dict[str, Any]:
+    # Tamanho/overflow/timeout/reciclagem vêm da configuração. SQLite (testes, benchmarks)
+    # fica com o pool padrão do dialeto, que não aceita esses parâmetros em memória.
+    opcoes: dict[str, Any] = {'pool_pre_ping': settings.POOL_PRE_PING == EstrategiaPrePing.SEMPRE}
+    if sa.engine.make_url(url).get_backend_name() != 'sqlite':
+        opcoes.update(
+            poolclass=PoolInstrumentadoAsync if assincrono else PoolInstrumentado,
+            pool_size=settings.POOL_TAMANHO,
+            max_overflow=settings.POOL_MAX_EXTRA,
+            pool_timeout=settings.POOL_TIMEOUT,
+            pool_recycle=settings.POOL_RECICLAR,
+        )
+    return opcoes
+
+
+def _pingar(conexao_dbapi) -> None:
+    cursor = conexao_dbapi.cursor()
+    try:
+        cursor.execute('SELECT 1')
+    finally:
+        cursor.close()
+
+
+def instrumentar_pool(nome: str, engine: sa.Engine, pre_ping_ociosa_segundos: float | None = None) -> None:
+    # `engine` é o Engine síncrono (para AsyncEngine, passe engine.sync_engine)
+    metricas = MetricasPool()
+    if isinstance(engine.pool, _EsperaMedida):
+        engine.pool.metricas = metricas
+    POOLS[nome] = (engine, metricas)
+
+    @sa.event.listens_for(engine, 'connect')
+    def _ao_conectar(conexao_dbapi, registro):
+        metricas.contar('conexoes_abertas')
+
+    @sa.event.listens_for(engine, 'checkout')
+    def _ao_retirar(conexao_dbapi, registro, proxy):
+        # pre-ping "ociosa": só testa a conexão que ficou parada além do limite;
+        # DisconnectionError faz o pool descartá-la e tentar outra
+        if pre_ping_ociosa_segundos is not None:
+            devolvida = registro.info.get('devolvida_em')
+            if devolvida is not None and time.monotonic() - devolvida > pre_ping_ociosa_segundos:
+                metricas.contar('pings')
+                try:
+                    _pingar(conexao_dbapi)
+                except Exception as e:
+                    raise DisconnectionError() from e
+        metricas.registrar_checkout(engine.pool.checkedout() if isinstance(engine.pool, QueuePool) else 0)
+
+    @sa.event.listens_for(engine, 'checkin')
+    def _ao_devolver(conexao_dbapi, registro):
+        registro.info['devolvida_em'] = time.monotonic()
+
+    @sa.event.listens_for(engine, 'invalidate')
+    def _ao_invalidar(conexao_dbapi, registro, excecao):
+        metricas.contar('invalidadas')
+
+
+def metricas_pools() -> dict[str, dict[str, Any]]:
+    return {nome: metricas.retrato(engine.pool) for nome, (engine, metricas) in POOLS.items()}
@@ -0,0 +1,23 @@
+from typing import Any, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class RepositorioAsync:
+    '''
+    Base das versões asyncio dos repositórios.
+
+    Cada método delega ao repositório síncrono equivalente via `AsyncSession.run_sync`:
+    a regra de acesso a dados fica num lugar só e o I/O roda no driver asyncio,
+    sem prender uma thread do pool enquanto espera o banco.
+    '''
+
+    repositorio: Callable[..., Any]
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _rodar(self, metodo: str, *args, **kwargs):
+        return await self.db.run_sync(
+            lambda sessao: getattr(self.repositorio(sessao), metodo)(*args, **kwargs)
+        )
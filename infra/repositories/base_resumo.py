@@ -0,0 +1,111 @@
+from abc import ABC, abstractmethod
+from decimal import Decimal
+
+from sqlalchemy import delete, func, select, text, true
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+
+from helpers.erros_db import ErroOperacaoBD
+
+
+class RepositorioResumo(ABC):
+    '''
+    Base das tabelas de resumo: `chave` -> quantidade e valor_total, mantidas pelos outros
+    repositórios na mesma transação da escrita.
+
+    Cada subclasse define `_agregado(filtro, **kw)`: o SELECT (chave..., ±quantidade, ±valor)
+    das linhas de origem que casam o filtro. `acumular` soma esse agregado no resumo (sem
+    commit: quem escreve é quem confirma); `reconstruir` e `verificar` recalculam tudo.
+    '''
+
+    modelo: type
+    chave: tuple[str, ...]
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @classmethod
+    def colunas(cls) -> tuple[str, ...]:
+        return (*cls.chave, 'quantidade', 'valor_total')
+
+    @abstractmethod
+    def _agregado(self, filtro, **kwargs):
+        ...
+
+    def acumular(self, filtro, **kwargs) -> None:
+        # INSERT ... SELECT ... ON CONFLICT DO UPDATE: soma o agregado no resumo em um comando
+        dialeto = self.db.get_bind().dialect.name
+        modulo = postgresql if dialeto == 'postgresql' else sqlite
+        stmt = modulo.insert(self.modelo).from_select(self.colunas(), self._agregado(filtro, **kwargs))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=self.chave,
+            set_={
+                'quantidade': self.modelo.quantidade + stmt.excluded.quantidade,
+                'valor_total': self.modelo.valor_total + stmt.excluded.valor_total,
+            },
+        )
+        self.db.execute(stmt)
+
+    def _recalculado(self, conexao) -> dict[tuple, tuple[int, Decimal]]:
+        linhas = conexao.execute(self._agregado(true())).all()
+        return {tuple(linha[:-2]): (linha[-2], linha[-1]) for linha in linhas}
+
+    def reconstruir(self) -> int:
+        # recalcula do zero (mesma transação: leitores nunca veem o resumo vazio). No Postgres,
+        # SHARE ROW EXCLUSIVE trava o `acumular` das escritas concorrentes (e outro reconstruir)
+        # até o commit, mas não as leituras: sem a trava, um delta confirmado entre o DELETE e o
+        # INSERT ... SELECT seria contado duas vezes ou perdido
+        try:
+            if self.db.get_bind().dialect.name == 'postgresql':
+                self.db.execute(text(f'LOCK TABLE {self.modelo.__tablename__} IN SHARE ROW EXCLUSIVE MODE'))
+            self.db.execute(delete(self.modelo))
+            self.db.execute(self.modelo.__table__.insert().from_select(self.colunas(), self._agregado(true())))
+            qtd = self.db.scalar(select(func.count()).select_from(self.modelo))
+            self.db.commit()
+            return int(qtd)
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ErroOperacaoBD() from e
+
+    def verificar(self) -> list[dict]:
+        # diferenças entre o resumo mantido e um recálculo completo; lista vazia = consistente
+        colunas_chave = [getattr(self.modelo, nome) for nome in self.chave]
+
+        def ler(conexao) -> tuple[dict, dict]:
+            esperado = self._recalculado(conexao)
+            atual = {
+                tuple(linha[:-2]): (linha[-2], linha[-1])
+                for linha in conexao.execute(
+                    select(*colunas_chave, self.modelo.quantidade, self.modelo.valor_total)
+                    .where(self.modelo.quantidade != 0)
+                )
+            }
+            return esperado, atual
+
+        try:
+            bind = self.db.get_bind()
+            if bind.dialect.name == 'postgresql':
+                # recálculo e resumo no mesmo snapshot (REPEATABLE READ, conexão própria): em
+                # READ COMMITTED, uma escrita confirmada entre as duas leituras apareceria
+                # como divergência falsa
+                with bind.connect().execution_options(isolation_level='REPEATABLE READ') as conexao:
+                    esperado, atual = ler(conexao)
+            else:
+                esperado, atual = ler(self.db)
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ErroOperacaoBD() from e
+
+        def texto(valor) -> str:
+            return str(getattr(valor, 'value', valor))
+
+        divergencias = []
+        for chave in sorted(esperado.keys() | atual.keys(), key=lambda c: tuple(map(texto, c))):
+            if esperado.get(chave) != atual.get(chave):
+                divergencias.append({
+                    **{nome: texto(valor) for nome, valor in zip(self.chave, chave)},
+                    'esperado': esperado.get(chave),
+                    'atual': atual.get(chave),
+                })
+        return divergencias
@@ -1,10 +1,17 @@
-from typing import Optional
+from decimal import Decimal
+from typing import Optional, List
 from uuid import UUID
+from sqlalchemy import insert, literal as sa_literal, select, update
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
-from helpers.erros_db import ErroConflitoBD, ErroOperacaoBD
+from helpers.erros_db import ErroOperacaoBD, erro_integridade
+from helpers.comissao import calcular_comissao_sql
 from infra.models.comissao import Comissao as ComissaoORM
+from infra.models.transacao import Transacao as TransacaoORM
+from infra.repositories.base_async import RepositorioAsync
+from infra.repositories.filtros import em_lista
+from infra.repositories.resumo_comissao import ResumoComissaoRepositorio
 
 class ComissaoRepositorio:
     def __init__(self, db: Session):
@@ -13,12 +20,42 @@ class ComissaoRepositorio:
     def adicionar(self, obj: ComissaoORM) -> ComissaoORM:
         try:
             self.db.add(obj)
+            self.db.flush()
+            ResumoComissaoRepositorio(self.db).acumular(ComissaoORM.id == obj.id)
             self.db.commit()
-            self.db.refresh(obj)
             return obj
         except IntegrityError as e:
             self.db.rollback()
-            raise ErroConflitoBD() from e
+            raise erro_integridade(e) from e
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ErroOperacaoBD() from e
+
+    def adicionar_calculada(self, transacao_id: UUID, percentual: Decimal) -> Optional[ComissaoORM]:
+        # INSERT ... SELECT ... RETURNING: o valor sai do valor_venda da própria transação,
+        # sem buscá-la antes. None quando a transação não existe (o SELECT não traz linha).
+        origem = (
+            select(
+                TransacaoORM.id,
+                sa_literal(percentual, ComissaoORM.percentual.type),
+                calcular_comissao_sql(TransacaoORM.valor_venda, percentual),
+            )
+            .where(TransacaoORM.id == transacao_id)
+        )
+        stmt = (
+            insert(ComissaoORM)
+            .from_select(['transacao_id', 'percentual', 'valor_calculado'], origem)
+            .returning(ComissaoORM)
+        )
+        try:
+            obj = self.db.scalars(stmt).one_or_none()
+            if obj is not None:
+                ResumoComissaoRepositorio(self.db).acumular(ComissaoORM.id == obj.id)
+            self.db.commit()
+            return obj
+        except IntegrityError as e:
+            self.db.rollback()
+            raise erro_integridade(e) from e
         except SQLAlchemyError as e:
             self.db.rollback()
             raise ErroOperacaoBD() from e
@@ -26,17 +63,88 @@ class ComissaoRepositorio:
     def buscar(self, comissao_id: UUID) -> Optional[ComissaoORM]:
         return self.db.get(ComissaoORM, comissao_id)
 
-    def marcar_paga(self, obj: ComissaoORM) -> ComissaoORM:
-        if obj.paga:
-            return obj  # curto-circuito opcional
+    def _mover_para_pagas(self, ids: List[UUID]) -> None:
+        # comissões que acabaram de ser pagas: saem de "pendente" e entram em "paga" no resumo
+        if ids:
+            resumo = ResumoComissaoRepositorio(self.db)
+            resumo.acumular(em_lista(self.db, ComissaoORM.id, ids), sinal=-1, paga=False)
+            resumo.acumular(em_lista(self.db, ComissaoORM.id, ids))
+
+    def marcar_paga(self, comissao_id: UUID) -> Optional[ComissaoORM]:
+        # idempotente: pagar de novo só devolve a comissão; None quando não existe.
+        # O UPDATE só casa se ainda não paga, para o resumo mudar uma única vez.
+        stmt = (
+            update(ComissaoORM)
+            .where(ComissaoORM.id == comissao_id, ComissaoORM.paga.is_(False))
+            .values(paga=True)
+            .returning(ComissaoORM)
+        )
         try:
+            obj = self.db.scalars(stmt, execution_options={'populate_existing': True}).one_or_none()
+            if obj is None:
+                return self.buscar(comissao_id)
+            self._mover_para_pagas([obj.id])
             self.db.commit()
-            self.db.refresh(obj)
             return obj
         except IntegrityError as e:
             self.db.rollback()
-            raise ErroConflitoBD() from e
+            raise erro_integridade(e) from e
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ErroOperacaoBD() from e
+
+    def marcar_pagas_lote(
+        self,
+        *,
+        ids: Optional[List[UUID]] = None,
+        transacao_ids: Optional[List[UUID]] = None,
+    ) -> tuple[List[ComissaoORM], List[UUID], List[UUID]]:
+        # Versão em lote de marcar_paga: um UPDATE ... WHERE paga = false RETURNING, por ids
+        # ou por transações (= ANY(:array) no Postgres). Retorna (pagas agora, já pagas, não
+        # encontradas); as duas últimas só fazem sentido na seleção por ids.
+        stmt = update(ComissaoORM).where(ComissaoORM.paga.is_(False)).values(paga=True)
+        if ids is not None:
+            stmt = stmt.where(em_lista(self.db, ComissaoORM.id, ids))
+        else:
+            stmt = stmt.where(em_lista(self.db, ComissaoORM.transacao_id, transacao_ids or []))
+        try:
+            pagas = list(self.db.scalars(stmt.returning(ComissaoORM)))
+            self._mover_para_pagas([c.id for c in pagas])
+            restantes = set(ids or []) - {c.id for c in pagas}
+            ja_pagas = set()
+            if restantes:
+                ja_pagas = set(self.db.scalars(select(ComissaoORM.id).where(em_lista(self.db, ComissaoORM.id, restantes))))
+            self.db.commit()
+        except IntegrityError as e:
+            self.db.rollback()
+            raise erro_integridade(e) from e
         except SQLAlchemyError as e:
             self.db.rollback()
             raise ErroOperacaoBD() from e
-        
\ No newline at end of file
+
+        # preserva a ordem recebida nas listas de ids
+        ordem = ids or []
+        return (
+            pagas,
+            [i for i in dict.fromkeys(ordem) if i in ja_pagas],
+            [i for i in dict.fromkeys(ordem) if i in restantes - ja_pagas],
+        )
+
+
+class ComissaoRepositorioAsync(RepositorioAsync):
+    repositorio = ComissaoRepositorio
+
+    async def adicionar(self, obj: ComissaoORM) -> ComissaoORM:
+        return await self._rodar('adicionar', obj)
+
+    async def buscar(self, comissao_id: UUID) -> Optional[ComissaoORM]:
+        return await self._rodar('buscar', comissao_id)
+
+    async def adicionar_calculada(self, transacao_id: UUID, percentual: Decimal) -> Optional[ComissaoORM]:
+        return await self._rodar('adicionar_calculada', transacao_id, percentual)
+
+    async def marcar_paga(self, comissao_id: UUID) -> Optional[ComissaoORM]:
+        return await self._rodar('marcar_paga', comissao_id)
+
+    async def marcar_pagas_lote(self, **kwargs) -> tuple[List[ComissaoORM], List[UUID], List[UUID]]:
+        return await self._rodar('marcar_pagas_lote', **kwargs)
@@ -0,0 +1,11 @@
+from sqlalchemy import any_, bindparam
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+
+def em_lista(db: Session, coluna, valores: list):
+    # `coluna IN (...)` para uma lista de tamanho variável. No Postgres vira `coluna = ANY(:array)`:
+    # um único parâmetro, o mesmo texto de comando (e plano em cache) para qualquer quantidade
+    if db.get_bind().dialect.name == 'postgresql':
+        return coluna == any_(bindparam(coluna.key, list(valores), type_=postgresql.ARRAY(coluna.type), unique=True))
+    return coluna.in_(valores)
@@ -1,58 +1,130 @@
-from typing import Optional, Dict
+from collections import Counter
+from typing import Optional, List
 from uuid import UUID
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func
+from sqlalchemy import Row, bindparam, insert, delete, select, update
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
-from helpers.erros_db import ErroConflitoBD, ErroOperacaoBD
+from helpers.erros_db import ErroOperacaoBD, erro_integridade
 from infra.models.parte import Parte as ParteORM
-from helpers.enums import TipoParte  # <<< ajuste: infra não importa de app.*
+from infra.models.transacao import Transacao as TransacaoORM, QTD_POR_TIPO
+from infra.repositories.base_async import RepositorioAsync
 
 class ParteRepositorio:
     def __init__(self, db: Session):
         self.db = db
 
+    def _ajustar_contadores(self, deltas: Counter) -> None:
+        # deltas: {(transacao_id, tipo): +n/-n}. Um UPDATE (executemany) por chamada, na mesma
+        # transação da escrita em parte; `x = x + n` no banco não perde incrementos concorrentes.
+        # Altera a representação da transação, então a versão (ETag) também avança.
+        por_transacao: dict = {}
+        for (transacao_id, tipo), n in deltas.items():
+            params = por_transacao.setdefault(transacao_id, {'b_id': transacao_id, **{f'b_{t.name}': 0 for t in QTD_POR_TIPO}})
+            params[f'b_{tipo.name}'] += n
+        if not por_transacao:
+            return
+        tabela = TransacaoORM.__table__
+        stmt = (
+            update(tabela)
+            .where(tabela.c.id == bindparam('b_id'))
+            .values(
+                versao=tabela.c.versao + 1,
+                **{col.key: tabela.c[col.key] + bindparam(f'b_{t.name}') for t, col in QTD_POR_TIPO.items()},
+            )
+        )
+        self.db.execute(stmt, list(por_transacao.values()))
+
     def adicionar(self, obj: ParteORM) -> ParteORM:
+        # sem conferir a transação antes: FK inexistente vira ErroReferenciaBD
         try:
             self.db.add(obj)
+            self.db.flush()
+            self._ajustar_contadores(Counter({(obj.transacao_id, obj.tipo): 1}))
             self.db.commit()
-            self.db.refresh(obj)
             return obj
         except IntegrityError as e:
             self.db.rollback()
-            raise ErroConflitoBD() from e
+            raise erro_integridade(e) from e
         except SQLAlchemyError as e:
             self.db.rollback()
             raise ErroOperacaoBD() from e
 
-    def buscar(self, parte_id: UUID) -> Optional[ParteORM]:
-        return self.db.get(ParteORM, parte_id)
-
-    def deletar(self, obj: ParteORM) -> None:
+    def adicionar_lote(self, linhas: List[dict]) -> List[ParteORM]:
+        # Um INSERT ... RETURNING e um commit; transação inexistente derruba o lote inteiro (FK)
         try:
-            self.db.delete(obj)
+            salvos = list(self.db.scalars(insert(ParteORM).returning(ParteORM), linhas))
+            self._ajustar_contadores(Counter((p.transacao_id, p.tipo) for p in salvos))
             self.db.commit()
+            return salvos
         except IntegrityError as e:
             self.db.rollback()
-            raise ErroConflitoBD() from e
+            raise erro_integridade(e) from e
         except SQLAlchemyError as e:
             self.db.rollback()
             raise ErroOperacaoBD() from e
 
-    def contar_por_tipo(self, transacao_id: UUID) -> Dict[TipoParte, int]:
-        stmt = (
-            select(ParteORM.tipo, func.count(ParteORM.id))
-            .where(ParteORM.transacao_id == transacao_id)
-            .group_by(ParteORM.tipo)
-        )
+    def buscar(self, parte_id: UUID) -> Optional[ParteORM]:
+        return self.db.get(ParteORM, parte_id)
+
+    def pesquisar(
+        self,
+        *,
+        cpf_cnpj: Optional[str],
+        nome: Optional[str],
+        limit: int,
+        cursor: Optional[UUID] = None,
+    ) -> tuple[List[Row], Optional[UUID]]:
+        # Busca por cpf_cnpj exato (ix_parte_cpf_cnpj_id) e/ou trecho do nome sem diferenciar
+        # maiúsculas (ix_parte_nome_trgm no Postgres). Keyset por id: (linhas, próximo cursor ou None).
+        query = select(*ParteORM.__table__.columns)
+        if cpf_cnpj:
+            query = query.where(ParteORM.cpf_cnpj == cpf_cnpj)
+        if nome:
+            trecho = nome.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            query = query.where(ParteORM.nome.ilike(f'%{trecho}%', escape='\\'))
+        if cursor is not None:
+            query = query.where(ParteORM.id > cursor)
+        query = query.order_by(ParteORM.id).limit(limit + 1)
+        try:
+            linhas = self.db.execute(query).all()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ErroOperacaoBD() from e
+        proximo = linhas[limit - 1].id if len(linhas) > limit else None
+        return linhas[:limit], proximo
+
+    def deletar(self, parte_id: UUID) -> bool:
         try:
-            rows = self.db.execute(stmt).all()
-            resultado: Dict[TipoParte, int] = {}
-            for tipo_val, qtd in rows:
-                # se a coluna for String, converte; se já for Enum, mantém
-                tipo_enum = tipo_val if isinstance(tipo_val, TipoParte) else TipoParte(tipo_val)
-                resultado[tipo_enum] = int(qtd)
-            return resultado
+            removida = self.db.execute(
+                delete(ParteORM).where(ParteORM.id == parte_id).returning(ParteORM.transacao_id, ParteORM.tipo)
+            ).one_or_none()
+            if removida is not None:
+                self._ajustar_contadores(Counter({(removida.transacao_id, removida.tipo): -1}))
+            self.db.commit()
+            return removida is not None
+        except IntegrityError as e:
+            self.db.rollback()
+            raise erro_integridade(e) from e
         except SQLAlchemyError as e:
             self.db.rollback()
             raise ErroOperacaoBD() from e
+
+
+class ParteRepositorioAsync(RepositorioAsync):
+    repositorio = ParteRepositorio
+
+    async def adicionar(self, obj: ParteORM) -> ParteORM:
+        return await self._rodar('adicionar', obj)
+
+    async def adicionar_lote(self, linhas: List[dict]) -> List[ParteORM]:
+        return await self._rodar('adicionar_lote', linhas)
+
+    async def buscar(self, parte_id: UUID) -> Optional[ParteORM]:
+        return await self._rodar('buscar', parte_id)
+
+    async def pesquisar(self, **kwargs) -> tuple[List[Row], Optional[UUID]]:
+        return await self._rodar('pesquisar', **kwargs)
+
+    async def deletar(self, parte_id: UUID) -> bool:
+        return await self._rodar('deletar', parte_id)
@@ -0,0 +1,82 @@
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import cast, false, func, literal, select, true
+from sqlalchemy.exc import SQLAlchemyError
+
+from helpers.enums import StatusTransacao
+from helpers.erros_db import ErroOperacaoBD
+from helpers.periodo import dia_utc
+from infra.models.comissao import Comissao as ComissaoORM
+from infra.models.transacao import Transacao as TransacaoORM
+from infra.models.resumo_comissao import ResumoComissao as ResumoORM
+from infra.repositories.base_async import RepositorioAsync
+from infra.repositories.base_resumo import RepositorioResumo
+
+
+class ResumoComissaoRepositorio(RepositorioResumo):
+    '''
+    Tabela resumo_comissao: (dia da transação, status da transação, paga) -> quantidade e valor.
+    Acumulada pelos repositórios de comissão e de transação.
+    '''
+
+    modelo = ResumoORM
+    chave = ('dia', 'status_transacao', 'paga')
+
+    def _agregado(self, filtro, *, sinal: int = 1, status: Optional[StatusTransacao] = None, paga: Optional[bool] = None):
+        # (dia, status, paga, ±quantidade, ±valor) das comissões que casam o filtro;
+        # `status`/`paga` substituem o valor atual da linha (para desfazer o estado anterior)
+        agrupar = [dia_utc(TransacaoORM.data_criacao)]
+        if status is None:
+            coluna_status = TransacaoORM.status
+            agrupar.append(TransacaoORM.status)
+        else:
+            coluna_status = cast(literal(status.value), TransacaoORM.status.type)
+        if paga is None:
+            coluna_paga = ComissaoORM.paga
+            agrupar.append(ComissaoORM.paga)
+        else:
+            coluna_paga = true() if paga else false()
+
+        quantidade, valor = func.count(ComissaoORM.id), func.sum(ComissaoORM.valor_calculado)
+        return (
+            select(
+                dia_utc(TransacaoORM.data_criacao),
+                coluna_status,
+                coluna_paga,
+                quantidade if sinal > 0 else -quantidade,
+                valor if sinal > 0 else -valor,
+            )
+            .join(TransacaoORM, TransacaoORM.id == ComissaoORM.transacao_id)
+            .where(filtro)
+            .group_by(*agrupar)
+        )
+
+    def consultar(
+        self,
+        *,
+        data_ini: Optional[date],
+        data_fim: Optional[date],
+        status_filtro: Optional[StatusTransacao],
+    ) -> list:
+        # linhas do resumo (dia, status, paga, quantidade, valor_total); nada de agregação em comissao
+        query = select(ResumoORM).where(ResumoORM.quantidade != 0)
+        if data_ini:
+            query = query.where(ResumoORM.dia >= data_ini)
+        if data_fim:
+            query = query.where(ResumoORM.dia <= data_fim)
+        if status_filtro is not None:
+            query = query.where(ResumoORM.status_transacao == status_filtro)
+        query = query.order_by(ResumoORM.dia, ResumoORM.status_transacao, ResumoORM.paga)
+        try:
+            return self.db.scalars(query).all()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ErroOperacaoBD() from e
+
+
+class ResumoComissaoRepositorioAsync(RepositorioAsync):
+    repositorio = ResumoComissaoRepositorio
+
+    async def consultar(self, **kwargs) -> list:
+        return await self._rodar('consultar', **kwargs)
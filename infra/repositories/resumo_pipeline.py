@@ -0,0 +1,75 @@
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import Integer, cast, func, literal, literal_column, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from helpers.enums import StatusTransacao
+from helpers.erros_db import ErroOperacaoBD
+from helpers.periodo import dia_utc
+from infra.models.transacao import Transacao as TransacaoORM
+from infra.models.resumo_pipeline import ResumoPipeline as ResumoORM
+from infra.repositories.base_async import RepositorioAsync
+from infra.repositories.base_resumo import RepositorioResumo
+
+
+class ResumoPipelineRepositorio(RepositorioResumo):
+    '''
+    Tabela resumo_pipeline: (dia de criação, status) -> quantidade de transações e soma de valor_venda.
+    Acumulada pelo TransacaoRepositorio a cada inclusão, alteração de valor, transição e remoção.
+    '''
+
+    modelo = ResumoORM
+    chave = ('dia', 'status')
+
+    def _agregado(
+        self,
+        filtro,
+        *,
+        sinal: int = 1,
+        status: Optional[StatusTransacao] = None,
+        variacao_valor: bool = False,
+    ):
+        # (dia, status, ±quantidade, ±valor) das transações que casam o filtro.
+        # `status` substitui o status atual (para desfazer o anterior); `variacao_valor`
+        # soma só valor_venda - valor_venda_anterior, sem mexer na quantidade.
+        agrupar = [dia_utc(TransacaoORM.data_criacao)]
+        if status is None:
+            coluna_status = TransacaoORM.status
+            agrupar.append(TransacaoORM.status)
+        else:
+            coluna_status = cast(literal(status.value), TransacaoORM.status.type)
+
+        if variacao_valor:
+            quantidade = literal_column('0', Integer)
+            valor = func.sum(TransacaoORM.valor_venda - TransacaoORM.valor_venda_anterior)
+        else:
+            quantidade, valor = func.count(TransacaoORM.id), func.sum(TransacaoORM.valor_venda)
+            if sinal < 0:
+                quantidade, valor = -quantidade, -valor
+        return (
+            select(dia_utc(TransacaoORM.data_criacao), coluna_status, quantidade, valor)
+            .where(filtro)
+            .group_by(*agrupar)
+        )
+
+    def consultar(self, *, data_ini: Optional[date], data_fim: Optional[date]) -> list:
+        # linhas do resumo no intervalo (dias inclusive); nada de agregação em transacao
+        query = select(ResumoORM).where(ResumoORM.quantidade != 0)
+        if data_ini:
+            query = query.where(ResumoORM.dia >= data_ini)
+        if data_fim:
+            query = query.where(ResumoORM.dia <= data_fim)
+        query = query.order_by(ResumoORM.dia, ResumoORM.status)
+        try:
+            return self.db.scalars(query).all()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ErroOperacaoBD() from e
+
+
+class ResumoPipelineRepositorioAsync(RepositorioAsync):
+    repositorio = ResumoPipelineRepositorio
+
+    async def consultar(self, **kwargs) -> list:
+        return await self._rodar('consultar', **kwargs)
@@ -0,0 +1,47 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+
+from helpers.erros_db import ErroOperacaoBD
+from infra.models.token_revogado import TokenRevogado as TokenRevogadoORM
+from infra.repositories.base_async import RepositorioAsync
+
+
+class TokenRevogadoRepositorio:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def revogar(self, jti: str, exp: float) -> None:
+        # idempotente (ON CONFLICT DO NOTHING); aproveita para podar os que já expiraram
+        agora = datetime.now(timezone.utc)
+        modulo = postgresql if self.db.get_bind().dialect.name == 'postgresql' else sqlite
+        stmt = modulo.insert(TokenRevogadoORM).values(
+            jti=jti, exp=datetime.fromtimestamp(exp, timezone.utc)
+        ).on_conflict_do_nothing(index_elements=['jti'])
+        try:
+            self.db.execute(delete(TokenRevogadoORM).where(TokenRevogadoORM.exp <= agora))
+            self.db.execute(stmt)
+            self.db.commit()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ErroOperacaoBD() from e
+
+    def revogado(self, jti: str) -> bool:
+        try:
+            return self.db.scalar(select(TokenRevogadoORM.jti).where(TokenRevogadoORM.jti == jti)) is not None
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ErroOperacaoBD() from e
+
+
+class TokenRevogadoRepositorioAsync(RepositorioAsync):
+    repositorio = TokenRevogadoRepositorio
+
+    async def revogar(self, jti: str, exp: float) -> None:
+        return await self._rodar('revogar', jti, exp)
+
+    async def revogado(self, jti: str) -> bool:
+        return await self._rodar('revogado', jti)
@@ -1,16 +1,30 @@
-from uuid import UUID
+import json
+from uuid import UUID, uuid4
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional, List, Dict
+from typing import Optional, List, AsyncIterator
 
-from sqlalchemy import func, select
+from sqlalchemy import Row, delete, func, insert, select, text, tuple_, update
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
-from helpers.erros_db import ErroConflitoBD, ErroOperacaoBD
-from infra.models.transacao import Transacao as TransacaoORM
+from helpers.erros_db import ErroOperacaoBD, erro_integridade
+from infra.models.transacao import Transacao as TransacaoORM, QTD_POR_TIPO
 from infra.models.parte import Parte as ParteORM
-from helpers.enums import StatusTransacao, TipoParte
+from infra.models.comissao import Comissao as ComissaoORM
+from infra.cache_contagem import cache_contagem
+from infra.repositories.base_async import RepositorioAsync
+from infra.repositories.filtros import em_lista
+from infra.repositories.resumo_comissao import ResumoComissaoRepositorio
+from infra.repositories.resumo_pipeline import ResumoPipelineRepositorio
+from helpers.enums import StatusTransacao, EstrategiaContagem, RelacaoTransacao, PARTES_EXIGIDAS, origens_permitidas
+
+# Tabela de cada relação embutível (?incluir=)
+MODELO_RELACAO = {
+    RelacaoTransacao.PARTES: ParteORM,
+    RelacaoTransacao.COMISSOES: ComissaoORM,
+}
 
 
 class TransacaoRepositorio:
@@ -18,14 +32,36 @@ class TransacaoRepositorio:
         self.db = db
 
     def adicionar(self, obj: TransacaoORM) -> TransacaoORM:
+        # eager_defaults: as datas do banco voltam no RETURNING do próprio INSERT
         try:
             self.db.add(obj)
+            self.db.flush()
+            ResumoPipelineRepositorio(self.db).acumular(TransacaoORM.id == obj.id)
             self.db.commit()
-            self.db.refresh(obj)
+            cache_contagem.invalidar()
             return obj
         except IntegrityError as e:
             self.db.rollback()
-            raise ErroConflitoBD() from e
+            raise erro_integridade(e) from e
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ErroOperacaoBD() from e
+
+    def adicionar_lote(self, linhas: list[dict]) -> int:
+        # Um INSERT multi-linha e um commit para o lote inteiro (sem refresh por objeto)
+        if not linhas:
+            return 0
+        # ids gerados aqui para somar exatamente este lote no resumo do pipeline
+        linhas = [{'id': uuid4(), **linha} for linha in linhas]
+        try:
+            self.db.execute(insert(TransacaoORM), linhas)
+            ResumoPipelineRepositorio(self.db).acumular(TransacaoORM.id.in_([linha['id'] for linha in linhas]))
+            self.db.commit()
+            cache_contagem.invalidar()
+            return len(linhas)
+        except IntegrityError as e:
+            self.db.rollback()
+            raise erro_integridade(e) from e
         except SQLAlchemyError as e:
             self.db.rollback()
             raise ErroOperacaoBD() from e
@@ -33,18 +69,37 @@ class TransacaoRepositorio:
     def buscar(self, transacao_id: UUID) -> Optional[TransacaoORM]:
         return self.db.get(TransacaoORM, transacao_id)
 
-    def listar(
-        self,
-        *, # Parâmetros nomeados obrigatórios, não da pra passar por posição
+    def buscar_lote(self, transacao_ids: list[UUID]) -> tuple[list[TransacaoORM], list[UUID]]:
+        # Versão em lote de `buscar`: como `db.get`, o que já está no identity map da sessão
+        # não volta ao banco; o resto vem em uma consulta (id = ANY(:ids) no Postgres).
+        # Retorna (encontradas, ids não encontrados), ambos na ordem recebida, sem repetições.
+        ids = list(dict.fromkeys(transacao_ids))
+        encontradas = {}
+        for transacao_id in ids:
+            obj = self.db.identity_map.get(identity_key(TransacaoORM, transacao_id))
+            if obj is not None:
+                encontradas[transacao_id] = obj
+
+        faltando = [i for i in ids if i not in encontradas]
+        if faltando:
+            try:
+                for obj in self.db.scalars(select(TransacaoORM).where(em_lista(self.db, TransacaoORM.id, faltando))):
+                    encontradas[obj.id] = obj
+            except SQLAlchemyError as e:
+                self.db.rollback()
+                raise ErroOperacaoBD() from e
+
+        return [encontradas[i] for i in ids if i in encontradas], [i for i in ids if i not in encontradas]
+
+    @staticmethod
+    def _filtrar(
+        query,
+        *,
         status_filtro: Optional[StatusTransacao],
         imovel_codigo: Optional[str],
         data_ini: Optional[datetime],
         data_fim: Optional[datetime],
-        limit: int,
-        offset: int,
-    ) -> tuple[list[TransacaoORM], int]:
-        
-        query = select(TransacaoORM)
+    ):
         if status_filtro is not None:
             query = query.where(TransacaoORM.status == status_filtro)
         if imovel_codigo:
@@ -53,69 +108,316 @@ class TransacaoRepositorio:
             query = query.where(TransacaoORM.data_criacao >= data_ini)
         if data_fim:
             query = query.where(TransacaoORM.data_criacao < data_fim)
+        return query
 
-        try:
-            total = self.db.execute(
-                select(func.count()).select_from(query.subquery())
-            ).scalar_one()
-
-            query = (
-                query.order_by(TransacaoORM.data_criacao.desc())
-                .offset(offset)
-                .limit(limit)
+    def _pagina(
+        self,
+        query,
+        *,
+        limit: int,
+        offset: int,
+        cursor: Optional[tuple[datetime, UUID]],
+    ) -> tuple[list, bool]:
+        # Página ordenada por (data_criacao, id) desc. Com `cursor` (chave do último item
+        # já visto) usa keyset em vez de OFFSET: o custo não cresce com a profundidade.
+        if cursor is not None:
+            query = query.where(
+                tuple_(TransacaoORM.data_criacao, TransacaoORM.id) < tuple_(*cursor)
             )
-            itens = self.db.execute(query).scalars().all()
-            return itens, int(total)
+        else:
+            query = query.offset(offset)
+
+        # busca um item a mais só para saber se existe próxima página
+        query = (
+            query.order_by(TransacaoORM.data_criacao.desc(), TransacaoORM.id.desc())
+            .limit(limit + 1)
+        )
+        try:
+            itens = self.db.execute(query).all()
         except SQLAlchemyError as e:
             self.db.rollback()
             raise ErroOperacaoBD() from e
 
-    def atualizar_tudo(
+        # (linhas da página, se existe próxima)
+        return itens[:limit], len(itens) > limit
+
+    def listar(
+        self,
+        *, # Parâmetros nomeados obrigatórios, não da pra passar por posição
+        status_filtro: Optional[StatusTransacao],
+        imovel_codigo: Optional[str],
+        data_ini: Optional[datetime],
+        data_fim: Optional[datetime],
+        limit: int,
+        offset: int = 0,
+        cursor: Optional[tuple[datetime, UUID]] = None,
+    ) -> tuple[list[TransacaoORM], Optional[tuple[datetime, UUID]]]:
+        # Retorna (itens, chave do próximo cursor ou None); o total fica em `contar`.
+        query = self._filtrar(
+            select(TransacaoORM),
+            status_filtro=status_filtro,
+            imovel_codigo=imovel_codigo,
+            data_ini=data_ini,
+            data_fim=data_fim,
+        )
+        linhas, tem_mais = self._pagina(query, limit=limit, offset=offset, cursor=cursor)
+        itens = [linha[0] for linha in linhas]
+        proximo = (itens[-1].data_criacao, itens[-1].id) if tem_mais else None
+        return itens, proximo
+
+    def versoes_pagina(
         self,
-        obj: TransacaoORM,
         *,
-        imovel_codigo: Optional[str] = None,
-        valor_venda: Optional[Decimal] = None,
-    ) -> TransacaoORM:
-        if imovel_codigo is not None:
-            obj.imovel_codigo = imovel_codigo
-        if valor_venda is not None:
-            obj.valor_venda = valor_venda
+        status_filtro: Optional[StatusTransacao],
+        imovel_codigo: Optional[str],
+        data_ini: Optional[datetime],
+        data_fim: Optional[datetime],
+        limit: int,
+        offset: int = 0,
+        cursor: Optional[tuple[datetime, UUID]] = None,
+    ) -> tuple[list[tuple[UUID, int]], Optional[tuple[datetime, UUID]]]:
+        # Mesma página de `listar`, só com (id, versao): base do ETag sem carregar as linhas inteiras
+        query = self._filtrar(
+            select(TransacaoORM.id, TransacaoORM.versao, TransacaoORM.data_criacao),
+            status_filtro=status_filtro,
+            imovel_codigo=imovel_codigo,
+            data_ini=data_ini,
+            data_fim=data_fim,
+        )
+        linhas, tem_mais = self._pagina(query, limit=limit, offset=offset, cursor=cursor)
+        proximo = (linhas[-1].data_criacao, linhas[-1].id) if tem_mais else None
+        return [(linha.id, linha.versao) for linha in linhas], proximo
+
+    def listar_linhas(
+        self,
+        *,
+        status_filtro: Optional[StatusTransacao],
+        imovel_codigo: Optional[str],
+        data_ini: Optional[datetime],
+        data_fim: Optional[datetime],
+        limit: int,
+        offset: int = 0,
+        cursor: Optional[tuple[datetime, UUID]] = None,
+    ) -> tuple[list[Row], Optional[tuple[datetime, UUID]]]:
+        # Mesma página de `listar` em linhas de colunas, sem montar objetos ORM (resposta rápida)
+        query = self._filtrar(
+            select(*TransacaoORM.__table__.columns),
+            status_filtro=status_filtro,
+            imovel_codigo=imovel_codigo,
+            data_ini=data_ini,
+            data_fim=data_fim,
+        )
+        linhas, tem_mais = self._pagina(query, limit=limit, offset=offset, cursor=cursor)
+        proximo = (linhas[-1].data_criacao, linhas[-1].id) if tem_mais else None
+        return linhas, proximo
+
+    def buscar_linha(self, transacao_id: UUID) -> Optional[Row]:
         try:
-            self.db.commit()
-            self.db.refresh(obj)
-            return obj
-        except IntegrityError as e:
+            return self.db.execute(
+                select(*TransacaoORM.__table__.columns).where(TransacaoORM.id == transacao_id)
+            ).one_or_none()
+        except SQLAlchemyError as e:
             self.db.rollback()
-            raise ErroConflitoBD() from e
+            raise ErroOperacaoBD() from e
+
+    def versao(self, transacao_id: UUID) -> Optional[int]:
+        try:
+            return self.db.execute(
+                select(TransacaoORM.versao).where(TransacaoORM.id == transacao_id)
+            ).scalar_one_or_none()
         except SQLAlchemyError as e:
             self.db.rollback()
             raise ErroOperacaoBD() from e
 
-    def deletar(self, obj: TransacaoORM) -> None:
+    def contar(
+        self,
+        *,
+        status_filtro: Optional[StatusTransacao],
+        imovel_codigo: Optional[str],
+        data_ini: Optional[datetime],
+        data_fim: Optional[datetime],
+        estrategia: EstrategiaContagem = EstrategiaContagem.EXATA,
+    ) -> tuple[int, EstrategiaContagem]:
+        # Retorna (total, estratégia que de fato produziu o número): um miss no cache
+        # conta como exata, e fora do Postgres a estimativa cai para a contagem exata.
+        filtros = dict(status_filtro=status_filtro, imovel_codigo=imovel_codigo, data_ini=data_ini, data_fim=data_fim)
+        query = self._filtrar(select(TransacaoORM.id), **filtros)
         try:
-            self.db.delete(obj)
+            if estrategia == EstrategiaContagem.ESTIMADA and self.db.get_bind().dialect.name == 'postgresql':
+                estimado = self._estimar(query, sem_filtro=not any(filtros.values()))
+                if estimado is not None:
+                    return estimado, EstrategiaContagem.ESTIMADA
+
+            chave = None
+            if estrategia == EstrategiaContagem.CACHE:
+                chave = (
+                    status_filtro.value if status_filtro is not None else None,
+                    imovel_codigo or None,
+                    data_ini.isoformat() if data_ini else None,
+                    data_fim.isoformat() if data_fim else None,
+                )
+                total = cache_contagem.obter(chave)
+                if total is not None:
+                    return total, EstrategiaContagem.CACHE
+
+            total = int(self.db.execute(select(func.count()).select_from(query.subquery())).scalar_one())
+            if chave is not None:
+                cache_contagem.guardar(chave, total)
+            return total, EstrategiaContagem.EXATA
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ErroOperacaoBD() from e
+
+    def _estimar(self, query, *, sem_filtro: bool) -> Optional[int]:
+        # Sem filtro: estatística da tabela (pg_class). Com filtro: linhas previstas pelo planner.
+        # None quando a tabela ainda não foi analisada (reltuples < 0).
+        if sem_filtro:
+            estimado = self.db.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'transacao'::regclass")
+            ).scalar_one()
+            return int(estimado) if estimado >= 0 else None
+
+        sql = query.compile(dialect=self.db.get_bind().dialect, compile_kwargs={'literal_binds': True})
+        plano = self.db.connection().exec_driver_sql(f'EXPLAIN (FORMAT JSON) {sql}').scalar_one()
+        if isinstance(plano, str):
+            plano = json.loads(plano)
+        return int(plano[0]['Plan']['Plan Rows'])
+
+    def _gravar_retornando(self, stmt, versoes: Optional[set[int]] = None, apos=None) -> Optional[TransacaoORM]:
+        # UPDATE ... RETURNING em uma ida ao banco; None quando nenhuma linha casou.
+        # Toda escrita incrementa `versao`; com `versoes` (If-Match) só grava se a atual estiver entre elas.
+        # `apos(obj)` roda antes do commit, na mesma transação (ex.: manter o resumo de comissões).
+        stmt = stmt.values(versao=TransacaoORM.versao + 1)
+        if versoes is not None:
+            stmt = stmt.where(TransacaoORM.versao.in_(sorted(versoes)))
+        try:
+            obj = self.db.scalars(
+                stmt.returning(TransacaoORM),
+                execution_options={'populate_existing': True},
+            ).one_or_none()
+            if obj is not None and apos is not None:
+                apos(obj)
             self.db.commit()
+            cache_contagem.invalidar()
+            return obj
         except IntegrityError as e:
             self.db.rollback()
-            raise ErroConflitoBD() from e
+            raise erro_integridade(e) from e
         except SQLAlchemyError as e:
             self.db.rollback()
             raise ErroOperacaoBD() from e
 
-    def atualizar_status(self, obj: TransacaoORM, novo_status: StatusTransacao) -> TransacaoORM:
-        obj.status = novo_status
+    def atualizar_tudo(
+        self,
+        transacao_id: UUID,
+        *,
+        imovel_codigo: Optional[str] = None,
+        valor_venda: Optional[Decimal] = None,
+        versoes: Optional[set[int]] = None,
+    ) -> Optional[TransacaoORM]:
+        valores = {}
+        if imovel_codigo is not None:
+            valores['imovel_codigo'] = imovel_codigo
+        if valor_venda is not None:
+            valores['valor_venda'] = valor_venda
+            valores['valor_venda_anterior'] = TransacaoORM.valor_venda
+        if not valores:
+            # nada a gravar: a versão não muda, mas o If-Match vale igual (None -> 412/404)
+            obj = self.buscar(transacao_id)
+            if obj is not None and versoes is not None and obj.versao not in versoes:
+                return None
+            return obj
+
+        def ajustar_pipeline(obj: TransacaoORM):
+            # só a diferença de valor entra no resumo; a quantidade não muda
+            if valor_venda is not None and obj.valor_venda_anterior != obj.valor_venda:
+                ResumoPipelineRepositorio(self.db).acumular(TransacaoORM.id == transacao_id, variacao_valor=True)
+
+        return self._gravar_retornando(
+            update(TransacaoORM).where(TransacaoORM.id == transacao_id).values(**valores),
+            versoes,
+            apos=ajustar_pipeline,
+        )
+
+    def deletar(self, transacao_id: UUID) -> bool:
+        # partes e comissões saem pelo ON DELETE CASCADE do banco; antes, transação e
+        # comissões saem dos resumos (depois do DELETE já não há o que agregar)
         try:
+            ResumoPipelineRepositorio(self.db).acumular(TransacaoORM.id == transacao_id, sinal=-1)
+            ResumoComissaoRepositorio(self.db).acumular(ComissaoORM.transacao_id == transacao_id, sinal=-1)
+            removido = self.db.execute(
+                delete(TransacaoORM).where(TransacaoORM.id == transacao_id).returning(TransacaoORM.id)
+            ).one_or_none()
             self.db.commit()
-            self.db.refresh(obj)
-            return obj
+            cache_contagem.invalidar()
+            return removido is not None
         except IntegrityError as e:
             self.db.rollback()
-            raise ErroConflitoBD() from e
+            raise erro_integridade(e) from e
         except SQLAlchemyError as e:
             self.db.rollback()
             raise ErroOperacaoBD() from e
 
+    def atualizar_status(
+        self,
+        transacao_id: UUID,
+        novo_status: StatusTransacao,
+        *,
+        versoes: Optional[set[int]] = None,
+    ) -> Optional[TransacaoORM]:
+        # Transição em um único UPDATE condicional: o status atual precisa ser uma origem
+        # permitida (TRANSICOES_PERMITIDAS) e os contadores das partes exigidas, maiores que zero.
+        # Dois PATCH concorrentes não passam ambos: o segundo já não casa o WHERE.
+        # None quando não casou; o motivo (404/412/422) fica para quem chamou diagnosticar.
+        stmt = update(TransacaoORM).where(
+            TransacaoORM.id == transacao_id,
+            TransacaoORM.status.in_(sorted(origens_permitidas(novo_status), key=lambda s: s.value)),
+        )
+        for tipo in sorted(PARTES_EXIGIDAS.get(novo_status, ()), key=lambda t: t.value):
+            stmt = stmt.where(QTD_POR_TIPO[tipo] > 0)
+        def mover_resumos(obj: TransacaoORM):
+            # a transação e suas comissões mudam de linha nos resumos: saem do status anterior, entram no novo
+            if obj.status_anterior != obj.status:
+                for resumo, filtro in (
+                    (ResumoPipelineRepositorio(self.db), TransacaoORM.id == transacao_id),
+                    (ResumoComissaoRepositorio(self.db), ComissaoORM.transacao_id == transacao_id),
+                ):
+                    resumo.acumular(filtro, sinal=-1, status=obj.status_anterior)
+                    resumo.acumular(filtro)
+
+        return self._gravar_retornando(
+            stmt.values(status=novo_status, status_anterior=TransacaoORM.status),
+            versoes,
+            apos=mover_resumos,
+        )
+
+    def relacionados(
+        self,
+        transacao_ids: list[UUID],
+        relacoes: set[RelacaoTransacao],
+    ) -> dict[RelacaoTransacao, dict[UUID, list[Row]]]:
+        # Estratégia do selectinload: uma consulta por relação com IN nos ids da página inteira,
+        # nunca uma por transação. Linhas de colunas (sem ORM), agrupadas por transação.
+        agrupado: dict[RelacaoTransacao, dict[UUID, list[Row]]] = {}
+        for relacao in sorted(relacoes, key=lambda r: r.value):
+            modelo = MODELO_RELACAO[relacao]
+            por_transacao = agrupado[relacao] = {}
+            if not transacao_ids:
+                continue
+            query = (
+                select(*modelo.__table__.columns)
+                .where(modelo.transacao_id.in_(transacao_ids))
+                .order_by(modelo.transacao_id, modelo.id)
+            )
+            try:
+                linhas = self.db.execute(query).all()
+            except SQLAlchemyError as e:
+                self.db.rollback()
+                raise ErroOperacaoBD() from e
+            for linha in linhas:
+                por_transacao.setdefault(linha.transacao_id, []).append(linha)
+        return agrupado
+
     def listar_partes(self, transacao_id: UUID) -> List[ParteORM]:
         stmt = select(ParteORM).where(ParteORM.transacao_id == transacao_id)
         try:
@@ -124,19 +426,89 @@ class TransacaoRepositorio:
             self.db.rollback()
             raise ErroOperacaoBD() from e
 
-    def contar_partes_por_tipo(self, transacao_id: UUID) -> Dict[TipoParte, int]:
-        stmt = (
-            select(ParteORM.tipo, func.count(ParteORM.id))
-            .where(ParteORM.transacao_id == transacao_id)
-            .group_by(ParteORM.tipo)
+
+class TransacaoRepositorioAsync(RepositorioAsync):
+    repositorio = TransacaoRepositorio
+
+    async def adicionar(self, obj: TransacaoORM) -> TransacaoORM:
+        return await self._rodar('adicionar', obj)
+
+    async def adicionar_lote(self, linhas: list[dict]) -> int:
+        return await self._rodar('adicionar_lote', linhas)
+
+    async def buscar(self, transacao_id: UUID) -> Optional[TransacaoORM]:
+        return await self._rodar('buscar', transacao_id)
+
+    async def buscar_lote(self, transacao_ids: list[UUID]) -> tuple[list[TransacaoORM], list[UUID]]:
+        return await self._rodar('buscar_lote', transacao_ids)
+
+    async def listar(self, **kwargs) -> tuple[list[TransacaoORM], Optional[tuple[datetime, UUID]]]:
+        return await self._rodar('listar', **kwargs)
+
+    async def versoes_pagina(self, **kwargs) -> tuple[list[tuple[UUID, int]], Optional[tuple[datetime, UUID]]]:
+        return await self._rodar('versoes_pagina', **kwargs)
+
+    async def listar_linhas(self, **kwargs) -> tuple[list[Row], Optional[tuple[datetime, UUID]]]:
+        return await self._rodar('listar_linhas', **kwargs)
+
+    async def buscar_linha(self, transacao_id: UUID) -> Optional[Row]:
+        return await self._rodar('buscar_linha', transacao_id)
+
+    async def versao(self, transacao_id: UUID) -> Optional[int]:
+        return await self._rodar('versao', transacao_id)
+
+    async def contar(self, **kwargs) -> tuple[int, EstrategiaContagem]:
+        return await self._rodar('contar', **kwargs)
+
+    async def atualizar_tudo(self, transacao_id: UUID, **kwargs) -> Optional[TransacaoORM]:
+        return await self._rodar('atualizar_tudo', transacao_id, **kwargs)
+
+    async def deletar(self, transacao_id: UUID) -> bool:
+        return await self._rodar('deletar', transacao_id)
+
+    async def atualizar_status(self, transacao_id: UUID, novo_status: StatusTransacao, **kwargs) -> Optional[TransacaoORM]:
+        return await self._rodar('atualizar_status', transacao_id, novo_status, **kwargs)
+
+    async def relacionados(
+        self,
+        transacao_ids: list[UUID],
+        relacoes: set[RelacaoTransacao],
+    ) -> dict[RelacaoTransacao, dict[UUID, list[Row]]]:
+        return await self._rodar('relacionados', transacao_ids, relacoes)
+
+    async def listar_partes(self, transacao_id: UUID) -> List[ParteORM]:
+        return await self._rodar('listar_partes', transacao_id)
+
+    async def exportar(
+        self,
+        *,
+        lote: int = 500,
+        partes: bool = False,
+        comissoes: bool = False,
+        **filtros,
+    ) -> AsyncIterator[tuple[TransacaoORM, list[ParteORM], list[ComissaoORM]]]:
+        # Lê por cursor do lado do servidor (stream + yield_per): só um lote fica em memória.
+        # Partes/comissões vêm em uma consulta por lote (IN nos ids), nunca uma por transação.
+        query = (
+            TransacaoRepositorio._filtrar(select(TransacaoORM), **filtros)
+            .order_by(TransacaoORM.data_criacao.desc(), TransacaoORM.id.desc())
+            .execution_options(yield_per=lote)
         )
         try:
-            linhas = self.db.execute(stmt).all()
-            resultado: Dict[TipoParte, int] = {}
-            for tipo_val, qtd in linhas:
-                tipo_enum = tipo_val if isinstance(tipo_val, TipoParte) else TipoParte(tipo_val)
-                resultado[tipo_enum] = int(qtd)
-            return resultado
+            resultado = await self.db.stream(query)
+            async for particao in resultado.scalars().partitions():
+                ids = [t.id for t in particao]
+                partes_por_id = await self._agrupar(ParteORM, ids) if partes else {}
+                comissoes_por_id = await self._agrupar(ComissaoORM, ids) if comissoes else {}
+                # o identity map guarda referências fracas: lotes já entregues são liberados
+                for t in particao:
+                    yield t, partes_por_id.get(t.id, []), comissoes_por_id.get(t.id, [])
         except SQLAlchemyError as e:
-            self.db.rollback()
             raise ErroOperacaoBD() from e
+
+    async def _agrupar(self, modelo, ids: list[UUID]) -> dict:
+        agrupado: dict = {}
+        linhas = await self.db.scalars(select(modelo).where(modelo.transacao_id.in_(ids)))
+        for obj in linhas:
+            agrupado.setdefault(obj.transacao_id, []).append(obj)
+        return agrupado
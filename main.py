@@ -1,12 +1,25 @@
+import logging
 from typing import Union
 from datetime import datetime, timezone
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from core.config import settings
+from core.logs import configurar_logs
 
 from app.routers.transacao import router as transacoes_router
 from app.routers.parte import router as partes_router
 from app.routers.comissao import router as comissoes_router
 from app.routers.auth import router as auth_router
+from app.routers.interno import router as interno_router
+from app.routers.relatorio import router as relatorios_router
+from app.middleware.fixar_primario import FixarPrimarioAposEscrita
+from app.middleware.metricas import MetricasRequisicao
+from app.middleware.contexto import IdRequisicao
+from infra.metricas import exposicao_prometheus
+
+# Logs em JSON por uma fila (a escrita no stdout sai do caminho da requisição)
+configurar_logs()
+logger = logging.getLogger('api')
 
 # Instância FastAPI
 app = FastAPI(
@@ -14,6 +27,21 @@ app = FastAPI(
     version='1.0.0'
 )
 
+# Leituras vão à réplica (se houver); depois de uma escrita o cliente lê do primário por alguns segundos
+# (o caminho do POST só de leitura vem do prefixo do router, não de uma string repetida)
+app.add_middleware(
+    FixarPrimarioAposEscrita,
+    segundos=settings.LEITURA_FIXAR_PRIMARIO_SEGUNDOS,
+    rotas_leitura={f'{transacoes_router.prefix}/buscar-lote'},
+)
+
+# Externo ao FixarPrimario: a latência inclui os middlewares da aplicação
+if settings.METRICAS_ATIVAS:
+    app.add_middleware(MetricasRequisicao)
+
+# X-Request-ID e rota da requisição corrente, para correlacionar logs e consultas lentas
+app.add_middleware(IdRequisicao)
+
 # Rota pública
 app.include_router(auth_router)
 
@@ -21,13 +49,21 @@ app.include_router(auth_router)
 app.include_router(transacoes_router)
 app.include_router(partes_router)
 app.include_router(comissoes_router)
+app.include_router(relatorios_router)
+app.include_router(interno_router)
 
 # Health oficial sob o prefixo configurável
 @app.get(f'{settings.API_PREFIX}/health')
-def health_check():
-    print('health ping')
+async def health_check():
+    logger.debug('health ping')
     return {
         'status': 'ok',
         'service': 'api-imobiliaria',
         'timestamp': datetime.now(timezone.utc).isoformat()
     }
+
+# Métricas no formato texto do Prometheus (rotas, SQL por requisição e pools deste processo).
+# Sem JWT, como de costume para o scrape: proteja na rede/ingress
+@app.get('/metrics', include_in_schema=False)
+async def metricas():
+    return PlainTextResponse(exposicao_prometheus(), media_type='text/plain; version=0.0.4; charset=utf-8')
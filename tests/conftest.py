@@ -0,0 +1,84 @@
+import os
+
+# valores mínimos para instanciar o Config sem um .env (precisam vir antes de importar a app)
+os.environ.setdefault('API_PREFIX', '/api/v1')
+os.environ.setdefault('DATABASE_URL', 'sqlite+pysqlite:///:memory:')
+os.environ.setdefault('JWT_SEGREDO', 'segredo-de-teste')
+os.environ.setdefault('JWT_ALGORITMO', 'HS256')
+os.environ.setdefault('JWT_MINUTOS', '30')
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import NullPool
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from main import app
+from infra.database import Base, gera_sessao, gera_sessao_async, url_async
+from helpers.db_session import get_fabrica_sessao_async, get_fabrica_leitura_async
+from app.security.security_jwt import criar_jwt
+import infra.models.transacao  # noqa: F401  (registra as tabelas no metadata)
+import infra.models.parte  # noqa: F401
+import infra.models.comissao  # noqa: F401
+import infra.models.resumo_comissao  # noqa: F401
+import infra.models.resumo_pipeline  # noqa: F401
+import infra.models.token_revogado  # noqa: F401
+
+
+@pytest.fixture(scope='function')
+def engine_teste(tmp_path):
+    # arquivo em disco: várias conexões (e threads) enxergam o mesmo banco
+    engine = create_engine(f'sqlite+pysqlite:///{tmp_path / "teste.db"}')
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture(scope='function')
+def sessao_fabrica(engine_teste):
+    return sessionmaker(bind=engine_teste, autoflush=False, autocommit=False, expire_on_commit=False)
+
+@pytest.fixture(scope='function')
+def engine_async_teste(engine_teste):
+    # NullPool: o TestClient pode trocar de event loop entre requisições
+    engine = create_async_engine(url_async(str(engine_teste.url)), poolclass=NullPool)
+    yield engine
+    engine.sync_engine.dispose()
+
+@pytest.fixture(scope='function')
+def contador_sql(engine_teste, engine_async_teste):
+    # registra cada comando SQL enviado ao banco (sync e async)
+    comandos: list[str] = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        comandos.append(statement)
+
+    engines = (engine_teste, engine_async_teste.sync_engine)
+    for engine in engines:
+        event.listen(engine, 'before_cursor_execute', registrar)
+    yield comandos
+    for engine in engines:
+        event.remove(engine, 'before_cursor_execute', registrar)
+
+@pytest.fixture(scope='function')
+def cliente(sessao_fabrica, engine_async_teste):
+    sessao_async_fabrica = async_sessionmaker(bind=engine_async_teste, autoflush=False, expire_on_commit=False)
+
+    def sessao_teste():
+        db = sessao_fabrica()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def sessao_async_teste():
+        async with sessao_async_fabrica() as db:
+            yield db
+
+    app.dependency_overrides[gera_sessao] = sessao_teste
+    app.dependency_overrides[gera_sessao_async] = sessao_async_teste
+    app.dependency_overrides[get_fabrica_sessao_async] = lambda: sessao_async_fabrica
+    app.dependency_overrides[get_fabrica_leitura_async] = lambda: sessao_async_fabrica  # sem réplica: leitura no mesmo banco
+    token = criar_jwt(sub='teste', claims_extra={'jti': 'teste'})
+    yield TestClient(app, headers={'Authorization': f'Bearer {token}'})
+    app.dependency_overrides.clear()
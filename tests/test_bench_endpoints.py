@@ -0,0 +1,21 @@
+from benchmarks.bench_endpoints import comparar, estatisticas
+
+
+def resultado(p95: float, rps: float) -> dict:
+    return {'resultados': {'1000': {'listar_transacoes': {'p95_ms': p95, 'vazao_rps': rps}}}}
+
+
+def test_comparar_acusa_so_pioras_alem_da_tolerancia():
+    base = resultado(10.0, 100.0)
+    assert comparar(base, resultado(10.9, 91.0), 0.10) == []
+    assert comparar(base, resultado(5.0, 300.0), 0.10) == []  # melhora não é regressão
+    regressoes = comparar(base, resultado(11.5, 80.0), 0.10)
+    assert len(regressoes) == 2 and all('listar_transacoes' in r for r in regressoes)
+    # rota ou tamanho sem linha de base: nada a comparar
+    assert comparar(base, {'resultados': {'100000': {'listar_transacoes': {'p95_ms': 99, 'vazao_rps': 1}}}}, 0.10) == []
+
+
+def test_estatisticas_percentis():
+    m = estatisticas([float(i) for i in range(1, 101)], duracao_s=2.0)
+    assert m['requisicoes'] == 100 and m['vazao_rps'] == 50.0
+    assert (m['p50_ms'], m['p95_ms'], m['p99_ms']) == (50.5, 95.05, 99.01)
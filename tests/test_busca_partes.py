@@ -0,0 +1,53 @@
+import pytest
+
+URL = '/api/v1/partes'
+
+
+@pytest.fixture
+def partes(cliente) -> list[dict]:
+    tids = [cliente.post('/api/v1/transacoes', json={'imovel_codigo': f'IMO-{i}', 'valor_venda': '100.00'}).json()['id'] for i in range(3)]
+    corpo = [
+        {'transacao_id': tids[0], 'nome': 'Maria da Silva', 'cpf_cnpj': '11111111111', 'tipo': 'COMPRADOR'},
+        {'transacao_id': tids[1], 'nome': 'MARIA SOUZA', 'cpf_cnpj': '11111111111', 'tipo': 'VENDEDOR'},
+        {'transacao_id': tids[2], 'nome': 'João Silva', 'cpf_cnpj': '22222222222', 'tipo': 'CORRETOR'},
+        {'transacao_id': tids[2], 'nome': 'Imobiliária 100%', 'cpf_cnpj': '33333333000199', 'tipo': 'CORRETOR'},
+    ]
+    r = cliente.post('/api/v1/partes/lote', json=corpo)
+    assert r.status_code == 201, r.text
+    return r.json()
+
+
+def test_busca_por_cpf_e_por_trecho_do_nome(cliente, partes):
+    r = cliente.get(URL, params={'cpf_cnpj': '11111111111'})
+    assert r.status_code == 200, r.text
+    assert {p['nome'] for p in r.json()} == {'Maria da Silva', 'MARIA SOUZA'}
+    assert 'X-Next-Cursor' not in r.headers
+
+    assert {p['nome'] for p in cliente.get(URL, params={'nome': 'silva'}).json()} == {'Maria da Silva', 'João Silva'}
+    assert [p['nome'] for p in cliente.get(URL, params={'nome': 'silva', 'cpf_cnpj': '22222222222'}).json()] == ['João Silva']
+    # curingas do LIKE no termo são literais
+    assert [p['nome'] for p in cliente.get(URL, params={'nome': '00%'}).json()] == ['Imobiliária 100%']
+    assert cliente.get(URL, params={'nome': 'a_a'}).json() == []
+
+
+def test_paginacao_keyset_percorre_tudo_sem_repetir(cliente, partes):
+    vistos, cursor = [], None
+    while True:
+        r = cliente.get(URL, params={'cpf_cnpj': '11111111111', 'limit': 1, **({'cursor': cursor} if cursor else {})})
+        assert r.status_code == 200, r.text
+        vistos += [p['id'] for p in r.json()]
+        cursor = r.headers.get('X-Next-Cursor')
+        if not cursor:
+            break
+    assert sorted(vistos) == sorted(p['id'] for p in partes if p['cpf_cnpj'] == '11111111111')
+    assert len(vistos) == 2
+
+
+@pytest.mark.parametrize('params, codigo', [
+    ({}, 400),
+    ({'cpf_cnpj': '123'}, 422),
+    ({'nome': 'ab'}, 422),
+    ({'nome': 'maria', 'cursor': '***'}, 400),
+])
+def test_parametros_invalidos(cliente, params, codigo):
+    assert cliente.get(URL, params=params).status_code == codigo
@@ -0,0 +1,63 @@
+from uuid import UUID, uuid4
+
+from sqlalchemy import select
+
+from infra.models.transacao import Transacao as TransacaoORM
+from infra.repositories.transacao import TransacaoRepositorio
+
+URL = '/api/v1/transacoes/buscar-lote'
+
+
+def criar(cliente, n: int) -> list[str]:
+    return [
+        cliente.post('/api/v1/transacoes', json={'imovel_codigo': f'IMO-{i}', 'valor_venda': '100.00'}).json()['id']
+        for i in range(n)
+    ]
+
+
+def test_busca_em_uma_consulta_com_ausentes_na_ordem(cliente, contador_sql):
+    ids = criar(cliente, 5)
+    ausente = str(uuid4())
+    pedidos = [ids[3], ausente, ids[0], ids[3], ids[4]]
+
+    contador_sql.clear()
+    r = cliente.post(URL, json={'ids': pedidos})
+    assert r.status_code == 200, r.text
+    assert len(contador_sql) == 1, contador_sql
+    corpo = r.json()
+    assert [t['id'] for t in corpo['encontradas']] == [ids[3], ids[0], ids[4]]
+    assert corpo['nao_encontradas'] == [ausente]
+    assert 'partes' not in corpo['encontradas'][0]
+    assert 'set-cookie' not in r.headers  # só leitura: não fixa o primário
+
+
+def test_embute_relacoes(cliente, contador_sql):
+    tid, sem_partes = criar(cliente, 2)
+    cliente.post(f'/api/v1/transacoes/{tid}/partes', json={'nome': 'Ana', 'cpf_cnpj': '12345678901', 'tipo': 'COMPRADOR'})
+
+    contador_sql.clear()
+    r = cliente.post(URL, params={'incluir': 'partes,comissoes'}, json={'ids': [tid, sem_partes]})
+    assert r.status_code == 200, r.text
+    assert len(contador_sql) == 3, contador_sql
+    com, sem = r.json()['encontradas']
+    assert [p['nome'] for p in com['partes']] == ['Ana'] and com['comissoes'] == []
+    assert sem['partes'] == []
+
+
+def test_identity_map_evita_ida_ao_banco(sessao_fabrica, contador_sql, cliente):
+    ids = criar(cliente, 3)
+    with sessao_fabrica() as db:
+        repo = TransacaoRepositorio(db)
+        ja_carregada = db.scalars(select(TransacaoORM).limit(1)).one()
+        contador_sql.clear()
+        encontradas, faltando = repo.buscar_lote([ja_carregada.id])
+        assert encontradas == [ja_carregada] and faltando == [] and contador_sql == []
+
+        encontradas, _ = repo.buscar_lote([ja_carregada.id, *(UUID(i) for i in ids if UUID(i) != ja_carregada.id)])
+        assert encontradas[0] is ja_carregada and len(encontradas) == 3
+        assert len(contador_sql) == 1
+
+
+def test_limites_do_corpo(cliente):
+    assert cliente.post(URL, json={'ids': []}).status_code == 422
+    assert cliente.post(URL, json={'ids': [str(uuid4())] * 1001}).status_code == 422
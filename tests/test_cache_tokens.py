@@ -0,0 +1,94 @@
+import time
+
+import pytest
+
+from app.security.cache_tokens import CacheTokens, cache_tokens
+from app.security.security_jwt import criar_jwt
+
+HEALTH = '/api/v1/health'
+LISTAGEM = '/api/v1/transacoes'
+
+
+@pytest.fixture(autouse=True)
+def cache_limpo():
+    cache_tokens.limpar()
+    yield
+    cache_tokens.limpar()
+
+
+def cabecalho(token: str) -> dict:
+    return {'Authorization': f'Bearer {token}'}
+
+
+def test_segunda_requisicao_usa_o_cache(cliente):
+    token = criar_jwt('teste', {'jti': 'a1'})
+    assert cliente.get(LISTAGEM, headers=cabecalho(token)).status_code == 200
+    assert cliente.get(LISTAGEM, headers=cabecalho(token)).status_code == 200
+    stats = cliente.get('/api/v1/token/cache', headers=cabecalho(token)).json()
+    assert stats['falhas'] == 1
+    assert stats['acertos'] == 2
+    assert stats['itens'] == 1
+
+
+def test_token_invalido_nao_entra_no_cache(cliente):
+    token = criar_jwt('teste')[:-2] + 'xx'
+    for _ in range(2):
+        assert cliente.get(LISTAGEM, headers=cabecalho(token)).status_code == 401
+    assert cache_tokens.estatisticas()['itens'] == 0
+
+
+def test_revogar_derruba_token_em_cache(cliente):
+    token = criar_jwt('teste', {'jti': 'revogar-me'})
+    outro = criar_jwt('teste', {'jti': 'outro'})
+    assert cliente.get(LISTAGEM, headers=cabecalho(token)).status_code == 200
+
+    assert cliente.post('/api/v1/token/revogar', headers=cabecalho(token)).status_code == 204
+    r = cliente.get(LISTAGEM, headers=cabecalho(token))
+    assert r.status_code == 401
+    assert r.json()['detail']['mensagem'] == 'token revogado'
+    assert cliente.get(LISTAGEM, headers=cabecalho(outro)).status_code == 200
+
+
+def test_entrada_expira_no_exp_do_token():
+    cache = CacheTokens(max_itens=10)
+    cache.guardar('t', {'exp': time.time() - 1})
+    assert cache.obter('t') is None
+    cache.guardar('t', {'exp': time.time() + 60, 'sub': 's'})
+    assert cache.obter('t')['sub'] == 's'
+
+
+def test_cache_limitado_descarta_o_menos_usado():
+    cache = CacheTokens(max_itens=2)
+    exp = time.time() + 60
+    cache.guardar('a', {'exp': exp})
+    cache.guardar('b', {'exp': exp})
+    cache.obter('a')
+    cache.guardar('c', {'exp': exp})
+    assert cache.obter('b') is None
+    assert cache.obter('a') is not None and cache.obter('c') is not None
+
+
+def test_revogacao_vale_com_cache_desligado():
+    cache = CacheTokens(max_itens=0)
+    cache.revogar('x', time.time() + 60)
+    assert cache.revogado('x')
+    cache.guardar('t', {'exp': time.time() + 60})
+    assert cache.obter('t') is None
+
+
+def test_revogacao_vale_para_outro_worker(cliente):
+    # outro worker = outro processo: só enxerga a tabela token_revogado, não o cache deste
+    token = criar_jwt('teste', {'jti': 'em-outro-worker'})
+    assert cliente.get(LISTAGEM, headers=cabecalho(token)).status_code == 200
+    assert cliente.post('/api/v1/token/revogar', headers=cabecalho(token)).status_code == 204
+
+    cache_tokens.limpar()  # cache vazio, como num worker recém-iniciado ou após o TTL
+    r = cliente.get(LISTAGEM, headers=cabecalho(token))
+    assert r.status_code == 401
+    assert r.json()['detail']['mensagem'] == 'token revogado'
+
+
+def test_entrada_do_cache_vence_no_ttl():
+    cache = CacheTokens(max_itens=10, ttl=0)
+    cache.guardar('t', {'exp': time.time() + 60})
+    assert cache.obter('t') is None
@@ -0,0 +1,57 @@
+from uuid import uuid4
+
+URL = '/api/v1/comissoes/pagar-lote'
+
+
+def criar_transacao(cliente, valor='1000.00') -> str:
+    r = cliente.post('/api/v1/transacoes', json={'imovel_codigo': 'IMO-1', 'valor_venda': valor})
+    assert r.status_code == 201, r.text
+    return r.json()['id']
+
+
+def criar_comissao(cliente, transacao_id: str, percentual='0.05') -> str:
+    r = cliente.post(f'/api/v1/transacoes/{transacao_id}/comissoes', json={'percentual': percentual})
+    assert r.status_code == 201, r.text
+    return r.json()['id']
+
+
+def test_pagar_comissao_unitaria_marca_como_paga(cliente):
+    cid = criar_comissao(cliente, criar_transacao(cliente))
+    r = cliente.post(f'/api/v1/comissoes/{cid}/pagar')
+    assert r.status_code == 200, r.text
+    assert r.json()['paga'] is True
+
+
+def test_pagar_lote_por_ids_classifica_resultado(cliente):
+    tid = criar_transacao(cliente)
+    c1, c2, c3 = (criar_comissao(cliente, tid) for _ in range(3))
+    cliente.post(f'/api/v1/comissoes/{c3}/pagar')
+    inexistente = str(uuid4())
+
+    r = cliente.post(URL, json={'ids': [c1, inexistente, c2, c3]})
+    assert r.status_code == 200, r.text
+    corpo = r.json()
+    assert {c['id'] for c in corpo['pagas']} == {c1, c2}
+    assert all(c['paga'] for c in corpo['pagas'])
+    assert corpo['ja_pagas'] == [c3]
+    assert corpo['nao_encontradas'] == [inexistente]
+
+    # repetir não paga de novo
+    r = cliente.post(URL, json={'ids': [c1, c2]})
+    assert r.json()['pagas'] == []
+    assert r.json()['ja_pagas'] == [c1, c2]
+
+
+def test_pagar_lote_por_transacoes(cliente):
+    t1, t2, t3 = criar_transacao(cliente), criar_transacao(cliente), criar_transacao(cliente)
+    a, b = criar_comissao(cliente, t1), criar_comissao(cliente, t2)
+    criar_comissao(cliente, t3)
+
+    r = cliente.post(URL, json={'transacao_ids': [t1, t2]})
+    assert r.status_code == 200, r.text
+    assert {c['id'] for c in r.json()['pagas']} == {a, b}
+
+
+def test_pagar_lote_exige_uma_selecao(cliente):
+    assert cliente.post(URL, json={}).status_code == 422
+    assert cliente.post(URL, json={'ids': [str(uuid4())], 'transacao_ids': [str(uuid4())]}).status_code == 422
@@ -0,0 +1,126 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+from uuid import UUID
+
+import pytest
+
+from app.routers.transacao import erro_escrita_condicional
+from helpers.enums import StatusTransacao
+from infra.repositories.transacao import TransacaoRepositorio
+
+BASE = '/api/v1/transacoes'
+THREADS = 16
+
+
+def criar_transacao(cliente) -> dict:
+    r = cliente.post(BASE, json={'imovel_codigo': 'IMO-1', 'valor_venda': '1000.00'})
+    assert r.status_code == 201, r.text
+    return r.json()
+
+
+def adicionar_partes(cliente, tid: str, tipos=('COMPRADOR', 'VENDEDOR', 'CORRETOR')):
+    corpo = [{'nome': t.title(), 'cpf_cnpj': '12345678901', 'tipo': t} for t in tipos]
+    assert cliente.post(f'{BASE}/{tid}/partes/lote', json=corpo).status_code == 201
+
+
+def em_paralelo(funcao, n: int = THREADS) -> list:
+    # a barreira solta todas as threads juntas para maximizar a disputa
+    barreira = Barrier(n)
+
+    def rodar(_):
+        barreira.wait()
+        return funcao()
+
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        return list(pool.map(rodar, range(n)))
+
+
+def test_etag_acompanha_versao(cliente):
+    t = criar_transacao(cliente)
+    assert t['versao'] == 1
+
+    r = cliente.get(f"{BASE}/{t['id']}")
+    assert r.headers['ETag'] == '"1"'
+
+    r = cliente.patch(f"{BASE}/{t['id']}/status", json={'status': 'EM_ANALISE'}, headers={'If-Match': '"1"'})
+    assert r.status_code == 200, r.text
+    assert r.headers['ETag'] == '"2"' and r.json()['versao'] == 2
+
+
+@pytest.mark.parametrize('if_match', ['"7"', 'W/"1"', 'lixo'])
+def test_if_match_divergente_retorna_412(cliente, if_match):
+    t = criar_transacao(cliente)
+    r = cliente.put(f"{BASE}/{t['id']}", json={'imovel_codigo': 'X', 'valor_venda': '5.00'}, headers={'If-Match': if_match})
+    assert r.status_code == 412, r.text
+    assert cliente.get(f"{BASE}/{t['id']}").json()['imovel_codigo'] == 'IMO-1'
+
+
+def test_atualizar_sem_campos_tambem_confere_if_match(cliente, sessao_fabrica):
+    t = criar_transacao(cliente)
+    with sessao_fabrica() as db:
+        repo = TransacaoRepositorio(db)
+        assert repo.atualizar_tudo(UUID(t['id']), versoes={7}) is None  # a rota responde 412
+        obj = repo.atualizar_tudo(UUID(t['id']), versoes={1})
+        assert obj is not None and obj.versao == 1  # nada gravado: a versão não muda
+
+
+def test_if_match_asterisco_nao_restringe(cliente):
+    t = criar_transacao(cliente)
+    r = cliente.put(f"{BASE}/{t['id']}", json={'imovel_codigo': 'X', 'valor_venda': '5.00'}, headers={'If-Match': '*'})
+    assert r.status_code == 200, r.text
+
+
+def test_diagnostico_da_transicao_recusada(cliente):
+    t = criar_transacao(cliente)
+    url = f"{BASE}/{t['id']}/status"
+    assert cliente.patch(url, json={'status': 'FINALIZADA'}).json()['detail']['codigo'] == 'transicao_invalida'
+
+    cliente.patch(url, json={'status': 'EM_ANALISE'})
+    adicionar_partes(cliente, t['id'], tipos=('COMPRADOR', 'VENDEDOR'))
+    r = cliente.patch(url, json={'status': 'APROVADA'})
+    assert r.status_code == 422
+    assert r.json()['detail']['codigo'] == 'requisito_partes_nao_atendido'
+
+    adicionar_partes(cliente, t['id'], tipos=('CORRETOR',))
+    assert cliente.patch(url, json={'status': 'APROVADA'}).status_code == 200
+
+
+def test_partes_ja_presentes_na_releitura_viram_409(cliente, sessao_fabrica):
+    # o UPDATE condicional não casou, mas na releitura a linha já tem as partes exigidas
+    # (incluídas entre um e outro): é disputa, 409, e não o 422 de requisito
+    t = criar_transacao(cliente)
+    cliente.patch(f"{BASE}/{t['id']}/status", json={'status': 'EM_ANALISE'})
+    adicionar_partes(cliente, t['id'])
+
+    class Repo:
+        async def buscar(self, transacao_id):
+            with sessao_fabrica() as db:
+                return TransacaoRepositorio(db).buscar(transacao_id)
+
+    erro = asyncio.run(erro_escrita_condicional(Repo(), UUID(t['id']), None, StatusTransacao.APROVADA))
+    assert erro.status_code == 409
+
+
+def test_patch_concorrente_so_uma_transicao_vence(cliente):
+    t = criar_transacao(cliente)
+    url = f"{BASE}/{t['id']}/status"
+
+    codigos = em_paralelo(lambda: cliente.patch(url, json={'status': 'EM_ANALISE'}).status_code)
+
+    assert codigos.count(200) == 1, codigos
+    assert set(codigos) <= {200, 422}, codigos
+    assert cliente.get(f"{BASE}/{t['id']}").json()['versao'] == 2
+
+
+def test_put_concorrente_com_if_match_so_um_vence(cliente):
+    t = criar_transacao(cliente)
+    url = f"{BASE}/{t['id']}"
+
+    codigos = em_paralelo(
+        lambda: cliente.put(url, json={'imovel_codigo': 'X', 'valor_venda': '5.00'}, headers={'If-Match': '"1"'}).status_code
+    )
+
+    assert codigos.count(200) == 1, codigos
+    assert set(codigos) <= {200, 412}, codigos
+    assert cliente.get(url).json()['versao'] == 2
@@ -0,0 +1,67 @@
+import logging
+
+import pytest
+
+from infra import consultas_lentas
+from infra.consultas_lentas import RegistroConsultasLentas, forma_parametros, normalizar_sql, monitorar_consultas_lentas
+
+
+def test_normalizacao_agrupa_valores_e_tamanho_de_lote():
+    a = normalizar_sql("SELECT * FROM parte\n  WHERE cpf_cnpj = '12345678901' AND id IN (?, ?, ?) LIMIT 51")
+    b = normalizar_sql("SELECT * FROM parte WHERE cpf_cnpj = %(cpf_cnpj_1)s AND id IN (%(id_1_1)s, %(id_1_2)s) LIMIT $3")
+    assert a == b == 'SELECT * FROM parte WHERE cpf_cnpj = ? AND id IN (?, ...) LIMIT ?'
+    assert normalizar_sql('INSERT INTO t (a, b) VALUES (?, ?), (?, ?), (?, ?)') == 'INSERT INTO t (a, b) VALUES (?, ...), ...'
+    assert normalizar_sql('SELECT id::uuid FROM t WHERE x = :x') == 'SELECT id::uuid FROM t WHERE x = ?'
+
+
+def test_forma_dos_parametros_sem_valores():
+    assert forma_parametros({'cpf_cnpj_1': '12345678901', 'ids': [1, 2]}, False) == {'cpf_cnpj_1': 'str', 'ids': 'list[2]'}
+    assert forma_parametros([('12345678901', 1), ('98765432100', 2)], True) == {'linhas': 2, 'forma': ['str', 'int']}
+    assert forma_parametros({'cpf_cnpj__0': '12345678901'}, True) == {'cpf_cnpj__0': 'str'}
+
+
+def test_top_n_guarda_as_mais_lentas():
+    registro = RegistroConsultasLentas(limiar_ms=0, max_itens=2)
+    for sql, ms in (('SELECT 1', 5), ('SELECT a FROM t', 1), ('SELECT b FROM t', 9), ('SELECT c FROM t', 0.5)):
+        registro.registrar(sql, (), False, ms)
+    registro.registrar('SELECT 2', (), False, 3)  # mesma impressão de SELECT 1
+    retrato = registro.retrato()
+    assert [item['sql'] for item in retrato] == ['SELECT b FROM t', 'SELECT ?']
+    assert retrato[1]['qtd'] == 2 and retrato[1]['max_ms'] == 5 and retrato[1]['media_ms'] == 4
+
+
+@pytest.fixture
+def registro_ativo(engine_teste, engine_async_teste, monkeypatch):
+    registro = RegistroConsultasLentas(limiar_ms=0, max_itens=50)
+    for engine in (engine_teste, engine_async_teste.sync_engine):
+        monitorar_consultas_lentas(engine, registro)
+    monkeypatch.setattr(consultas_lentas, 'registro_consultas_lentas', registro)
+    return registro
+
+
+def test_log_e_endpoint_com_rota_e_request_id(cliente, registro_ativo, caplog):
+    with caplog.at_level(logging.WARNING, logger='consultas_lentas'):
+        r = cliente.get('/api/v1/partes', params={'cpf_cnpj': '12345678901'}, headers={'X-Request-ID': 'req-123'})
+    assert r.status_code == 200 and r.headers['x-request-id'] == 'req-123'
+
+    registros = [reg for reg in caplog.records if reg.name == 'consultas_lentas' and 'FROM parte' in reg.sql]
+    assert registros
+    reg = registros[0]
+    assert reg.request_id == 'req-123' and reg.rota == 'GET /api/v1/partes'
+    assert 'FROM parte' in reg.sql and '12345678901' not in reg.sql
+    assert '12345678901' not in str(reg.parametros)
+
+    corpo = cliente.get('/api/v1/interno/consultas-lentas').json()
+    assert corpo['ativo'] and corpo['limiar_ms'] == 0
+    assert any(c['rota'] == 'GET /api/v1/partes' and c['request_id'] == 'req-123' for c in corpo['consultas'])
+
+
+def test_endpoint_sem_limiar_configurado(cliente, monkeypatch):
+    monkeypatch.setattr(consultas_lentas, 'registro_consultas_lentas', None)
+    assert cliente.get('/api/v1/interno/consultas-lentas').json() == {'ativo': False, 'limiar_ms': None, 'consultas': []}
+
+
+def test_request_id_gerado_quando_ausente_ou_invalido(cliente):
+    assert len(cliente.get('/api/v1/health').headers['x-request-id']) == 32
+    r = cliente.get('/api/v1/health', headers={'X-Request-ID': 'a b\n<script>'})
+    assert r.headers['x-request-id'] != 'a b\n<script>'
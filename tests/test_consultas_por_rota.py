@@ -0,0 +1,77 @@
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+
+
+@pytest.fixture(autouse=True)
+def token_em_cache(cliente):
+    # o token fora do cache custa uma consulta a token_revogado: fora da contagem das rotas
+    assert cliente.get('/api/v1/token/cache').status_code == 200
+
+
+@pytest.fixture
+def transacao_id(cliente) -> str:
+    r = cliente.post('/api/v1/transacoes', json={'imovel_codigo': 'IMO-1', 'valor_venda': '1000.00'})
+    assert r.status_code == 201, r.text
+    return r.json()['id']
+
+
+def executar(cliente, contador_sql, metodo: str, url: str, **kwargs):
+    contador_sql.clear()
+    r = cliente.request(metodo, url, **kwargs)
+    return r, list(contador_sql)
+
+
+# cada escrita é INSERT/UPDATE/DELETE ... RETURNING, sem SELECT de conferência;
+# escritas em parte levam mais um UPDATE dos contadores da transação; as que mudam
+# contagens ou valores dos relatórios, um INSERT ... ON CONFLICT por tabela de resumo
+@pytest.mark.parametrize('metodo, url, corpo, esperado, qtd_comandos', [
+    ('POST', '/api/v1/transacoes', {'imovel_codigo': 'X', 'valor_venda': '10.00'}, 201, 2),
+    ('PUT', '/api/v1/transacoes/{tid}', {'imovel_codigo': 'Y', 'valor_venda': '20.00'}, 200, 2),
+    ('POST', '/api/v1/transacoes/{tid}/partes', {'nome': 'Ana', 'cpf_cnpj': '12345678901', 'tipo': 'COMPRADOR'}, 201, 2),
+    ('POST', '/api/v1/transacoes/{tid}/partes/lote', [{'nome': 'Ana', 'cpf_cnpj': '12345678901', 'tipo': 'COMPRADOR'}] * 3, 201, 2),
+    ('POST', '/api/v1/transacoes/{tid}/comissoes', {'percentual': '0.05'}, 201, 2),
+    ('DELETE', '/api/v1/transacoes/{tid}', None, 204, 3),
+])
+def test_escrita_em_poucos_comandos(cliente, contador_sql, transacao_id, metodo, url, corpo, esperado, qtd_comandos):
+    r, comandos = executar(cliente, contador_sql, metodo, url.format(tid=transacao_id), json=corpo)
+    assert r.status_code == esperado, r.text
+    assert len(comandos) == qtd_comandos, comandos
+
+
+def test_pagar_comissao_e_deletar_parte(cliente, contador_sql, transacao_id):
+    cid = cliente.post(f'/api/v1/transacoes/{transacao_id}/comissoes', json={'percentual': '0.05'}).json()['id']
+    r, comandos = executar(cliente, contador_sql, 'POST', f'/api/v1/comissoes/{cid}/pagar')
+    assert r.status_code == 200 and r.json()['paga'] is True
+    assert len(comandos) == 3, comandos  # UPDATE + sai de pendente + entra em paga
+
+    pid = cliente.post(f'/api/v1/transacoes/{transacao_id}/partes',
+                       json={'nome': 'Ana', 'cpf_cnpj': '12345678901', 'tipo': 'COMPRADOR'}).json()['id']
+    r, comandos = executar(cliente, contador_sql, 'DELETE', f'/api/v1/partes/{pid}')
+    assert r.status_code == 204
+    assert len(comandos) == 2, comandos
+
+
+# o DELETE tira transação e comissões dos resumos antes (o agregado vazio não grava nada)
+@pytest.mark.parametrize('metodo, url, corpo, qtd_comandos', [
+    ('POST', '/api/v1/transacoes/{tid}/partes', {'nome': 'Ana', 'cpf_cnpj': '12345678901', 'tipo': 'COMPRADOR'}, 1),
+    ('POST', '/api/v1/transacoes/{tid}/comissoes', {'percentual': '0.05'}, 1),
+    ('PUT', '/api/v1/transacoes/{tid}', {'imovel_codigo': 'Y', 'valor_venda': '20.00'}, 1),
+    ('DELETE', '/api/v1/transacoes/{tid}', None, 3),
+])
+def test_transacao_inexistente_vira_404(cliente, contador_sql, metodo, url, corpo, qtd_comandos):
+    r, comandos = executar(cliente, contador_sql, metodo, url.format(tid=uuid4()), json=corpo)
+    assert r.status_code == 404, r.text
+    assert r.json()['detail']['codigo'] == 'transacao_nao_encontrada'
+    assert len(comandos) == qtd_comandos, comandos
+
+
+def test_deletar_transacao_remove_partes_e_comissoes_em_cascata(cliente, transacao_id, sessao_fabrica):
+    cliente.post(f'/api/v1/transacoes/{transacao_id}/partes', json={'nome': 'Ana', 'cpf_cnpj': '12345678901', 'tipo': 'COMPRADOR'})
+    cliente.post(f'/api/v1/transacoes/{transacao_id}/comissoes', json={'percentual': '0.05'})
+    assert cliente.delete(f'/api/v1/transacoes/{transacao_id}').status_code == 204
+
+    with sessao_fabrica() as db:
+        assert db.execute(text('SELECT count(*) FROM parte')).scalar_one() == 0
+        assert db.execute(text('SELECT count(*) FROM comissao')).scalar_one() == 0
@@ -0,0 +1,79 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import func, select
+
+from infra.models.parte import Parte as ParteORM
+from infra.models.transacao import Transacao as TransacaoORM, QTD_POR_TIPO
+
+BASE = '/api/v1/transacoes'
+
+
+def criar_transacao(cliente) -> str:
+    r = cliente.post(BASE, json={'imovel_codigo': 'IMO-1', 'valor_venda': '1000.00'})
+    assert r.status_code == 201, r.text
+    return r.json()['id']
+
+
+def parte(tipo: str, **extra) -> dict:
+    return {'nome': tipo.title(), 'cpf_cnpj': '12345678901', 'tipo': tipo, **extra}
+
+
+def contadores(cliente, tid: str) -> tuple[int, int, int]:
+    t = cliente.get(f'{BASE}/{tid}').json()
+    return t['qtd_compradores'], t['qtd_vendedores'], t['qtd_corretores']
+
+
+def conferir_com_tabela_parte(sessao_fabrica):
+    # contadores batem com a agregação real em todas as transações
+    with sessao_fabrica() as db:
+        reais = {
+            (tid, tipo): n
+            for tid, tipo, n in db.execute(
+                select(ParteORM.transacao_id, ParteORM.tipo, func.count()).group_by(ParteORM.transacao_id, ParteORM.tipo)
+            )
+        }
+        for t in db.scalars(select(TransacaoORM)):
+            for tipo, coluna in QTD_POR_TIPO.items():
+                assert getattr(t, coluna.key) == reais.get((t.id, tipo), 0), (t.id, tipo)
+
+
+def test_contadores_acompanham_insercao_lote_e_remocao(cliente, sessao_fabrica):
+    t1, t2 = criar_transacao(cliente), criar_transacao(cliente)
+    assert contadores(cliente, t1) == (0, 0, 0)
+
+    pid = cliente.post(f'{BASE}/{t1}/partes', json=parte('COMPRADOR')).json()['id']
+    cliente.post(f'{BASE}/{t1}/partes/lote', json=[parte('VENDEDOR'), parte('VENDEDOR'), parte('CORRETOR')])
+    r = cliente.post('/api/v1/partes/lote', json=[
+        parte('COMPRADOR', transacao_id=t1), parte('CORRETOR', transacao_id=t2), parte('CORRETOR', transacao_id=t2),
+    ])
+    assert r.status_code == 201, r.text
+    assert contadores(cliente, t1) == (2, 2, 1)
+    assert contadores(cliente, t2) == (0, 0, 2)
+
+    assert cliente.delete(f'/api/v1/partes/{pid}').status_code == 204
+    assert contadores(cliente, t1) == (1, 2, 1)
+    conferir_com_tabela_parte(sessao_fabrica)
+
+
+def test_lote_rejeitado_nao_altera_contadores(cliente):
+    tid = criar_transacao(cliente)
+    r = cliente.post('/api/v1/partes/lote', json=[
+        parte('COMPRADOR', transacao_id=tid), parte('COMPRADOR', transacao_id='00000000-0000-0000-0000-000000000000'),
+    ])
+    assert r.status_code == 404, r.text
+    assert contadores(cliente, tid) == (0, 0, 0)
+
+
+def test_alterar_partes_avanca_a_versao(cliente):
+    tid = criar_transacao(cliente)
+    cliente.post(f'{BASE}/{tid}/partes', json=parte('COMPRADOR'))
+    assert cliente.get(f'{BASE}/{tid}').headers['ETag'] == '"2"'
+
+
+def test_insercoes_concorrentes_nao_perdem_incremento(cliente, sessao_fabrica):
+    tid = criar_transacao(cliente)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        codigos = list(pool.map(lambda _: cliente.post(f'{BASE}/{tid}/partes', json=parte('CORRETOR')).status_code, range(24)))
+    assert codigos == [201] * 24
+    assert contadores(cliente, tid) == (0, 0, 24)
+    conferir_com_tabela_parte(sessao_fabrica)
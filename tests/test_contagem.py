@@ -0,0 +1,55 @@
+import pytest
+
+from infra.cache_contagem import CacheContagem, cache_contagem
+
+URL = '/api/v1/transacoes'
+
+
+@pytest.fixture(autouse=True)
+def cache_limpo():
+    cache_contagem.invalidar()
+    yield
+    cache_contagem.invalidar()
+
+
+def criar(cliente, imovel_codigo='IMO-1'):
+    r = cliente.post(URL, json={'imovel_codigo': imovel_codigo, 'valor_venda': '100.00'})
+    assert r.status_code == 201, r.text
+
+
+def contar(cliente, **params):
+    r = cliente.get(URL, params={'limit': 1, **params})
+    assert r.status_code == 200, r.text
+    return int(r.headers['X-Total-Count']), r.headers['X-Total-Count-Precision']
+
+
+def test_contagem_exata_por_padrao(cliente):
+    criar(cliente)
+    criar(cliente)
+    assert contar(cliente) == (2, 'exata')
+
+
+def test_contagem_cache_reaproveita_e_invalida_na_escrita(cliente):
+    criar(cliente, 'A')
+    assert contar(cliente, contagem='cache', imovel_codigo='A') == (1, 'exata')  # miss: conta de verdade
+    assert contar(cliente, contagem='cache', imovel_codigo='A') == (1, 'cache')
+    # filtro diferente é outra chave
+    assert contar(cliente, contagem='cache', imovel_codigo='B') == (0, 'exata')
+
+    criar(cliente, 'A')
+    assert contar(cliente, contagem='cache', imovel_codigo='A') == (2, 'exata')
+
+
+def test_contagem_estimada_cai_para_exata_fora_do_postgres(cliente):
+    criar(cliente)
+    assert contar(cliente, contagem='estimada') == (1, 'exata')
+
+
+def test_cache_expira_pelo_ttl(monkeypatch):
+    agora = [1000.0]
+    monkeypatch.setattr('infra.cache_contagem.time.monotonic', lambda: agora[0])
+    cache = CacheContagem(ttl=10)
+    cache.guardar(('x',), 5)
+    assert cache.obter(('x',)) == 5
+    agora[0] += 10
+    assert cache.obter(('x',)) is None
@@ -0,0 +1,63 @@
+BASE = '/api/v1/transacoes'
+
+
+def criar_transacao(cliente, codigo='IMO-1') -> str:
+    r = cliente.post(BASE, json={'imovel_codigo': codigo, 'valor_venda': '1000.00'})
+    assert r.status_code == 201, r.text
+    return r.json()['id']
+
+
+def test_obter_revalida_com_304_lendo_so_a_versao(cliente, contador_sql):
+    tid = criar_transacao(cliente)
+    etag = cliente.get(f'{BASE}/{tid}').headers['ETag']
+
+    contador_sql.clear()
+    r = cliente.get(f'{BASE}/{tid}', headers={'If-None-Match': etag})
+    assert r.status_code == 304
+    assert r.headers['ETag'] == etag and r.content == b''
+    assert len(contador_sql) == 1 and 'imovel_codigo' not in contador_sql[0], contador_sql
+
+    # fraca também casa no If-None-Match
+    assert cliente.get(f'{BASE}/{tid}', headers={'If-None-Match': f'W/{etag}'}).status_code == 304
+
+    cliente.put(f'{BASE}/{tid}', json={'imovel_codigo': 'NOVO', 'valor_venda': '5.00'})
+    r = cliente.get(f'{BASE}/{tid}', headers={'If-None-Match': etag})
+    assert r.status_code == 200
+    assert r.headers['ETag'] != etag and r.json()['imovel_codigo'] == 'NOVO'
+
+
+def test_obter_inexistente_com_if_none_match_e_404(cliente):
+    r = cliente.get(f'{BASE}/00000000-0000-0000-0000-000000000000', headers={'If-None-Match': '"1"'})
+    assert r.status_code == 404
+
+
+def test_listagem_revalida_com_304_sem_carregar_linhas(cliente, contador_sql):
+    for _ in range(3):
+        criar_transacao(cliente)
+    r = cliente.get(BASE, params={'limit': 2})
+    etag = r.headers['ETag']
+
+    contador_sql.clear()
+    r = cliente.get(BASE, params={'limit': 2}, headers={'If-None-Match': etag})
+    assert r.status_code == 304 and r.content == b''
+    assert r.headers['X-Total-Count'] == '3' and 'X-Next-Cursor' in r.headers
+    assert not any('imovel_codigo' in sql for sql in contador_sql), contador_sql
+
+
+def test_etag_da_listagem_muda_com_escrita_e_com_parametros(cliente):
+    tid = criar_transacao(cliente)
+    etag = cliente.get(BASE).headers['ETag']
+
+    assert cliente.get(BASE, params={'limit': 10}).headers['ETag'] != etag
+    assert cliente.get(BASE, params={'status': 'CRIADA'}).headers['ETag'] != etag
+
+    # alteração de item da página
+    cliente.patch(f'{BASE}/{tid}/status', json={'status': 'EM_ANALISE'})
+    r = cliente.get(BASE, headers={'If-None-Match': etag})
+    assert r.status_code == 200
+    etag = r.headers['ETag']
+
+    # inclusão no conjunto filtrado
+    criar_transacao(cliente)
+    r = cliente.get(BASE, headers={'If-None-Match': etag})
+    assert r.status_code == 200 and len(r.json()) == 2
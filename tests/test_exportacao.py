@@ -0,0 +1,61 @@
+import csv
+import io
+import json
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from core.config import settings
+from infra.models.transacao import Transacao as TransacaoORM
+from infra.models.parte import Parte as ParteORM
+from infra.models.comissao import Comissao as ComissaoORM
+from helpers.enums import StatusTransacao, TipoParte
+
+URL = '/api/v1/transacoes/exportar'
+
+
+@pytest.fixture
+def dados(sessao_fabrica, monkeypatch):
+    # lote pequeno para atravessar várias partições do cursor
+    monkeypatch.setattr(settings, 'EXPORTACAO_LOTE', 2)
+    with sessao_fabrica() as db:
+        transacoes = [
+            TransacaoORM(id=uuid4(), imovel_codigo=f'IMO-{i}', valor_venda=Decimal('1000.00'),
+                         status=StatusTransacao.CANCELADA if i == 0 else StatusTransacao.CRIADA)
+            for i in range(5)
+        ]
+        db.add_all(transacoes)
+        db.flush()
+        db.add(ParteORM(transacao_id=transacoes[1].id, nome='Ana', cpf_cnpj='12345678901', tipo=TipoParte.COMPRADOR))
+        db.add(ComissaoORM(transacao_id=transacoes[1].id, percentual=Decimal('0.05'), valor_calculado=Decimal('50.00')))
+        db.commit()
+        return [t.id for t in transacoes]
+
+
+def test_exporta_ndjson_com_partes_e_comissoes(cliente, dados):
+    r = cliente.get(URL, params={'incluir': 'partes,comissoes'})
+    assert r.status_code == 200, r.text
+    assert r.headers['content-type'].startswith('application/x-ndjson')
+
+    registros = [json.loads(linha) for linha in r.text.splitlines()]
+    assert {reg['id'] for reg in registros} == {str(i) for i in dados}
+
+    com_relacoes = next(reg for reg in registros if reg['id'] == str(dados[1]))
+    assert [p['nome'] for p in com_relacoes['partes']] == ['Ana']
+    assert com_relacoes['comissoes'][0]['valor_calculado'] == '50.00'
+    assert all(reg['partes'] == [] for reg in registros if reg['id'] != str(dados[1]))
+
+
+def test_exporta_csv_com_filtro(cliente, dados):
+    r = cliente.get(URL, params={'formato': 'csv', 'status': 'CRIADA'})
+    assert r.status_code == 200, r.text
+    linhas = list(csv.DictReader(io.StringIO(r.text)))
+    assert len(linhas) == 4
+    assert 'partes' not in linhas[0]
+    assert {linha['status'] for linha in linhas} == {'CRIADA'}
+
+
+def test_exportacao_valida_parametros(cliente):
+    assert cliente.get(URL, params={'formato': 'xml'}).status_code == 422
+    assert cliente.get(URL, params={'incluir': 'vizinhos'}).status_code == 400
@@ -0,0 +1,98 @@
+import pytest
+
+from core.config import settings
+
+URL = '/api/v1/transacoes/importar'
+
+
+@pytest.fixture
+def lote_pequeno(monkeypatch):
+    monkeypatch.setattr(settings, 'IMPORTACAO_LOTE', 2)
+    monkeypatch.setattr(settings, 'IMPORTACAO_MAX_ERROS', 1)
+
+
+def total(cliente) -> int:
+    return int(cliente.get('/api/v1/transacoes', params={'limit': 1}).headers['X-Total-Count'])
+
+
+def test_importa_csv_em_lotes_com_erros_por_linha(cliente, lote_pequeno):
+    corpo = '\r\n'.join([
+        'imovel_codigo,valor_venda',
+        'A,100.00',
+        'B,-5',           # valor inválido
+        'C,200.50',
+        '',
+        'D,300',
+        'E',              # colunas faltando
+        'F,10.00',
+    ])
+    # gerador: o corpo chega em pedaços que cortam linhas ao meio
+    pedacos = (corpo[i:i + 7].encode() for i in range(0, len(corpo), 7))
+    r = cliente.post(URL, content=pedacos, headers={'Content-Type': 'text/csv'})
+    assert r.status_code == 200, r.text
+
+    resumo = r.json()
+    assert resumo['total_linhas'] == 6
+    assert resumo['importadas'] == 4
+    assert resumo['rejeitadas'] == 2
+    assert [e['linha'] for e in resumo['erros']] == [3]  # limite de erros listados = 1
+    assert resumo['erros_omitidos'] == 1
+    assert total(cliente) == 4
+
+
+def test_importa_ndjson_forca_status_criada(cliente):
+    corpo = '\n'.join([
+        '{"imovel_codigo": "N1", "valor_venda": 150.25, "status": "APROVADA"}',
+        'isto não é json',
+        '[1, 2]',
+    ])
+    r = cliente.post(URL, content=corpo, headers={'Content-Type': 'application/x-ndjson'})
+    assert r.status_code == 200, r.text
+    assert r.json()['importadas'] == 1
+    assert r.json()['rejeitadas'] == 2
+
+    item = cliente.get('/api/v1/transacoes', params={'imovel_codigo': 'N1'}).json()[0]
+    assert item['status'] == 'CRIADA'
+    assert item['valor_venda'] == '150.25'
+
+
+def test_importacao_rejeita_tipo_de_conteudo(cliente):
+    r = cliente.post(URL, content='{}', headers={'Content-Type': 'application/json'})
+    assert r.status_code == 415
+
+
+def test_csv_com_quebra_de_linha_entre_aspas(cliente):
+    corpo = 'imovel_codigo,valor_venda\r\n"Q\r\n1",100.00\r\n"Q""2",200\r\n'
+    pedacos = (corpo[i:i + 3].encode() for i in range(0, len(corpo), 3))
+    r = cliente.post(URL, content=pedacos, headers={'Content-Type': 'text/csv'})
+    assert r.status_code == 200, r.text
+    assert r.json()['importadas'] == 2 and r.json()['rejeitadas'] == 0
+    codigos = sorted(t['imovel_codigo'] for t in cliente.get('/api/v1/transacoes').json())
+    assert codigos == ['Q\n1', 'Q"2']
+
+
+def test_linha_grande_demais_vira_erro_da_linha(cliente, monkeypatch):
+    monkeypatch.setattr(settings, 'IMPORTACAO_MAX_LINHA', 50)
+    monkeypatch.setattr(settings, 'IMPORTACAO_MAX_ERROS', 1)
+    linhas = [
+        'imovel_codigo,valor_venda', 'A,1.00',
+        '"X' + 'x' * 500 + ',1.00',  # linha longa que abre aspas...
+        'fecha",1.00',               # ...fechadas aqui: o registro inteiro é rejeitado
+        '"B', 'y' * 40, 'y' * 40, 'fim",1.00',  # linhas curtas, registro longo
+        'C,2.00',
+    ]
+    corpo = '\n'.join(linhas)
+    pedacos = (corpo[i:i + 16].encode() for i in range(0, len(corpo), 16))
+    r = cliente.post(URL, content=pedacos, headers={'Content-Type': 'text/csv'})
+    resumo = r.json()
+    assert resumo['importadas'] == 2
+    assert resumo['rejeitadas'] == 2
+    assert [(e['linha'], e['erros']) for e in resumo['erros']] == [(3, ['linha maior que 50 caracteres'])]
+
+
+def test_ndjson_sem_quebra_de_linha_nao_acumula(cliente, monkeypatch):
+    monkeypatch.setattr(settings, 'IMPORTACAO_MAX_LINHA', 100)
+    pedacos = (b'{"a": "' + b'x' * 1000 for _ in range(50))
+    r = cliente.post(URL, content=pedacos, headers={'Content-Type': 'application/x-ndjson'})
+    assert r.json()['rejeitadas'] == 1
+    assert r.json()['erros'][0]['erros'] == ['linha maior que 100 caracteres']
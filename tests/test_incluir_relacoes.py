@@ -0,0 +1,56 @@
+import pytest
+
+BASE = '/api/v1/transacoes'
+
+
+def criar_completa(cliente, i: int) -> str:
+    tid = cliente.post(BASE, json={'imovel_codigo': f'IMO-{i}', 'valor_venda': '1000.00'}).json()['id']
+    corpo = [{'nome': f'Parte {i}-{tipo}', 'cpf_cnpj': '12345678901', 'tipo': tipo} for tipo in ('COMPRADOR', 'VENDEDOR')]
+    assert cliente.post(f'{BASE}/{tid}/partes/lote', json=corpo).status_code == 201
+    assert cliente.post(f'{BASE}/{tid}/comissoes', json={'percentual': '0.05'}).status_code == 201
+    return tid
+
+
+def comandos_da_listagem(cliente, contador_sql, limit: int) -> int:
+    contador_sql.clear()
+    r = cliente.get(BASE, params={'limit': limit, 'incluir': 'partes,comissoes'})
+    assert r.status_code == 200, r.text
+    assert len(r.json()) == limit
+    return len(contador_sql)
+
+
+def test_listagem_embute_relacoes_com_consultas_constantes(cliente, contador_sql):
+    for i in range(12):
+        criar_completa(cliente, i)
+
+    # contagem + página + uma consulta por relação, qualquer que seja o tamanho da página
+    assert comandos_da_listagem(cliente, contador_sql, 2) == comandos_da_listagem(cliente, contador_sql, 12) == 4
+
+    item = cliente.get(BASE, params={'limit': 1, 'incluir': 'partes'}).json()[0]
+    assert {p['tipo'] for p in item['partes']} == {'COMPRADOR', 'VENDEDOR'}
+    assert all(p['transacao_id'] == item['id'] for p in item['partes'])
+    assert 'comissoes' not in item
+    assert 'partes' not in cliente.get(BASE, params={'limit': 1}).json()[0]
+
+
+def test_obter_embute_relacoes_e_etag_muda_ao_pagar_comissao(cliente):
+    tid = criar_completa(cliente, 0)
+    url = f'{BASE}/{tid}'
+    r = cliente.get(url, params={'incluir': 'comissoes,partes'})
+    assert r.status_code == 200, r.text
+    corpo = r.json()
+    assert len(corpo['partes']) == 2 and corpo['comissoes'][0]['paga'] is False
+
+    etag = r.headers['ETag']
+    assert etag != cliente.get(url).headers['ETag']  # representação diferente, ETag diferente
+    assert cliente.get(url, params={'incluir': 'comissoes,partes'}, headers={'If-None-Match': etag}).status_code == 304
+
+    # pagar não muda a versão da transação, mas muda o conteúdo embutido
+    assert cliente.post(f"/api/v1/comissoes/{corpo['comissoes'][0]['id']}/pagar").status_code == 200
+    r = cliente.get(url, params={'incluir': 'comissoes,partes'}, headers={'If-None-Match': etag})
+    assert r.status_code == 200 and r.json()['comissoes'][0]['paga'] is True
+
+
+@pytest.mark.parametrize('url', [BASE, f'{BASE}/00000000-0000-0000-0000-000000000000'])
+def test_incluir_invalido(cliente, url):
+    assert cliente.get(url, params={'incluir': 'partes,avaliacoes'}).status_code == 400
@@ -0,0 +1,74 @@
+import logging
+import queue
+
+import orjson
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.middleware.contexto import IdRequisicao
+from app.security.security_jwt import criar_jwt, validar_jwt
+from core.logs import FilaDescartando, FiltroContexto, FormatadorJson
+from helpers.db_session import get_repo_token_revogado_async
+
+
+def logger_com_fila(nome: str, maximo: int = 0) -> tuple[logging.Logger, FilaDescartando]:
+    fila = FilaDescartando(queue.Queue(maxsize=maximo))
+    fila.addFilter(FiltroContexto())
+    logger = logging.getLogger(nome)
+    logger.handlers[:] = [fila]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger, fila
+
+
+def linhas(fila: FilaDescartando) -> list[dict]:
+    formatador = FormatadorJson()
+    saida = []
+    while not fila.queue.empty():
+        saida.append(orjson.loads(formatador.format(fila.queue.get_nowait())))
+    return saida
+
+
+def test_fila_cheia_descarta_e_conta():
+    logger, fila = logger_com_fila('teste.fila', maximo=2)
+    for i in range(5):
+        logger.info('linha %s', i)
+    assert fila.descartados == 3
+    assert [l['msg'] for l in linhas(fila)] == ['linha 0', 'linha 1']
+
+
+def test_json_com_contexto_da_requisicao_e_extras():
+    logger, fila = logger_com_fila('teste.rota')
+    app = FastAPI()
+    app.add_middleware(IdRequisicao)
+
+    class NenhumRevogado:
+        async def revogado(self, jti):
+            return False
+
+    app.dependency_overrides[get_repo_token_revogado_async] = NenhumRevogado
+
+    @app.get('/itens/{item_id}', dependencies=[Depends(validar_jwt)])
+    async def item(item_id: int):
+        logger.info('lendo', extra={'item_id': item_id})
+        return {}
+
+    token = criar_jwt(sub='ana', claims_extra={'jti': 'j-1'})
+    r = TestClient(app).get('/itens/7', headers={'Authorization': f'Bearer {token}', 'X-Request-ID': 'req-9'})
+    assert r.status_code == 200
+
+    [linha] = linhas(fila)
+    assert linha['msg'] == 'lendo' and linha['nivel'] == 'INFO' and linha['logger'] == 'teste.rota'
+    assert linha['item_id'] == 7
+    assert linha['request_id'] == 'req-9' and linha['rota'] == 'GET /itens/{item_id}'
+    assert linha['sub'] == 'ana' and linha['jti'] == 'j-1'
+
+
+def test_excecao_vai_como_texto():
+    logger, fila = logger_com_fila('teste.exc')
+    try:
+        raise ValueError('falhou')
+    except ValueError:
+        logger.exception('erro')
+    [linha] = linhas(fila)
+    assert 'ValueError: falhou' in linha['exc'] and 'request_id' not in linha
@@ -0,0 +1,45 @@
+from main import app
+from app.middleware.metricas import ROTA_DESCONHECIDA
+from infra.metricas import metricas_http
+
+
+def amostras(texto: str) -> dict[str, float]:
+    # linhas "nome{rotulos} valor" -> {"nome{rotulos}": valor}
+    return {
+        linha.rsplit(' ', 1)[0]: float(linha.rsplit(' ', 1)[1])
+        for linha in texto.splitlines() if linha and not linha.startswith('#')
+    }
+
+
+def test_metricas_por_template_de_rota(cliente, contador_sql):
+    metricas_http.limpar()
+    tid = cliente.post('/api/v1/transacoes', json={'imovel_codigo': 'IMO-1', 'valor_venda': '100.00'}).json()['id']
+    contador_sql.clear()
+    assert cliente.get(f'/api/v1/transacoes/{tid}').status_code == 200
+    sql_do_get = len(contador_sql)
+    assert cliente.get('/api/v1/transacoes/00000000-0000-0000-0000-000000000000').status_code == 404
+
+    r = cliente.get('/metrics')
+    assert r.status_code == 200
+    assert r.headers['content-type'].startswith('text/plain; version=0.0.4')
+    m = amostras(r.text)
+
+    rota = 'metodo="GET",rota="/api/v1/transacoes/{transacao_id}"'
+    assert m[f'http_requisicoes_total{{{rota},status="200"}}'] == 1
+    assert m[f'http_requisicoes_total{{{rota},status="404"}}'] == 1
+    assert m[f'http_requisicao_duracao_segundos_count{{{rota}}}'] == 2
+    assert m[f'http_requisicao_duracao_segundos_bucket{{{rota},le="+Inf"}}'] == 2
+    assert m[f'http_requisicoes_total{{metodo="POST",rota="/api/v1/transacoes",status="201"}}'] == 1
+    # comandos contados pelos eventos do engine, inclusive no engine async
+    assert sql_do_get > 0
+    assert m[f'http_sql_comandos_por_requisicao_sum{{{rota}}}'] >= sql_do_get
+    assert m[f'http_sql_segundos_total{{{rota}}}'] > 0
+
+
+def test_caminho_sem_rota_tem_rotulo_fixo(cliente):
+    metricas_http.limpar()
+    cliente.get('/nao/existe/1')
+    cliente.get('/nao/existe/2')
+    m = amostras(cliente.get('/metrics').text)
+    assert m[f'http_requisicoes_total{{metodo="GET",rota="{ROTA_DESCONHECIDA}",status="404"}}'] == 2
+    assert not any('/nao/existe' in chave for chave in m)
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+from infra.models.transacao import Transacao as TransacaoORM
+from helpers.enums import StatusTransacao
+from helpers.paginacao import codificar_cursor, decodificar_cursor
+
+URL = '/api/v1/transacoes'
+
+
+def semear(sessao_fabrica, qtd: int, imovel_codigo='IMO-1', status=StatusTransacao.CRIADA):
+    # datas explícitas (e repetidas de 2 em 2) para exercitar o desempate por id
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    with sessao_fabrica() as db:
+        db.add_all([
+            TransacaoORM(
+                id=uuid4(),
+                imovel_codigo=imovel_codigo,
+                valor_venda=Decimal('100.00'),
+                status=status,
+                data_criacao=base + timedelta(minutes=i // 2),
+            )
+            for i in range(qtd)
+        ])
+        db.commit()
+
+
+def percorrer(cliente, **params):
+    ids, cursor = [], None
+    while True:
+        r = cliente.get(URL, params={**params, **({'cursor': cursor} if cursor else {})})
+        assert r.status_code == 200, r.text
+        ids += [it['id'] for it in r.json()]
+        cursor = r.headers.get('X-Next-Cursor')
+        if not cursor:
+            return ids
+
+
+def test_cursor_ida_e_volta():
+    data, item_id = datetime(2025, 3, 1, 12, 30, tzinfo=timezone.utc), uuid4()
+    assert decodificar_cursor(codificar_cursor(data, item_id)) == (data, item_id)
+
+
+def test_cursor_percorre_tudo_sem_repetir_e_igual_ao_offset(cliente, sessao_fabrica):
+    semear(sessao_fabrica, 23)
+
+    por_cursor = percorrer(cliente, limit=5)
+    por_offset = []
+    for offset in range(0, 23, 5):
+        por_offset += [it['id'] for it in cliente.get(URL, params={'limit': 5, 'offset': offset}).json()]
+
+    assert len(por_cursor) == len(set(por_cursor)) == 23
+    assert por_cursor == por_offset
+
+
+def test_cursor_respeita_filtros(cliente, sessao_fabrica):
+    semear(sessao_fabrica, 7, imovel_codigo='A')
+    semear(sessao_fabrica, 4, imovel_codigo='B', status=StatusTransacao.CANCELADA)
+
+    ids = percorrer(cliente, limit=2, imovel_codigo='B', status='CANCELADA')
+    assert len(ids) == 4
+
+    r = cliente.get(URL, params={'limit': 2, 'imovel_codigo': 'B'})
+    assert r.headers['X-Total-Count'] == '4'
+
+
+def test_cursor_ultima_pagina_sem_proximo(cliente, sessao_fabrica):
+    semear(sessao_fabrica, 3)
+    r = cliente.get(URL, params={'limit': 3})
+    assert len(r.json()) == 3
+    assert 'X-Next-Cursor' not in r.headers
+
+
+def test_cursor_invalido_ou_junto_com_offset(cliente, sessao_fabrica):
+    semear(sessao_fabrica, 3)
+    assert cliente.get(URL, params={'cursor': 'lixo'}).status_code == 400
+
+    cursor = cliente.get(URL, params={'limit': 1}).headers['X-Next-Cursor']
+    assert cliente.get(URL, params={'cursor': cursor, 'offset': 1}).status_code == 400
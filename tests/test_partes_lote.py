@@ -0,0 +1,59 @@
+from uuid import uuid4
+
+
+def criar_transacao(cliente) -> str:
+    r = cliente.post('/api/v1/transacoes', json={'imovel_codigo': 'IMO-1', 'valor_venda': '100.00'})
+    assert r.status_code == 201, r.text
+    return r.json()['id']
+
+
+def parte(nome: str, tipo: str, **extra) -> dict:
+    return {'nome': nome, 'cpf_cnpj': '12345678901', 'tipo': tipo, **extra}
+
+
+def test_lote_em_uma_transacao(cliente):
+    tid = criar_transacao(cliente)
+    r = cliente.post(f'/api/v1/transacoes/{tid}/partes/lote', json=[
+        parte('Compradora', 'COMPRADOR', email='c@exemplo.com'),
+        parte('Vendedor', 'VENDEDOR'),
+        parte('Corretora', 'CORRETOR'),
+    ])
+    assert r.status_code == 201, r.text
+    corpo = r.json()
+    assert [p['tipo'] for p in corpo] == ['COMPRADOR', 'VENDEDOR', 'CORRETOR']
+    assert {p['transacao_id'] for p in corpo} == {tid}
+    assert corpo[0]['email'] == 'c@exemplo.com'
+
+    # com as três partes gravadas, a aprovação passa
+    cliente.patch(f'/api/v1/transacoes/{tid}/status', json={'status': 'EM_ANALISE'})
+    assert cliente.patch(f'/api/v1/transacoes/{tid}/status', json={'status': 'APROVADA'}).status_code == 200
+
+
+def test_lote_em_varias_transacoes(cliente):
+    t1, t2 = criar_transacao(cliente), criar_transacao(cliente)
+    r = cliente.post('/api/v1/partes/lote', json=[
+        parte('A', 'COMPRADOR', transacao_id=t1),
+        parte('B', 'VENDEDOR', transacao_id=t2),
+        parte('C', 'CORRETOR', transacao_id=t2),
+    ])
+    assert r.status_code == 201, r.text
+    assert [p['transacao_id'] for p in r.json()] == [t1, t2, t2]
+
+
+def test_lote_com_transacao_inexistente_nao_grava_nada(cliente):
+    t1 = criar_transacao(cliente)
+    r = cliente.post('/api/v1/partes/lote', json=[
+        parte('A', 'COMPRADOR', transacao_id=t1),
+        parte('B', 'VENDEDOR', transacao_id=str(uuid4())),
+    ])
+    assert r.status_code == 404
+    assert r.json()['detail']['codigo'] == 'transacao_nao_encontrada'
+
+    # nada do lote foi gravado: a aprovação continua bloqueada por falta de partes
+    cliente.patch(f'/api/v1/transacoes/{t1}/status', json={'status': 'EM_ANALISE'})
+    assert cliente.patch(f'/api/v1/transacoes/{t1}/status', json={'status': 'APROVADA'}).status_code == 422
+
+
+def test_lote_vazio_e_rejeitado(cliente):
+    tid = criar_transacao(cliente)
+    assert cliente.post(f'/api/v1/transacoes/{tid}/partes/lote', json=[]).status_code == 422
@@ -0,0 +1,76 @@
+import time
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.exc import TimeoutError as TimeoutPool
+
+from infra.pool import PoolInstrumentado, MetricasPool, instrumentar_pool, metricas_pools, POOLS
+
+
+@pytest.fixture
+def engine_pool(tmp_path):
+    # pool pequeno para forçar espera e timeout
+    engine = sa.create_engine(
+        f'sqlite+pysqlite:///{tmp_path / "pool.db"}',
+        poolclass=PoolInstrumentado, pool_size=1, max_overflow=0, pool_timeout=0.05,
+    )
+    yield engine
+    POOLS.pop('teste', None)
+    engine.dispose()
+
+
+def test_metricas_de_checkout_espera_e_timeout(engine_pool):
+    instrumentar_pool('teste', engine_pool)
+    with engine_pool.connect():
+        with pytest.raises(TimeoutPool):
+            engine_pool.connect()
+        em_uso = metricas_pools()['teste']
+        assert em_uso['em_uso'] == 1 and em_uso['tamanho'] == 1
+
+    m = metricas_pools()['teste']
+    assert m['em_uso'] == 0
+    assert m['checkouts'] == 1 and m['max_em_uso'] == 1
+    assert m['conexoes_abertas'] == 1
+    assert m['timeouts'] == 1
+    baldes = m['espera_ms']['baldes']
+    assert baldes['+Inf'] == 2  # o checkout que conseguiu e o que estourou
+    assert baldes['25'] == 1 and baldes['100'] == 2  # timeout de 50 ms cai acima de 25 ms
+
+
+def test_metricas_sobrevivem_ao_dispose(engine_pool):
+    instrumentar_pool('teste', engine_pool)
+    with engine_pool.connect():
+        pass
+    engine_pool.dispose()
+    with engine_pool.connect():
+        pass
+    assert metricas_pools()['teste']['checkouts'] == 2
+    assert metricas_pools()['teste']['conexoes_abertas'] == 2
+
+
+def test_pre_ping_ociosa_so_testa_conexao_parada(engine_pool):
+    instrumentar_pool('teste', engine_pool, pre_ping_ociosa_segundos=0.05)
+    with engine_pool.connect():
+        pass
+    with engine_pool.connect():
+        pass
+    assert metricas_pools()['teste']['pings'] == 0
+
+    time.sleep(0.1)
+    with engine_pool.connect() as conn:
+        assert conn.execute(sa.text('SELECT 1')).scalar_one() == 1
+    assert metricas_pools()['teste']['pings'] == 1
+
+
+def test_histograma_cumulativo():
+    m = MetricasPool()
+    for ms in (0.5, 3, 3, 20000):
+        m.registrar_espera(ms)
+    baldes = m.retrato(sa.pool.NullPool(lambda: None))['espera_ms']['baldes']
+    assert baldes['1'] == 1 and baldes['5'] == 3 and baldes['10000'] == 3 and baldes['+Inf'] == 4
+
+
+def test_endpoint_interno(cliente):
+    r = cliente.get('/api/v1/interno/pool')
+    assert r.status_code == 200
+    assert {'primario', 'primario_async'} <= set(r.json())
@@ -0,0 +1,59 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from main import app
+from infra.database import Base, url_async
+from helpers.db_session import get_fabrica_leitura_async, COOKIE_PRIMARIO
+
+BASE = '/api/v1/transacoes'
+
+
+@pytest.fixture
+def cliente_com_replica(cliente, tmp_path):
+    # segundo SQLite como réplica: vazia e sem replicação, para distinguir de onde veio a leitura
+    url = f'sqlite+pysqlite:///{tmp_path / "replica.db"}'
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    engine_async = create_async_engine(url_async(url), poolclass=NullPool)
+    fabrica = async_sessionmaker(bind=engine_async, autoflush=False, expire_on_commit=False)
+    app.dependency_overrides[get_fabrica_leitura_async] = lambda: fabrica
+    yield cliente
+    engine_async.sync_engine.dispose()
+
+
+def test_escrita_fixa_o_cliente_no_primario(cliente_com_replica):
+    cliente = cliente_com_replica
+    r = cliente.post(BASE, json={'imovel_codigo': 'IMO-1', 'valor_venda': '1000.00'})
+    assert r.status_code == 201
+    assert COOKIE_PRIMARIO in r.cookies
+    tid = r.json()['id']
+
+    # com o cookie: lê o que acabou de gravar
+    assert cliente.get(f'{BASE}/{tid}').status_code == 200
+    assert len(cliente.get(BASE).json()) == 1
+
+    # sem o cookie: a leitura vai à réplica (que ainda não tem a linha)
+    cliente.cookies.clear()
+    assert cliente.get(f'{BASE}/{tid}').status_code == 404
+    assert cliente.get(BASE).json() == []
+    assert cliente.get(f'{BASE}/exportar').text == ''
+
+
+def test_cabecalho_pede_o_primario(cliente_com_replica):
+    cliente = cliente_com_replica
+    tid = cliente.post(BASE, json={'imovel_codigo': 'IMO-1', 'valor_venda': '1000.00'}).json()['id']
+    cliente.cookies.clear()
+
+    assert cliente.get(f'{BASE}/{tid}', headers={'X-Ler-Primario': '1'}).status_code == 200
+    assert cliente.get(f'{BASE}/{tid}', headers={'X-Ler-Primario': '0'}).status_code == 404
+
+
+def test_leitura_e_escrita_recusada_nao_fixam(cliente_com_replica):
+    cliente = cliente_com_replica
+    assert COOKIE_PRIMARIO not in cliente.get(BASE).cookies
+    r = cliente.post(BASE, json={'imovel_codigo': 'IMO-1', 'valor_venda': '-1'})
+    assert r.status_code == 422
+    assert COOKIE_PRIMARIO not in r.cookies
@@ -0,0 +1,91 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from sqlalchemy import text
+
+from comandos.resumos import main as comando_resumo
+from infra.repositories.resumo_comissao import ResumoComissaoRepositorio
+
+BASE = '/api/v1/transacoes'
+RELATORIO = '/api/v1/relatorios/comissoes'
+
+
+def criar_transacao(cliente, valor: str = '1000.00') -> str:
+    r = cliente.post(BASE, json={'imovel_codigo': 'IMO-1', 'valor_venda': valor})
+    assert r.status_code == 201, r.text
+    return r.json()['id']
+
+
+def criar_comissao(cliente, tid: str, percentual: str = '0.05') -> str:
+    r = cliente.post(f'{BASE}/{tid}/comissoes', json={'percentual': percentual})
+    assert r.status_code == 201, r.text
+    return r.json()['id']
+
+
+def linhas(cliente, **params) -> dict[str, dict]:
+    r = cliente.get(RELATORIO, params=params)
+    assert r.status_code == 200, r.text
+    return {l['status_transacao']: l for l in r.json()['linhas']}
+
+
+def consistente(sessao_fabrica) -> None:
+    with sessao_fabrica() as db:
+        assert ResumoComissaoRepositorio(db).verificar() == []
+
+
+def test_resumo_acompanha_criacao_pagamento_e_status(cliente, sessao_fabrica):
+    t1, t2 = criar_transacao(cliente), criar_transacao(cliente, '2000.00')
+    c1 = criar_comissao(cliente, t1)
+    criar_comissao(cliente, t1, '0.10')
+    criar_comissao(cliente, t2)
+
+    l = linhas(cliente)['CRIADA']
+    assert (l['qtd_pagas'], l['qtd_pendentes']) == (0, 3)
+    assert Decimal(l['valor_pendente']) == Decimal('250.00')
+
+    assert cliente.post(f'/api/v1/comissoes/{c1}/pagar').status_code == 200
+    assert cliente.post(f'/api/v1/comissoes/{c1}/pagar').status_code == 200  # idempotente: não conta de novo
+    l = linhas(cliente)['CRIADA']
+    assert (l['qtd_pagas'], Decimal(l['valor_pago'])) == (1, Decimal('50.00'))
+    assert (l['qtd_pendentes'], Decimal(l['valor_pendente'])) == (2, Decimal('200.00'))
+
+    assert cliente.patch(f'{BASE}/{t2}/status', json={'status': 'EM_ANALISE'}).status_code == 200
+    por_status = linhas(cliente)
+    assert por_status['CRIADA']['qtd_pendentes'] == 1
+    assert (por_status['EM_ANALISE']['qtd_pendentes'], Decimal(por_status['EM_ANALISE']['valor_pendente'])) == (1, Decimal('100.00'))
+    assert set(linhas(cliente, status='EM_ANALISE')) == {'EM_ANALISE'}
+
+    r = cliente.post('/api/v1/comissoes/pagar-lote', json={'transacao_ids': [t1, t2]})
+    assert r.status_code == 200, r.text
+    total = cliente.get(RELATORIO).json()['total']
+    assert (total['qtd_pagas'], total['qtd_pendentes']) == (3, 0)
+    assert Decimal(total['valor_pago']) == Decimal('250.00')
+    consistente(sessao_fabrica)
+
+    assert cliente.delete(f'{BASE}/{t1}').status_code == 204
+    assert set(linhas(cliente)) == {'EM_ANALISE'}
+    consistente(sessao_fabrica)
+
+
+def test_filtro_de_periodo_e_agrupamento(cliente):
+    criar_comissao(cliente, criar_transacao(cliente))
+    hoje = datetime.now(timezone.utc).date()
+    r = cliente.get(RELATORIO, params={'data_ini': hoje.isoformat(), 'data_fim': hoje.isoformat(), 'agrupamento': 'dia'})
+    assert [l['periodo'] for l in r.json()['linhas']] == [hoje.isoformat()]
+    assert cliente.get(RELATORIO).json()['linhas'][0]['periodo'] == hoje.strftime('%Y-%m')
+    assert cliente.get(RELATORIO, params={'data_fim': '2000-01-01'}).json()['linhas'] == []
+    assert cliente.get(RELATORIO, params={'agrupamento': 'ano'}).status_code == 422
+
+
+def test_verificar_acusa_divergencia_e_reconstruir_corrige(cliente, sessao_fabrica, monkeypatch):
+    criar_comissao(cliente, criar_transacao(cliente))
+    with sessao_fabrica() as db:
+        db.execute(text('UPDATE resumo_comissao SET quantidade = quantidade + 1'))
+        db.commit()
+        assert len(ResumoComissaoRepositorio(db).verificar()) == 1
+
+    monkeypatch.setattr('comandos.resumos.SessionLocal', sessao_fabrica)
+    assert comando_resumo(['verificar', '--resumo', 'comissoes']) == 1
+    assert comando_resumo(['reconstruir', '--resumo', 'comissoes']) == 0
+    assert comando_resumo(['verificar', '--resumo', 'comissoes']) == 0
+    consistente(sessao_fabrica)
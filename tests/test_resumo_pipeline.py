@@ -0,0 +1,62 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from infra.repositories.resumo_pipeline import ResumoPipelineRepositorio
+from helpers.periodo import periodo_de
+
+BASE = '/api/v1/transacoes'
+PAINEL = '/api/v1/relatorios/pipeline'
+
+
+def criar_transacao(cliente, valor: str = '1000.00') -> str:
+    r = cliente.post(BASE, json={'imovel_codigo': 'IMO-1', 'valor_venda': valor})
+    assert r.status_code == 201, r.text
+    return r.json()['id']
+
+
+def total(cliente, **params) -> dict[str, tuple[int, Decimal]]:
+    r = cliente.get(PAINEL, params=params)
+    assert r.status_code == 200, r.text
+    return {s: (t['quantidade'], Decimal(t['valor_total'])) for s, t in r.json()['total'].items()}
+
+
+def consistente(sessao_fabrica) -> None:
+    with sessao_fabrica() as db:
+        assert ResumoPipelineRepositorio(db).verificar() == []
+
+
+def test_painel_acompanha_inclusao_valor_status_e_remocao(cliente, sessao_fabrica):
+    t1 = criar_transacao(cliente)
+    t2 = criar_transacao(cliente, '500.00')
+    r = cliente.post(f'{BASE}/importar', content='imovel_codigo,valor_venda\r\nA,10.00\r\nB,20.00', headers={'Content-Type': 'text/csv'})
+    assert r.json()['importadas'] == 2
+    assert total(cliente) == {'CRIADA': (4, Decimal('1530.00'))}
+
+    assert cliente.put(f'{BASE}/{t1}', json={'imovel_codigo': 'IMO-2', 'valor_venda': '1200.00'}).status_code == 200
+    assert cliente.put(f'{BASE}/{t1}', json={'imovel_codigo': 'IMO-3', 'valor_venda': '1200.00'}).status_code == 200  # valor igual: sem ajuste
+    assert total(cliente) == {'CRIADA': (4, Decimal('1730.00'))}
+
+    assert cliente.patch(f'{BASE}/{t2}/status', json={'status': 'EM_ANALISE'}).status_code == 200
+    assert cliente.patch(f'{BASE}/{t2}/status', json={'status': 'EM_ANALISE'}).status_code == 422  # transição recusada não mexe
+    assert total(cliente) == {'CRIADA': (3, Decimal('1230.00')), 'EM_ANALISE': (1, Decimal('500.00'))}
+    consistente(sessao_fabrica)
+
+    assert cliente.delete(f'{BASE}/{t2}').status_code == 204
+    assert total(cliente) == {'CRIADA': (3, Decimal('1230.00'))}
+    consistente(sessao_fabrica)
+
+
+def test_granularidade_e_intervalo(cliente):
+    criar_transacao(cliente)
+    hoje = datetime.now(timezone.utc).date()
+    for granularidade in ('dia', 'semana', 'mes'):
+        periodos = cliente.get(PAINEL, params={'granularidade': granularidade}).json()['periodos']
+        assert [p['periodo'] for p in periodos] == [periodo_de(hoje, granularidade)]
+        assert periodos[0]['por_status']['CRIADA']['quantidade'] == 1
+    assert cliente.get(PAINEL, params={'data_fim': '2000-01-01'}).json() == {'periodos': [], 'total': {}}
+    assert cliente.get(PAINEL, params={'granularidade': 'ano'}).status_code == 422
+
+
+def test_periodo_de_semana_iso():
+    assert periodo_de(datetime(2021, 1, 3).date(), 'semana') == '2020-W53'
+    assert periodo_de(datetime(2021, 1, 4).date(), 'semana') == '2021-W01'
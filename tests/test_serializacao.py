@@ -0,0 +1,76 @@
+import json
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+
+from app.schemas.comissao import ComissaoSaida
+from app.schemas.parte import ParteSaida
+from app.schemas.transacao import TransacaoSaida
+from helpers.enums import StatusTransacao, TipoParte
+from helpers.serializacao import campos_saida, json_rapido
+from infra.models.transacao import Transacao as TransacaoORM
+
+BASE = '/api/v1/transacoes'
+
+
+def como_pydantic(esquema, objs) -> list:
+    # caminho do response_model: valida e serializa em modo JSON
+    adaptador = TypeAdapter(list[esquema])
+    return json.loads(adaptador.dump_json(adaptador.validate_python(objs, from_attributes=True)))
+
+
+def test_json_rapido_igual_ao_pydantic_para_os_tipos_da_saida():
+    dados = {
+        'id': uuid4(),
+        'transacao_id': uuid4(),
+        'percentual': Decimal('0.050'),
+        'valor_calculado': Decimal('1234567.80'),
+        'paga': False,
+    }
+    assert json.loads(json_rapido(dados)) == json.loads(ComissaoSaida(**dados).model_dump_json())
+
+    for data in (
+        datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+        datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=-3))),
+        datetime(2026, 1, 2, 3, 4, 5),
+    ):
+        saida = TransacaoSaida(
+            id=uuid4(), imovel_codigo='X', valor_venda=Decimal('10.00'), status=StatusTransacao.CRIADA,
+            data_criacao=data, data_atualizacao=data, versao=1, qtd_compradores=0, qtd_vendedores=0, qtd_corretores=0,
+        )
+        assert json.loads(json_rapido(campos_saida([saida], TransacaoSaida)[0])) == json.loads(saida.model_dump_json())
+
+
+def test_listagem_e_detalhe_batem_com_o_response_model(cliente, sessao_fabrica):
+    for i in range(3):
+        tid = cliente.post(BASE, json={'imovel_codigo': f'IMO-{i}', 'valor_venda': '1000.50'}).json()['id']
+    cliente.post(f'{BASE}/{tid}/partes', json={'nome': 'Ana', 'cpf_cnpj': '12345678901', 'tipo': 'COMPRADOR'})
+
+    with sessao_fabrica() as db:
+        objs = db.scalars(select(TransacaoORM).order_by(TransacaoORM.data_criacao.desc(), TransacaoORM.id.desc())).all()
+        esperado = como_pydantic(TransacaoSaida, objs)
+
+    r = cliente.get(BASE)
+    assert r.headers['content-type'] == 'application/json'
+    assert r.json() == esperado
+    assert cliente.get(f'{BASE}/{tid}').json() == next(t for t in esperado if t['id'] == tid)
+
+
+def test_lotes_de_partes_e_comissoes_batem_com_o_response_model(cliente):
+    tid = cliente.post(BASE, json={'imovel_codigo': 'IMO-1', 'valor_venda': '999999.99'}).json()['id']
+    r = cliente.post(f'{BASE}/{tid}/partes/lote', json=[
+        {'nome': 'Ana', 'cpf_cnpj': '12345678901', 'tipo': 'COMPRADOR', 'email': 'ana@exemplo.com'},
+        {'nome': 'Bia', 'cpf_cnpj': '12345678901234', 'tipo': 'CORRETOR'},
+    ])
+    assert r.status_code == 201
+    assert r.json() == como_pydantic(ParteSaida, r.json())
+    assert {p['tipo'] for p in r.json()} == {TipoParte.COMPRADOR.value, TipoParte.CORRETOR.value}
+
+    cid = cliente.post(f'{BASE}/{tid}/comissoes', json={'percentual': '0.055'}).json()['id']
+    r = cliente.post('/api/v1/comissoes/pagar-lote', json={'ids': [cid]})
+    assert r.status_code == 200
+    assert r.json()['pagas'] == como_pydantic(ComissaoSaida, r.json()['pagas'])
+    assert r.json()['pagas'][0]['valor_calculado'] == '55000.00'